@@ -7,6 +7,10 @@ from src.utils.logger import get_logger
 from src.strategy.example_momentum import ExampleMomentumStrategy
 from src.backtesting.backtester import Backtester
 from src.paper_trading.paper_trader import PaperTrader
+from src.paper_trading.runner import MultiSymbolRunner
+from src.execution.exchange_factory import make_exchange
+from src.execution.order_router import OrderRouter
+from src.governance.risk_gate import RiskGate
 from src.deployment.dashboard import launch_dashboard
 
 # near your main entrypoint in main.py, after other imports
@@ -27,6 +31,7 @@ def main():
     logger.info("Starting bot in %s mode", cfg.BOT_MODE)
 
     strategy = ExampleMomentumStrategy(cfg)
+    risk_gate = RiskGate.from_config(cfg)
 
     if cfg.BOT_MODE == "backtest":
         # TODO: load historical DataFrame
@@ -36,12 +41,25 @@ def main():
         logger.info("Backtest PnL: %s", results)
 
     elif cfg.BOT_MODE == "paper":
-        pt = PaperTrader(strategy, cfg)
-        pt.run()
+        if len(cfg.SYMBOLS) > 1:
+            runner = MultiSymbolRunner(lambda symbol: ExampleMomentumStrategy(), cfg, risk_gate=risk_gate)
+            runner.run()
+        else:
+            pt = PaperTrader(strategy, cfg, checkpoint_path=cfg.CHECKPOINT_PATH, risk_gate=risk_gate)
+            pt.run()
 
     elif cfg.BOT_MODE == "live":
-        # TODO: initialize live trading client
-        pass
+        exchange = make_exchange(
+            cfg.EXCHANGE_ID,
+            api_key=cfg.API_KEY,
+            api_secret=cfg.API_SECRET,
+            market_type=cfg.DEFAULT_MARKET_TYPE,
+            symbol=cfg.SYMBOL,
+        )
+        router = OrderRouter(exchange)
+        pt = PaperTrader(strategy, cfg, exchange=exchange, simulator=router,
+                         checkpoint_path=cfg.LIVE_CHECKPOINT_PATH, risk_gate=risk_gate)
+        pt.run()
 
     launch_dashboard()
 
@@ -1,13 +1,51 @@
+import logging
+import sys
+from typing import Optional
+
+import numpy as np
 import pandas as pd
 
+from src.backtesting import futures, metrics
+from src.backtesting.futures import round_trip_pnls, simulate_futures
+from src.backtesting.metrics import compute_metrics, periods_per_year
+from src.backtesting.result_cache import ResultCache
+
+logger = logging.getLogger(__name__)
+
+# Modules whose source versions cached results: this engine and what it calls into.
+_ENGINE_MODULES = (sys.modules[__name__], futures, metrics)
+
 class Backtester:
-    def __init__(self, strategy, df: pd.DataFrame, cfg):
+    def __init__(self, strategy, df: pd.DataFrame, cfg, cache: Optional[ResultCache] = None):
         self.strategy = strategy
         self.df = df
         self.cfg = cfg
+        self.cache = cache
         self.pnl = 0.0
 
+    def _cached(self, engine: str, compute, **engine_params):
+        """
+        Serve `compute()` from the result cache when one is configured.
+        """
+        if self.cache is None:
+            return compute()
+        try:
+            key = self.cache.fingerprint(self.df, self.strategy, engine, engine_params, self.cfg,
+                                         code=_ENGINE_MODULES)
+        except TypeError as e:
+            logger.warning(f"Not caching {engine}: {e}")
+            return compute()
+        result = self.cache.get(key)
+        if result is None:
+            result = compute()
+            self.cache.put(key, result)
+        self.pnl = result["pnl"]
+        return result
+
     def run(self):
+        return self._cached("Backtester.run", self._run)
+
+    def _run(self):
         trades = []
         signals = self.strategy.generate_signals(self.df)
         for sig in signals:
@@ -19,3 +57,63 @@ class Backtester:
                 self.pnl += price * size
             trades.append(sig)
         return {"pnl": self.pnl, "trades": len(trades)}
+
+    def run_futures(
+        self,
+        initial_capital: float = 10_000.0,
+        fee_rate: float = 0.0004,
+        maintenance_margin_rate: float = 0.005,
+        funding_rates: Optional[pd.Series] = None
+    ):
+        """
+        Leveraged perp backtest: signals accumulate into a signed position held from
+        the signal bar's close, accounted by `simulate_futures`.
+
+        Leverage and margin mode come from cfg.LEVERAGE / cfg.MARGIN_MODE.
+        """
+        return self._cached(
+            "Backtester.run_futures",
+            lambda: self._run_futures(initial_capital, fee_rate, maintenance_margin_rate, funding_rates),
+            initial_capital=initial_capital,
+            fee_rate=fee_rate,
+            maintenance_margin_rate=maintenance_margin_rate,
+            funding_rates=funding_rates,
+        )
+
+    def _run_futures(self, initial_capital, fee_rate, maintenance_margin_rate, funding_rates):
+        signals = self.strategy.generate_signals(self.df)
+        deltas = np.zeros(len(self.df))
+        if signals:
+            stamps = [s["timestamp"] for s in signals]
+            idx = self.df.index.get_indexer(stamps)
+            if (idx < 0).any():
+                # Same contract as `run`, which looks signals up with df.loc.
+                raise KeyError(f"signal timestamp {stamps[int(np.argmax(idx < 0))]} not in df.index")
+            signed = [s["size"] if s["side"] == "buy" else -s["size"] for s in signals]
+            np.add.at(deltas, idx, signed)
+        account = simulate_futures(
+            self.df,
+            np.cumsum(deltas),
+            leverage=getattr(self.cfg, "LEVERAGE", 10.0),
+            maintenance_margin_rate=maintenance_margin_rate,
+            margin_mode=getattr(self.cfg, "MARGIN_MODE", "isolated"),
+            initial_capital=initial_capital,
+            fee_rate=fee_rate,
+            funding_rates=funding_rates,
+        )
+        self.pnl = float(account["equity"].iloc[-1] - initial_capital)
+        return {
+            "pnl": self.pnl,
+            "trades": len(signals),
+            "liquidations": int(account["liquidated"].sum()),
+            "funding": float(account["funding"].sum()),
+            "fees": float(account["fees"].sum()),
+            "equity": account["equity"],
+            "metrics": compute_metrics(
+                np.r_[initial_capital, account["equity"].to_numpy()],
+                positions=account["position"].to_numpy(),
+                trade_pnls=round_trip_pnls(account),
+                traded_notional=np.abs(deltas) * self.df["close"].to_numpy(dtype=float),
+                periods_per_year=periods_per_year(getattr(self.cfg, "TIMEFRAME", "1m")),
+            ),
+        }
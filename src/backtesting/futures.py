@@ -0,0 +1,273 @@
+"""
+Vectorized perpetual-futures accounting: mark-to-market, funding and liquidations.
+
+Positions are given per bar as signed contract counts held from that bar's close
+until the next change. Everything is computed with array operations over the bar
+series; there is no per-bar Python loop.
+
+Margin model:
+  - isolated: the position is margined at |q| * entry / leverage, where entry is the
+    size-weighted average price of its adds on the same side; reducing keeps the
+    average, and a reversal, close or liquidation starts a new one. The position is
+    liquidated when the bar's adverse extreme (low for longs, high for shorts)
+    reaches its liquidation price, losing exactly that margin.
+  - cross: the whole account equity backs the position; the first bar whose adverse
+    extreme pushes equity to the maintenance margin liquidates the account, which
+    then stays flat.
+"""
+
+import logging
+from typing import Optional, Union
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+MARGIN_MODES = ("isolated", "cross")
+
+
+def liquidation_price(
+    entry_price: Union[float, np.ndarray],
+    position: Union[float, np.ndarray],
+    leverage: float,
+    maintenance_margin_rate: float
+) -> Union[float, np.ndarray]:
+    """
+    Isolated-margin liquidation price for a position entered at `entry_price`.
+
+    Args:
+        entry_price: Entry price(s).
+        position: Signed size(s); only the sign matters.
+        leverage: Initial leverage (margin = notional / leverage).
+        maintenance_margin_rate: Maintenance margin as a fraction of notional.
+
+    Returns:
+        Price at which position equity equals maintenance margin (NaN when flat).
+    """
+    entry = np.asarray(entry_price, dtype=float)
+    side = np.sign(position)
+    long_px = entry * (1 - 1 / leverage) / (1 - maintenance_margin_rate)
+    short_px = entry * (1 + 1 / leverage) / (1 + maintenance_margin_rate)
+    out = np.where(side > 0, long_px, np.where(side < 0, short_px, np.nan))
+    return out if out.ndim else float(out)
+
+
+def _run_cumsum(values: np.ndarray, start: np.ndarray) -> np.ndarray:
+    """
+    Cumulative sum restarting at every True in `start` (start[0] must be True).
+    """
+    total = np.cumsum(values)
+    base = (total - values)[start]
+    return total - base[np.cumsum(start) - 1]
+
+
+def _average_entries(close: np.ndarray, positions: np.ndarray, reset: np.ndarray) -> np.ndarray:
+    """
+    Size-weighted average entry of the position held from each bar's close.
+
+    Adds on the same side blend their close into the average and reductions keep it.
+    A new side, or a bar flagged in `reset` (a liquidation), starts afresh at that
+    bar's close. NaN while flat.
+    """
+    size = np.abs(positions)
+    side = np.sign(positions)
+    start = (side != np.r_[0.0, side[:-1]]) | reset
+    start[0] = True
+    prev = np.where(start, 0.0, np.r_[0.0, size[:-1]])
+    added = np.maximum(size - prev, 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        kept = np.where(size < prev, size / prev, 1.0)
+        # Cost basis: adds accumulate at their close, reductions scale it by the kept share.
+        scale = np.exp(_run_cumsum(np.log(kept), start))
+        cost = _run_cumsum(added * close / scale, start) * scale
+        return np.where(size > 0, cost / size, np.nan)
+
+
+def _funding_per_bar(index: pd.Index, funding_rates: Optional[pd.Series]) -> np.ndarray:
+    """
+    Map funding events onto the first bar at or after each funding timestamp.
+    """
+    rates = np.zeros(len(index))
+    if funding_rates is None or funding_rates.empty:
+        return rates
+    pos = index.searchsorted(funding_rates.index)
+    valid = pos < len(index)
+    np.add.at(rates, pos[valid], funding_rates.to_numpy(dtype=float)[valid])
+    return rates
+
+
+def simulate_futures(
+    bars: pd.DataFrame,
+    positions: Union[pd.Series, np.ndarray],
+    leverage: float = 10.0,
+    maintenance_margin_rate: float = 0.005,
+    margin_mode: str = "isolated",
+    initial_capital: float = 10_000.0,
+    fee_rate: float = 0.0004,
+    funding_rates: Optional[pd.Series] = None
+) -> pd.DataFrame:
+    """
+    Per-bar futures account simulation.
+
+    Args:
+        bars: DataFrame with a 'close' column and optionally 'high', 'low' (used for
+            liquidation checks) and 'mark' (used for funding), indexed by timestamp.
+        positions: Signed contracts held from each bar's close, aligned with `bars`.
+        leverage: Initial leverage.
+        maintenance_margin_rate: Maintenance margin as a fraction of notional.
+        margin_mode: "isolated" or "cross".
+        initial_capital: Starting wallet balance.
+        fee_rate: Taker fee on traded notional.
+        funding_rates: Funding rate per funding timestamp (positive: longs pay shorts).
+
+    Returns:
+        DataFrame indexed like `bars` with columns: position (after liquidations),
+        pnl (mark-to-market), fees, funding (paid, positive = cost), equity,
+        margin_used, liquidation_price and liquidated (bool).
+    """
+    if margin_mode not in MARGIN_MODES:
+        raise ValueError(f"margin_mode must be one of {MARGIN_MODES}")
+    if leverage <= 0:
+        raise ValueError("leverage must be positive")
+    if not 0 <= maintenance_margin_rate < 1 / leverage:
+        raise ValueError("maintenance_margin_rate must be in [0, 1/leverage)")
+
+    close = bars["close"].to_numpy(dtype=float)
+    n = len(close)
+    high = bars["high"].to_numpy(dtype=float) if "high" in bars else close
+    low = bars["low"].to_numpy(dtype=float) if "low" in bars else close
+    mark = bars["mark"].to_numpy(dtype=float) if "mark" in bars else close
+    q = np.asarray(positions, dtype=float)
+    if n == 0:
+        raise ValueError("bars must not be empty")
+    if len(q) != n:
+        raise ValueError("positions must align with bars")
+    rates = _funding_per_bar(bars.index, funding_rates)
+
+    prev_close = np.r_[close[0], close[:-1]]
+    held = np.r_[0.0, q[:-1]]  # position exposed during each bar
+    adverse = np.where(held > 0, low, high)
+    liquidated = np.zeros(n, dtype=bool)
+    liq_fill = np.full(n, np.nan)
+
+    if margin_mode == "isolated":
+        # A liquidation flattens the rest of its constant-position run and restarts the
+        # average entry of later adds, so liquidations are resolved in bar order.
+        seg = np.cumsum(np.r_[True, q[1:] != q[:-1]]) - 1
+        q_eff = q.copy()
+        checked = 0
+        while True:
+            entry = _average_entries(close, q_eff, liquidated)
+            liq_px = liquidation_price(entry, q_eff, leverage, maintenance_margin_rate)
+            held_q = np.r_[0.0, q_eff[:-1]]
+            held_liq = np.r_[np.nan, liq_px[:-1]]
+            breach = ((held_q > 0) & (low <= held_liq)) | ((held_q < 0) & (high >= held_liq))
+            breach[:checked] = False
+            if not breach.any():
+                break
+            b = int(breach.argmax())
+            liquidated[b] = True
+            liq_fill[b] = held_liq[b]
+            q_eff[b:][seg[b:] == seg[b - 1]] = 0.0
+            checked = b + 1
+        liq_bars = np.flatnonzero(liquidated)
+    else:
+        q_eff = q
+        liq_bars = np.empty(0, dtype=int)
+
+    held_eff = np.r_[0.0, q_eff[:-1]]
+    pnl = held_eff * (close - prev_close)
+    funding = held_eff * mark * rates
+
+    if margin_mode == "cross":
+        equity = initial_capital + np.cumsum(pnl - funding - np.abs(np.diff(np.r_[0.0, q])) * close * fee_rate)
+        eq_prev = np.r_[initial_capital, equity[:-1]]
+        eq_worst = eq_prev + held * (adverse - prev_close)
+        breach = (held != 0) & (eq_worst <= maintenance_margin_rate * np.abs(held) * adverse)
+        if breach.any():
+            b = int(breach.argmax())
+            liq_bars = np.array([b])
+            liq_fill[b] = (held[b] * prev_close[b] - eq_prev[b]) / (
+                held[b] - maintenance_margin_rate * abs(held[b])
+            )
+            q_eff = q.copy()
+            q_eff[b:] = 0.0
+            held_eff = np.r_[0.0, q_eff[:-1]]
+            pnl = held_eff * (close - prev_close)
+            funding = held_eff * mark * rates
+
+    if liq_bars.size:
+        # Close at the liquidation price and forfeit the maintenance margin.
+        h = held_eff[liq_bars]
+        px = liq_fill[liq_bars]
+        pnl[liq_bars] = h * (px - prev_close[liq_bars]) - maintenance_margin_rate * np.abs(h) * px
+        funding[liq_bars] = 0.0
+        liquidated[liq_bars] = True
+
+    prev_eff = held_eff.copy()
+    prev_eff[liq_bars] = 0.0  # liquidation closes are not fee-bearing trades
+    fees = np.abs(q_eff - prev_eff) * close * fee_rate
+    equity = initial_capital + np.cumsum(pnl - fees - funding)
+
+    if margin_mode == "isolated":
+        current_liq = liq_px
+        margin_used = np.where(q_eff != 0, np.abs(q_eff) * entry / leverage, 0.0)
+    else:
+        margin_used = np.abs(q_eff) * close / leverage
+        with np.errstate(divide="ignore", invalid="ignore"):
+            current_liq = np.where(
+                q_eff != 0,
+                (q_eff * close - equity) / (q_eff - maintenance_margin_rate * np.abs(q_eff)),
+                np.nan,
+            )
+
+    if liq_bars.size:
+        logger.warning(f"{liq_bars.size} liquidation(s) in {margin_mode} futures simulation")
+    return pd.DataFrame({
+        "position": q_eff,
+        "pnl": pnl,
+        "fees": fees,
+        "funding": funding,
+        "equity": equity,
+        "margin_used": margin_used,
+        "liquidation_price": current_liq,
+        "liquidated": liquidated,
+    }, index=bars.index)
+
+
+def round_trip_pnls(account: pd.DataFrame) -> np.ndarray:
+    """
+    Realized PnL of each closed round trip in a `simulate_futures` account.
+
+    A round trip is a run of bars with a same-signed position. It is closed by going
+    flat, flipping sides or liquidation. Each bar's pnl and funding are charged to the
+    trade held through that bar. Fees are charged to the trade being opened or closed;
+    a flip splits its fee between the two trades in proportion to their sizes. A
+    position still open at the last bar is not realized and is left out.
+
+    Returns:
+        Net PnL (pnl - fees - funding) per closed trade, in order of entry.
+    """
+    pos = account["position"].to_numpy(dtype=float)
+    held = np.r_[0.0, pos[:-1]]
+    side = np.sign(pos)
+    opened = (side != 0) & (side != np.r_[0.0, side[:-1]])
+    trade = np.where(side != 0, np.cumsum(opened) - 1, -1)
+    held_trade = np.r_[-1, trade[:-1]]
+    n_trades = int(opened.sum())
+    if n_trades == 0:
+        return np.empty(0)
+
+    carry = account["pnl"].to_numpy(dtype=float) - account["funding"].to_numpy(dtype=float)
+    fees = account["fees"].to_numpy(dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        flip_share = np.abs(held) / (np.abs(held) + np.abs(pos))
+    closing_share = np.where(held_trade == trade, 0.0, np.where(trade < 0, 1.0, np.nan_to_num(flip_share)))
+
+    totals = np.zeros(n_trades)
+    was_held = held_trade >= 0
+    np.add.at(totals, held_trade[was_held], carry[was_held] - closing_share[was_held] * fees[was_held])
+    holding = trade >= 0
+    np.add.at(totals, trade[holding], -(1.0 - closing_share[holding]) * fees[holding])
+    return totals[:-1] if pos[-1] != 0 else totals
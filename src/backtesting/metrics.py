@@ -0,0 +1,174 @@
+"""
+Performance metrics for backtest and live equity curves.
+
+`compute_metrics` evaluates everything in one vectorized pass over the equity,
+position and trade arrays. `OnlineMetrics` maintains the same figures
+incrementally in O(1) per update, for paper/live runs.
+
+Metrics:
+  total_return, sharpe, sortino (annualized from per-period simple returns),
+  max_drawdown (fraction of running peak), win_rate (share of trades with pnl > 0),
+  exposure (share of periods holding a position), turnover (traded notional /
+  mean equity), n_periods, n_trades.
+"""
+
+import math
+from typing import Dict, Optional, Sequence, Union
+
+import ccxt
+import numpy as np
+
+ArrayLike = Union[Sequence[float], np.ndarray]
+
+METRIC_KEYS = (
+    "total_return", "sharpe", "sortino", "max_drawdown", "win_rate",
+    "exposure", "turnover", "n_periods", "n_trades",
+)
+
+
+def periods_per_year(timeframe: str) -> float:
+    """
+    Bars per year for a ccxt timeframe on a 24/7 market, e.g. "1m" -> 525600.
+    """
+    return 365 * 24 * 3600 / ccxt.Exchange.parse_timeframe(timeframe)
+
+
+def _ratio(num: float, den: float, scale: float) -> float:
+    return num / den * scale if den > 0 else float("nan")
+
+
+def compute_metrics(
+    equity: ArrayLike,
+    positions: Optional[ArrayLike] = None,
+    trade_pnls: Optional[ArrayLike] = None,
+    traded_notional: Optional[ArrayLike] = None,
+    periods_per_year: float = 525_600.0
+) -> Dict[str, float]:
+    """
+    Compute all metrics for a finished run.
+
+    Args:
+        equity: Equity per period (first value is the starting equity).
+        positions: Position (size or notional) held per period; zero means flat.
+        trade_pnls: Realized PnL per closed trade.
+        traded_notional: Notional traded per period (or per trade).
+        periods_per_year: Annualization factor (see `periods_per_year`).
+
+    Returns:
+        Dict keyed by METRIC_KEYS; undefined ratios are NaN.
+    """
+    eq = np.asarray(equity, dtype=float)
+    if eq.size == 0:
+        raise ValueError("equity must not be empty")
+    rets = eq[1:] / eq[:-1] - 1.0
+    scale = math.sqrt(periods_per_year)
+
+    n = rets.size
+    mean = rets.mean() if n else float("nan")
+    std = rets.std(ddof=1) if n > 1 else 0.0
+    downside = math.sqrt(np.square(np.minimum(rets, 0.0)).mean()) if n else 0.0
+    peaks = np.maximum.accumulate(eq)
+    pnls = np.asarray(trade_pnls, dtype=float) if trade_pnls is not None else np.empty(0)
+    notional = float(np.abs(np.asarray(traded_notional, dtype=float)).sum()) if traded_notional is not None else 0.0
+
+    return {
+        "total_return": float(eq[-1] / eq[0] - 1.0),
+        "sharpe": _ratio(mean, std, scale),
+        "sortino": _ratio(mean, downside, scale),
+        "max_drawdown": float((1.0 - eq / peaks).max()),
+        "win_rate": float((pnls > 0).mean()) if pnls.size else float("nan"),
+        "exposure": float((np.asarray(positions, dtype=float) != 0).mean()) if positions is not None else float("nan"),
+        "turnover": notional / float(eq.mean()),
+        "n_periods": int(n),
+        "n_trades": int(pnls.size),
+    }
+
+
+class OnlineMetrics:
+    """
+    Incremental equivalent of `compute_metrics`: O(1) time and memory per update.
+    """
+
+    def __init__(self, periods_per_year: float = 525_600.0):
+        """
+        Args:
+            periods_per_year: Annualization factor (see `periods_per_year`).
+        """
+        self.periods_per_year = periods_per_year
+        self.first: Optional[float] = None
+        self.last: Optional[float] = None
+        self.peak = 0.0
+        self.max_drawdown = 0.0
+        # Welford accumulators over period returns.
+        self.n = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self._down_sq = 0.0
+        self._equity_sum = 0.0
+        self._n_equity = 0
+        self._exposed = 0
+        self._n_positions = 0
+        self._notional = 0.0
+        self._wins = 0
+        self.n_trades = 0
+
+    def update(self, equity: float, position: Optional[float] = None, traded_notional: float = 0.0) -> None:
+        """
+        Add one period.
+
+        Args:
+            equity: Equity at the end of the period.
+            position: Position held during the period (None if not tracked).
+            traded_notional: Notional traded in the period.
+        """
+        if self.last is None:
+            self.first = self.peak = equity
+        else:
+            r = equity / self.last - 1.0
+            self.n += 1
+            delta = r - self.mean
+            self.mean += delta / self.n
+            self._m2 += delta * (r - self.mean)
+            if r < 0:
+                self._down_sq += r * r
+        self.last = equity
+        if equity > self.peak:
+            self.peak = equity
+        dd = 1.0 - equity / self.peak
+        if dd > self.max_drawdown:
+            self.max_drawdown = dd
+        self._equity_sum += equity
+        self._n_equity += 1
+        if position is not None:
+            self._n_positions += 1
+            self._exposed += position != 0
+        self._notional += abs(traded_notional)
+
+    def record_trade(self, pnl: float) -> None:
+        """
+        Add one closed trade's realized PnL.
+        """
+        self.n_trades += 1
+        self._wins += pnl > 0
+
+    def metrics(self) -> Dict[str, float]:
+        """
+        Current metrics, keyed like `compute_metrics`.
+        """
+        if self.last is None:
+            raise ValueError("no equity recorded")
+        scale = math.sqrt(self.periods_per_year)
+        std = math.sqrt(self._m2 / (self.n - 1)) if self.n > 1 else 0.0
+        downside = math.sqrt(self._down_sq / self.n) if self.n else 0.0
+        mean = self.mean if self.n else float("nan")
+        return {
+            "total_return": self.last / self.first - 1.0,
+            "sharpe": _ratio(mean, std, scale),
+            "sortino": _ratio(mean, downside, scale),
+            "max_drawdown": self.max_drawdown,
+            "win_rate": self._wins / self.n_trades if self.n_trades else float("nan"),
+            "exposure": self._exposed / self._n_positions if self._n_positions else float("nan"),
+            "turnover": self._notional / (self._equity_sum / self._n_equity),
+            "n_periods": self.n,
+            "n_trades": self.n_trades,
+        }
@@ -3,6 +3,9 @@ Portfolio engine: position sizing and drawdown enforcement.
 """
 
 import logging
+from typing import Any, Dict, Optional, Sequence, Union
+
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
@@ -61,7 +64,7 @@ class Portfolio:
         """
         prev = self.capital
         self.capital += pnl
-        logger.info(f"Portfolio updated by pnl={pnl}: {prev} → {self.capital}")
+        logger.info("Portfolio updated by pnl=%s: %s → %s", pnl, prev, self.capital)
 
         floor = self.initial_capital * (1 - self.max_drawdown)
         if self.capital < floor:
@@ -71,3 +74,258 @@ class Portfolio:
             )
             logger.error(msg)
             raise RuntimeError("Max drawdown breached")
+
+
+class PortfolioLedger:
+    """
+    Array-backed ledger of fills, positions and equity for per-fill hot loops.
+
+    Storage is preallocated and doubled when full; updates neither log nor allocate.
+    A drawdown breach sets `breached` (and `breach_index`) instead of raising.
+    """
+
+    _FILL_FIELDS = (("timestamp", np.int64), ("symbol", np.int32), ("qty", np.float64),
+                    ("price", np.float64), ("fee", np.float64))
+
+    def __init__(self, capital: float, max_drawdown: float, initial_size: int = 1024):
+        """
+        Args:
+            capital: Initial starting capital.
+            max_drawdown: Maximum allowed drawdown from the running peak, as fraction.
+            initial_size: Preallocated rows for the equity and fill arrays.
+        """
+        if capital <= 0:
+            raise ValueError("Initial capital must be positive")
+        if not 0 <= max_drawdown < 1:
+            raise ValueError("max_drawdown must be in [0,1)")
+        if initial_size <= 0:
+            raise ValueError("initial_size must be positive")
+
+        self.initial_capital: float = capital
+        self.capital: float = capital
+        self.max_drawdown: float = max_drawdown
+        self.peak: float = capital
+        self.drawdown: float = 0.0
+        self.breached: bool = False
+        self.breach_index: Optional[int] = None
+
+        self._equity = np.empty(initial_size)
+        self._drawdowns = np.empty(initial_size)
+        self._n_equity = 0
+        self._fills = {name: np.empty(initial_size, dtype=dt) for name, dt in self._FILL_FIELDS}
+        self._n_fills = 0
+        self._symbols: Dict[str, int] = {}
+        self._positions = np.zeros(8)
+
+    @staticmethod
+    def _grown(arr: np.ndarray, needed: int) -> np.ndarray:
+        size = len(arr)
+        while size < needed:
+            size *= 2
+        out = np.empty(size, dtype=arr.dtype)
+        out[:len(arr)] = arr
+        return out
+
+    def symbol_id(self, symbol: str) -> int:
+        """
+        Integer code for `symbol`, registering it on first use.
+        """
+        code = self._symbols.get(symbol)
+        if code is None:
+            code = self._symbols[symbol] = len(self._symbols)
+            if code >= len(self._positions):
+                positions = np.zeros(2 * len(self._positions))
+                positions[:len(self._positions)] = self._positions
+                self._positions = positions
+        return code
+
+    def update(self, pnl: float) -> bool:
+        """
+        Apply one realized PnL and append the resulting equity point.
+
+        Returns:
+            True if the drawdown limit has been breached (now or earlier).
+        """
+        n = self._n_equity
+        if n == len(self._equity):
+            self._equity = self._grown(self._equity, n + 1)
+            self._drawdowns = self._grown(self._drawdowns, n + 1)
+        self.capital += pnl
+        if self.capital > self.peak:
+            self.peak = self.capital
+        self.drawdown = 1.0 - self.capital / self.peak
+        self._equity[n] = self.capital
+        self._drawdowns[n] = self.drawdown
+        self._n_equity = n + 1
+        if self.drawdown > self.max_drawdown and not self.breached:
+            self.breached = True
+            self.breach_index = n
+        return self.breached
+
+    def update_batch(self, pnls: Union[Sequence[float], np.ndarray]) -> bool:
+        """
+        Apply a batch of realized PnLs in one vectorized pass.
+
+        Returns:
+            True if the drawdown limit has been breached (now or earlier).
+        """
+        pnls = np.asarray(pnls, dtype=float)
+        k = len(pnls)
+        if k == 0:
+            return self.breached
+        n = self._n_equity
+        if n + k > len(self._equity):
+            self._equity = self._grown(self._equity, n + k)
+            self._drawdowns = self._grown(self._drawdowns, n + k)
+        equity = self._equity[n:n + k]
+        np.cumsum(pnls, out=equity)
+        equity += self.capital
+        peaks = np.maximum.accumulate(np.maximum(equity, self.peak))
+        drawdowns = self._drawdowns[n:n + k]
+        np.divide(equity, peaks, out=drawdowns)
+        np.subtract(1.0, drawdowns, out=drawdowns)
+
+        self.capital = float(equity[-1])
+        self.peak = float(peaks[-1])
+        self.drawdown = float(drawdowns[-1])
+        self._n_equity = n + k
+        if not self.breached:
+            over = np.flatnonzero(drawdowns > self.max_drawdown)
+            if over.size:
+                self.breached = True
+                self.breach_index = n + int(over[0])
+        return self.breached
+
+    def record_fill(self, symbol: str, qty: float, price: float, fee: float = 0.0, timestamp: int = 0) -> None:
+        """
+        Append one fill and update the symbol's position.
+
+        Args:
+            symbol: Market symbol.
+            qty: Signed filled quantity (positive buy, negative sell).
+            price: Fill price.
+            fee: Fee paid in quote currency.
+            timestamp: Fill time in epoch milliseconds.
+        """
+        code = self.symbol_id(symbol)
+        n = self._n_fills
+        fills = self._fills
+        if n == len(fills["qty"]):
+            for name in fills:
+                fills[name] = self._grown(fills[name], n + 1)
+        fills["timestamp"][n] = timestamp
+        fills["symbol"][n] = code
+        fills["qty"][n] = qty
+        fills["price"][n] = price
+        fills["fee"][n] = fee
+        self._n_fills = n + 1
+        self._positions[code] += qty
+
+    def record_fills(
+        self,
+        symbols: Sequence[str],
+        qtys: Union[Sequence[float], np.ndarray],
+        prices: Union[Sequence[float], np.ndarray],
+        fees: Union[Sequence[float], np.ndarray, float] = 0.0,
+        timestamps: Union[Sequence[int], np.ndarray, int] = 0
+    ) -> None:
+        """
+        Append a batch of fills; arguments are aligned arrays (fees/timestamps may be scalars).
+        """
+        codes = np.fromiter((self.symbol_id(s) for s in symbols), dtype=np.int32, count=len(symbols))
+        k = len(codes)
+        n = self._n_fills
+        fills = self._fills
+        if n + k > len(fills["qty"]):
+            for name in fills:
+                fills[name] = self._grown(fills[name], n + k)
+        fills["timestamp"][n:n + k] = timestamps
+        fills["symbol"][n:n + k] = codes
+        fills["qty"][n:n + k] = qtys
+        fills["price"][n:n + k] = prices
+        fills["fee"][n:n + k] = fees
+        self._n_fills = n + k
+        np.add.at(self._positions, codes, fills["qty"][n:n + k])
+
+    def position(self, symbol: str) -> float:
+        """
+        Net position in `symbol` (0.0 if never traded).
+        """
+        code = self._symbols.get(symbol)
+        return 0.0 if code is None else float(self._positions[code])
+
+    def positions(self) -> Dict[str, float]:
+        """
+        Net position per traded symbol.
+        """
+        return {s: float(self._positions[c]) for s, c in self._symbols.items()}
+
+    def equity_curve(self) -> np.ndarray:
+        """
+        Equity after each update (a view; copy before mutating).
+        """
+        return self._equity[:self._n_equity]
+
+    def drawdown_curve(self) -> np.ndarray:
+        """
+        Drawdown from the running peak after each update (a view).
+        """
+        return self._drawdowns[:self._n_equity]
+
+    def fills(self) -> Dict[str, np.ndarray]:
+        """
+        Columnar fill ledger: timestamp, symbol (str), qty, price, fee, notional.
+        """
+        n = self._n_fills
+        names = np.array(list(self._symbols), dtype=object)
+        cols = {name: arr[:n].copy() for name, arr in self._fills.items()}
+        cols["symbol"] = names[cols["symbol"]] if n else np.empty(0, dtype=object)
+        cols["notional"] = np.abs(cols["qty"]) * cols["price"]
+        return cols
+
+    def get_state(self) -> Dict[str, Any]:
+        """
+        Checkpointable state: scalars plus trimmed copies of the ledger arrays.
+        """
+        n_sym = len(self._symbols)
+        state: Dict[str, Any] = {
+            "initial_capital": self.initial_capital,
+            "capital": self.capital,
+            "max_drawdown": self.max_drawdown,
+            "peak": self.peak,
+            "breached": self.breached,
+            "breach_index": self.breach_index,
+            "symbols": list(self._symbols),
+            "positions": self._positions[:n_sym].copy(),
+            "equity": self.equity_curve().copy(),
+            "drawdowns": self.drawdown_curve().copy(),
+        }
+        for name, arr in self._fills.items():
+            state[f"fill_{name}"] = arr[:self._n_fills].copy()
+        return state
+
+    def set_state(self, state: Dict[str, Any]) -> None:
+        """
+        Restore from `get_state`.
+        """
+        self.initial_capital = float(state["initial_capital"])
+        self.capital = float(state["capital"])
+        self.max_drawdown = float(state["max_drawdown"])
+        self.peak = float(state["peak"])
+        self.breached = bool(state["breached"])
+        self.breach_index = state["breach_index"]
+        equity = np.asarray(state["equity"], dtype=float)
+        self._n_equity = len(equity)
+        self._equity = self._grown(np.empty(1), max(self._n_equity, 1))
+        self._drawdowns = self._grown(np.empty(1), max(self._n_equity, 1))
+        self._equity[:self._n_equity] = equity
+        self._drawdowns[:self._n_equity] = state["drawdowns"]
+        self.drawdown = float(self._drawdowns[self._n_equity - 1]) if self._n_equity else 0.0
+        self._symbols = {s: i for i, s in enumerate(state["symbols"])}
+        self._positions = np.zeros(max(8, len(self._symbols)))
+        self._positions[:len(self._symbols)] = state["positions"]
+        self._n_fills = len(state["fill_qty"])
+        for name, dt in self._FILL_FIELDS:
+            arr = np.empty(max(self._n_fills, 1), dtype=dt)
+            arr[:self._n_fills] = state[f"fill_{name}"]
+            self._fills[name] = arr
@@ -0,0 +1,143 @@
+"""
+Multi-asset portfolio backtester on an aligned symbols x time grid.
+
+All symbols are aligned once onto the union of their bar indices. Each field is
+forward-filled into a symbols x time matrix, and an `observed` mask records which
+bars each symbol actually printed. Strategies produce signals for the whole matrix
+in one call (see `BaseStrategy.generate_signal_matrix`). Positions, PnL, exposure
+and equity are then computed with array operations across symbols.
+"""
+
+import logging
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+PANEL_FIELDS = ("open", "high", "low", "close", "volume")
+
+
+def _indexed(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Return `df` indexed by timestamp (accepts a 'timestamp' column or index).
+    """
+    if "timestamp" in df.columns:
+        df = df.set_index(pd.to_datetime(df["timestamp"]))
+    return df[~df.index.duplicated(keep="last")].sort_index()
+
+
+def align_frames(frames: Dict[str, pd.DataFrame]):
+    """
+    Align per-symbol OHLCV frames onto their union index.
+
+    Args:
+        frames: symbol -> OHLCV DataFrame.
+
+    Returns:
+        Tuple (symbols, index, panel, observed) where panel maps each available
+        field to a symbols x time float array, forward-filled after each symbol's
+        first bar (NaN before it), and observed is a symbols x time bool mask.
+    """
+    if not frames:
+        raise ValueError("frames must not be empty")
+    symbols = list(frames)
+    indexed = [_indexed(frames[s]) for s in symbols]
+    index = indexed[0].index
+    for df in indexed[1:]:
+        index = index.union(df.index)
+
+    n_sym, n_t = len(symbols), len(index)
+    observed = np.zeros((n_sym, n_t), dtype=bool)
+    fields = [f for f in PANEL_FIELDS if all(f in df.columns for df in indexed)]
+    if "close" not in fields:
+        raise ValueError("every frame needs a 'close' column")
+    panel = {f: np.full((n_sym, n_t), np.nan) for f in fields}
+    # Last observed position per grid slot drives the forward fill for every field.
+    fill_from = np.empty((n_sym, n_t), dtype=np.intp)
+    for i, df in enumerate(indexed):
+        pos = index.get_indexer(df.index)
+        observed[i, pos] = True
+        src = np.full(n_t, -1, dtype=np.intp)
+        src[pos] = np.arange(len(pos))
+        fill_from[i] = np.maximum.accumulate(src)
+        for f in fields:
+            values = df[f].to_numpy(dtype=float)
+            row = panel[f][i]
+            started = fill_from[i] >= 0
+            row[started] = values[fill_from[i][started]]
+    return symbols, index, panel, observed
+
+
+class PortfolioBacktester:
+    """
+    Runs one strategy over many symbols as a single vectorized portfolio.
+    """
+
+    def __init__(
+        self,
+        strategy,
+        frames: Dict[str, pd.DataFrame],
+        initial_capital: float = 10_000.0,
+        fee_rate: float = 0.0
+    ):
+        """
+        Args:
+            strategy: Strategy exposing `generate_signal_matrix` (see BaseStrategy).
+            frames: symbol -> OHLCV DataFrame (indexed by or with a 'timestamp' column).
+            initial_capital: Starting portfolio capital.
+            fee_rate: Fee charged on traded notional.
+        """
+        self.strategy = strategy
+        self.initial_capital = initial_capital
+        self.fee_rate = fee_rate
+        self.symbols: List[str]
+        self.symbols, self.index, self.panel, self.observed = align_frames(frames)
+
+    def run(self, signals: Optional[np.ndarray] = None) -> Dict:
+        """
+        Run the backtest.
+
+        Args:
+            signals: Optional precomputed symbols x time signed signal sizes; by
+                default they come from the strategy.
+
+        Returns:
+            Dict with:
+              - pnl: total mark-to-market PnL net of fees
+              - trades: number of executed signals
+              - equity: portfolio equity Series
+              - positions: time x symbols DataFrame of held sizes
+              - exposure: DataFrame with gross and net notional per bar
+              - symbol_pnl: per-symbol PnL Series net of fees
+        """
+        close = self.panel["close"]
+        if signals is None:
+            signals = self.strategy.generate_signal_matrix(self.panel, self.index, self.observed)
+        signals = np.where(self.observed, signals, 0.0)
+
+        positions = np.cumsum(signals, axis=1)
+        price = np.nan_to_num(close)
+        moves = np.diff(price, axis=1, prepend=price[:, :1])
+        bar_pnl = np.zeros_like(price)
+        bar_pnl[:, 1:] = positions[:, :-1] * moves[:, 1:]
+        fees = np.abs(signals) * price * self.fee_rate
+        net = bar_pnl - fees
+
+        equity = self.initial_capital + np.cumsum(net.sum(axis=0))
+        notional = positions * price
+        exposure = pd.DataFrame({
+            "gross": np.abs(notional).sum(axis=0),
+            "net": notional.sum(axis=0),
+        }, index=self.index)
+        trades = int(np.count_nonzero(signals))
+        logger.info(f"Portfolio backtest over {len(self.symbols)} symbols x {len(self.index)} bars: {trades} trades")
+        return {
+            "pnl": float(equity[-1] - self.initial_capital) if len(equity) else 0.0,
+            "trades": trades,
+            "equity": pd.Series(equity, index=self.index, name="equity"),
+            "positions": pd.DataFrame(positions.T, index=self.index, columns=self.symbols),
+            "exposure": exposure,
+            "symbol_pnl": pd.Series(net.sum(axis=1), index=self.symbols, name="pnl"),
+        }
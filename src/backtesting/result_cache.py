@@ -0,0 +1,261 @@
+"""
+Content-addressed on-disk cache for backtest results.
+
+A result is keyed by a SHA-256 fingerprint of:
+  - the input data (row hashes of the DataFrame, or content hashes of lake files)
+  - the strategy class, the source of every class in its MRO and its parameters
+  - the engine name, engine arguments and config
+  - the source of the engine module and its dependencies, so code changes
+    invalidate old entries
+
+Each entry is a directory holding meta.json (scalars) and one Parquet file per
+Series/DataFrame value. Once the cache exceeds `max_bytes`, the least recently
+used entries are evicted.
+"""
+
+import hashlib
+import inspect
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+from typing import Any, Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+_META = "meta.json"
+
+
+def _source_digest(obj: Any) -> str:
+    try:
+        source = inspect.getsource(obj)
+    except (OSError, TypeError):
+        source = getattr(obj, "__qualname__", repr(obj))
+    return hashlib.sha256(source.encode()).hexdigest()
+
+
+def _code_digest(objs: Iterable[Any]) -> str:
+    """
+    Combined source digest of several modules/classes, in order.
+    """
+    digest = hashlib.sha256()
+    for obj in objs:
+        digest.update(_source_digest(obj).encode())
+    return digest.hexdigest()
+
+
+def _strategy_classes(strategy: Any) -> list:
+    # Every class the strategy inherits behaviour from, so base-class edits invalidate too.
+    return [cls for cls in type(strategy).__mro__ if cls is not object]
+
+
+def _canonical(value: Any) -> Any:
+    """
+    JSON-serializable, order-stable view of params/config values.
+
+    Raises:
+        TypeError: For values with no stable content representation (their repr
+            would embed memory addresses and never produce a hit).
+    """
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in sorted(value.items(), key=lambda kv: str(kv[0]))}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if isinstance(value, (pd.Series, pd.DataFrame)):
+        return frame_digest(value)
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    raise TypeError(f"Cannot fingerprint value of type {type(value).__name__}")
+
+
+def frame_digest(data: Any) -> str:
+    """
+    Stable content digest of a Series/DataFrame (values, index and column names).
+    """
+    h = hashlib.sha256()
+    h.update(pd.util.hash_pandas_object(data, index=True).to_numpy().tobytes())
+    names = list(data.columns) if isinstance(data, pd.DataFrame) else [data.name]
+    h.update(repr([str(n) for n in names]).encode())
+    return h.hexdigest()
+
+
+def file_digest(paths: Iterable[str], chunk_size: int = 1 << 20) -> str:
+    """
+    Content digest of data files (e.g. lake partitions), independent of listing order.
+    """
+    h = hashlib.sha256()
+    for path in sorted(paths):
+        h.update(os.path.basename(path).encode())
+        with open(path, "rb") as fh:
+            for chunk in iter(lambda: fh.read(chunk_size), b""):
+                h.update(chunk)
+    return h.hexdigest()
+
+
+def _config_params(cfg: Any) -> Dict[str, Any]:
+    if cfg is None:
+        return {}
+    if isinstance(cfg, dict):
+        return cfg
+    names = [n for n in dir(cfg) if n.isupper() and "SECRET" not in n and "KEY" not in n]
+    return {n: getattr(cfg, n) for n in names}
+
+
+class ResultCache:
+    """
+    Size-bounded, content-addressed store of backtest results on local disk.
+    """
+
+    def __init__(self, root: str = ".cache/backtests", max_bytes: int = 512 * 1024 * 1024):
+        """
+        Args:
+            root: Cache directory.
+            max_bytes: Total on-disk size above which least recently used entries are evicted.
+        """
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be positive")
+        self.root = root
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(root, exist_ok=True)
+
+    @staticmethod
+    def fingerprint(
+        data: Any,
+        strategy: Any,
+        engine: str,
+        engine_params: Optional[Dict[str, Any]] = None,
+        cfg: Any = None,
+        code: Any = None
+    ) -> str:
+        """
+        Cache key for one backtest.
+
+        Args:
+            data: Input DataFrame, or a precomputed data digest string (see `file_digest`).
+            strategy: Strategy instance; the source of its class and base classes and
+                its attributes are hashed.
+            engine: Engine/method name, e.g. "Backtester.run".
+            engine_params: Engine arguments that affect the result.
+            cfg: Config object or dict; upper-case attributes are hashed (credentials skipped).
+            code: Module/object, or a sequence of them, whose source versions the
+                engine (e.g. the engine module plus the modules it calls into).
+
+        Raises:
+            TypeError: If a parameter or config value cannot be hashed canonically.
+        """
+        payload = {
+            "data": data if isinstance(data, str) else frame_digest(data),
+            "strategy": f"{type(strategy).__module__}.{type(strategy).__qualname__}",
+            "strategy_code": _code_digest(_strategy_classes(strategy)),
+            "strategy_params": _canonical(vars(strategy) if hasattr(strategy, "__dict__") else {}),
+            "engine": engine,
+            "engine_params": _canonical(engine_params or {}),
+            "config": _canonical(_config_params(cfg)),
+            "engine_code": (
+                None if code is None
+                else _code_digest(code if isinstance(code, (list, tuple)) else [code])
+            ),
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+    def _entry(self, key: str) -> str:
+        return os.path.join(self.root, key)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Load a cached result, or None on a miss.
+        """
+        entry = self._entry(key)
+        try:
+            with open(os.path.join(entry, _META)) as fh:
+                meta = json.load(fh)
+            result = dict(meta["scalars"])
+            for name, kind in meta["frames"].items():
+                frame = pd.read_parquet(os.path.join(entry, f"{name}.parquet"))
+                result[name] = frame.iloc[:, 0].rename(meta["names"][name]) if kind == "series" else frame
+        except (OSError, ValueError, KeyError):
+            self.misses += 1
+            return None
+        os.utime(entry)
+        self.hits += 1
+        return result
+
+    def put(self, key: str, result: Dict[str, Any]) -> None:
+        """
+        Store a result dict; Series/DataFrame values go to Parquet, the rest to JSON.
+
+        Best effort: entries are content-addressed, so an entry another writer already
+        stored for `key` is kept as is, and write failures are logged, never raised.
+        """
+        entry = self._entry(key)
+        if os.path.isdir(entry):
+            return
+        meta: Dict[str, Any] = {"scalars": {}, "frames": {}, "names": {}, "created": time.time()}
+        tmp = None
+        try:
+            os.makedirs(self.root, exist_ok=True)
+            tmp = tempfile.mkdtemp(dir=self.root, prefix=".tmp-")
+            for name, value in result.items():
+                if isinstance(value, pd.Series):
+                    meta["frames"][name] = "series"
+                    meta["names"][name] = value.name
+                    value.to_frame(name="value").to_parquet(os.path.join(tmp, f"{name}.parquet"))
+                elif isinstance(value, pd.DataFrame):
+                    meta["frames"][name] = "frame"
+                    value.to_parquet(os.path.join(tmp, f"{name}.parquet"))
+                else:
+                    meta["scalars"][name] = _canonical(value)
+            with open(os.path.join(tmp, _META), "w") as fh:
+                json.dump(meta, fh)
+            try:
+                os.replace(tmp, entry)
+            except OSError:
+                # Lost the race to a concurrent writer of the same key.
+                if not os.path.isdir(entry):
+                    raise
+            self._evict()
+        except Exception as e:
+            logger.warning(f"Could not store backtest cache entry {key}: {e}")
+        finally:
+            if tmp is not None:
+                shutil.rmtree(tmp, ignore_errors=True)
+
+    def size_bytes(self) -> int:
+        """
+        Total on-disk size of all entries.
+        """
+        return sum(size for _, _, size in self._entries())
+
+    def _entries(self):
+        for name in os.listdir(self.root):
+            entry = os.path.join(self.root, name)
+            if name.startswith(".") or not os.path.isdir(entry):
+                continue
+            size = sum(os.path.getsize(os.path.join(entry, f)) for f in os.listdir(entry))
+            yield entry, os.path.getmtime(entry), size
+
+    def _evict(self) -> None:
+        entries = sorted(self._entries(), key=lambda e: e[1])
+        total = sum(size for _, _, size in entries)
+        for entry, _, size in entries:
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+            logger.info(f"Evicted backtest cache entry {os.path.basename(entry)}")
+
+    def clear(self) -> None:
+        """
+        Remove every cached entry.
+        """
+        for entry, _, _ in list(self._entries()):
+            shutil.rmtree(entry, ignore_errors=True)
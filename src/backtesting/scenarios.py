@@ -0,0 +1,229 @@
+"""
+Scenario library: batched black-swan shock injection over a strategy's returns.
+
+A scenario is a row with:
+  - timestamp:   when the shock starts (must be in the returns index)
+  - shock_pct:   one-off return shock, added to that bar's return (e.g. -0.3)
+  - recovery:    optional sequence of returns added to the bars after the shock
+  - freeze_bars: optional number of bars during which the venue is down; returns
+                 over those bars are zeroed and the shock lands on the reopening bar
+  - name:        optional label
+
+All scenarios are evaluated against the same return stream as a scenario x time
+matrix, in chunks to bound memory.
+"""
+
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from src.backtesting.stress_test import path_statistics
+
+logger = logging.getLogger(__name__)
+
+ScenarioSpec = Dict[str, Any]
+
+
+def flash_crash(
+    timestamp: pd.Timestamp,
+    depth: float = -0.3,
+    recovery_fraction: float = 0.8,
+    recovery_bars: int = 30,
+    name: Optional[str] = None
+) -> ScenarioSpec:
+    """
+    Sudden crash followed by a geometric recovery of part of the loss.
+
+    Args:
+        timestamp: Bar of the crash.
+        depth: Crash return, e.g. -0.3 for -30%.
+        recovery_fraction: Share of the lost value regained over `recovery_bars`.
+        recovery_bars: Bars over which the recovery is spread.
+        name: Optional label.
+    """
+    if not -1 < depth < 0:
+        raise ValueError("depth must be in (-1, 0)")
+    if recovery_bars <= 0:
+        raise ValueError("recovery_bars must be positive")
+    trough = 1.0 + depth
+    target = 1.0 + depth * (1.0 - recovery_fraction)
+    per_bar = (target / trough) ** (1.0 / recovery_bars) - 1.0
+    return {
+        "name": name or f"flash_crash_{abs(depth):.0%}",
+        "timestamp": timestamp,
+        "shock_pct": depth,
+        "recovery": np.full(recovery_bars, per_bar),
+        "freeze_bars": 0,
+    }
+
+
+def gap_and_recover(
+    timestamp: pd.Timestamp,
+    gap_pct: float = -0.2,
+    recovery_bars: int = 240,
+    name: Optional[str] = None
+) -> ScenarioSpec:
+    """
+    Gap down that fully recovers over `recovery_bars`.
+    """
+    spec = flash_crash(timestamp, gap_pct, 1.0, recovery_bars)
+    spec["name"] = name or f"gap_and_recover_{abs(gap_pct):.0%}"
+    return spec
+
+
+def exchange_outage(
+    timestamp: pd.Timestamp,
+    duration_bars: int = 60,
+    gap_pct: float = -0.1,
+    name: Optional[str] = None
+) -> ScenarioSpec:
+    """
+    Venue outage: no trading for `duration_bars`, then the market reopens with a gap.
+    """
+    if duration_bars <= 0:
+        raise ValueError("duration_bars must be positive")
+    return {
+        "name": name or f"exchange_outage_{duration_bars}bars",
+        "timestamp": timestamp,
+        "shock_pct": gap_pct,
+        "recovery": None,
+        "freeze_bars": duration_bars,
+    }
+
+
+def liquidation_cascade(
+    timestamp: pd.Timestamp,
+    first_leg: float = -0.15,
+    follow_through: Sequence[float] = (-0.05, -0.04, -0.03),
+    name: Optional[str] = None
+) -> ScenarioSpec:
+    """
+    Initial drop followed by further forced-selling legs, with no recovery.
+    """
+    return {
+        "name": name or "liquidation_cascade",
+        "timestamp": timestamp,
+        "shock_pct": first_leg,
+        "recovery": np.asarray(follow_through, dtype=float),
+        "freeze_bars": 0,
+    }
+
+
+CANNED_SCENARIOS = {
+    "flash_crash_30": lambda ts: flash_crash(ts, -0.3, 0.8, 30, name="flash_crash_30"),
+    "flash_crash_50": lambda ts: flash_crash(ts, -0.5, 0.6, 60, name="flash_crash_50"),
+    "gap_and_recover": lambda ts: gap_and_recover(ts, -0.2, 240, name="gap_and_recover"),
+    "exchange_outage_1h": lambda ts: exchange_outage(ts, 60, -0.1, name="exchange_outage_1h"),
+    "liquidation_cascade": lambda ts: liquidation_cascade(ts, name="liquidation_cascade"),
+}
+
+
+def scenario_grid(
+    timestamps: Iterable[pd.Timestamp],
+    shock_pcts: Iterable[float],
+    recovery: Optional[Sequence[float]] = None,
+    freeze_bars: int = 0
+) -> pd.DataFrame:
+    """
+    Cartesian product of shock dates and sizes, sharing one recovery profile.
+    """
+    rows = [
+        {"name": None, "timestamp": ts, "shock_pct": shock, "recovery": recovery, "freeze_bars": freeze_bars}
+        for ts in timestamps for shock in shock_pcts
+    ]
+    return pd.DataFrame(rows)
+
+
+def canned_scenario_grid(
+    timestamps: Iterable[pd.Timestamp],
+    names: Optional[Sequence[str]] = None
+) -> pd.DataFrame:
+    """
+    Canned crypto scenarios (see CANNED_SCENARIOS) placed at each timestamp.
+    """
+    names = list(names) if names is not None else list(CANNED_SCENARIOS)
+    unknown = set(names) - set(CANNED_SCENARIOS)
+    if unknown:
+        raise ValueError(f"Unknown canned scenarios: {sorted(unknown)}")
+    return pd.DataFrame([CANNED_SCENARIOS[n](ts) for ts in timestamps for n in names])
+
+
+def evaluate_scenarios(
+    returns: pd.Series,
+    scenarios: Union[pd.DataFrame, List[ScenarioSpec]],
+    initial_capital: float = 1.0,
+    chunk_size: int = 1024,
+    worst_n: int = 60
+) -> pd.DataFrame:
+    """
+    Apply every scenario to `returns` and compute path outcomes in chunked matrix passes.
+
+    Args:
+        returns: Series of strategy period returns.
+        scenarios: DataFrame or list of scenario dicts (see module docstring).
+        initial_capital: Starting capital for final/min capital.
+        chunk_size: Scenarios evaluated per (chunk x time) matrix.
+        worst_n: Window for the worst N-bar loss.
+
+    Returns:
+        DataFrame with one row per scenario: name, timestamp, shock_pct, final_capital,
+        max_drawdown, min_capital, worst_n_loss.
+
+    Raises:
+        KeyError: If any scenario timestamp is not in `returns.index`.
+    """
+    table = scenarios if isinstance(scenarios, pd.DataFrame) else pd.DataFrame(scenarios)
+    table = table.reset_index(drop=True)
+    n_scen = len(table)
+    base = returns.to_numpy(dtype=float)
+    n_periods = len(base)
+
+    positions = returns.index.get_indexer(pd.Index(table["timestamp"]))
+    if (positions < 0).any():
+        missing = table["timestamp"][positions < 0].iloc[0]
+        raise KeyError(f"Shock timestamp {missing} not in index")
+    freeze = table["freeze_bars"].fillna(0).to_numpy(dtype=int) if "freeze_bars" in table else np.zeros(n_scen, int)
+    shocks = table["shock_pct"].to_numpy(dtype=float)
+    recoveries = table["recovery"] if "recovery" in table else pd.Series([None] * n_scen)
+
+    out = {k: np.empty(n_scen) for k in ("final_capital", "max_drawdown", "min_capital", "worst_n_loss")}
+    cols = np.arange(n_periods)
+    for lo in range(0, n_scen, chunk_size):
+        hi = min(lo + chunk_size, n_scen)
+        rows = np.arange(hi - lo)
+        start = positions[lo:hi]
+        shock_at = np.minimum(start + freeze[lo:hi], n_periods - 1)
+
+        matrix = np.tile(base, (hi - lo, 1))
+        frozen = (cols >= start[:, None]) & (cols < shock_at[:, None])
+        matrix[frozen] = 0.0
+        matrix[rows, shock_at] += shocks[lo:hi]
+
+        profiles = [np.asarray(r, dtype=float) if r is not None else np.empty(0) for r in recoveries[lo:hi]]
+        width = max((len(p) for p in profiles), default=0)
+        if width:
+            padded = np.zeros((hi - lo, width))
+            for i, p in enumerate(profiles):
+                padded[i, :len(p)] = p
+            at = shock_at[:, None] + 1 + np.arange(width)
+            inside = at < n_periods
+            r_idx = np.broadcast_to(rows[:, None], at.shape)
+            matrix[r_idx[inside], at[inside]] += padded[inside]
+
+        stats = path_statistics(matrix.T, worst_n)
+        out["final_capital"][lo:hi] = initial_capital * (1.0 + stats["final_return"])
+        out["max_drawdown"][lo:hi] = stats["max_drawdown"]
+        out["min_capital"][lo:hi] = initial_capital * stats["min_capital"]
+        out["worst_n_loss"][lo:hi] = stats["worst_n_loss"]
+
+    logger.info(f"Evaluated {n_scen} scenarios over {n_periods} periods")
+    result = pd.DataFrame({
+        "name": table["name"] if "name" in table else None,
+        "timestamp": table["timestamp"],
+        "shock_pct": shocks,
+    })
+    for key, values in out.items():
+        result[key] = values
+    return result
@@ -2,9 +2,12 @@
 Slippage and latency simulation for backtesting.
 """
 
-from typing import Dict, List
+from typing import Dict, List, Optional, Sequence, Union
+import numpy as np
 import pandas as pd
 
+LATENCY_DISTRIBUTIONS = ("fixed", "exponential", "lognormal", "uniform")
+
 def apply_slippage(
     price: float,
     slippage_pct: float,
@@ -74,3 +77,138 @@ def simulate_fill_orders(
         fill["timestamp"] = adj_ts
         fills.append(fill)
     return fills
+
+
+def sample_latency_ms(
+    n: int,
+    distribution: str = "fixed",
+    latency_ms: float = 0.0,
+    jitter_ms: float = 0.0,
+    rng: Optional[np.random.Generator] = None
+) -> np.ndarray:
+    """
+    Draw `n` latencies in milliseconds.
+
+    Args:
+        n: Number of samples.
+        distribution: One of LATENCY_DISTRIBUTIONS:
+            - fixed:       always `latency_ms`
+            - exponential: `latency_ms` + Exp(mean=`jitter_ms`)
+            - lognormal:   median `latency_ms`, log-space sigma `jitter_ms / latency_ms`
+            - uniform:     `latency_ms` +/- `jitter_ms` (floored at 0)
+        latency_ms: Base (or median) latency.
+        jitter_ms: Spread parameter, see above.
+        rng: NumPy Generator (a fresh default_rng() if None).
+
+    Returns:
+        Float array of non-negative latencies.
+    """
+    if distribution not in LATENCY_DISTRIBUTIONS:
+        raise ValueError(f"distribution must be one of {LATENCY_DISTRIBUTIONS}")
+    if latency_ms < 0 or jitter_ms < 0:
+        raise ValueError("latency_ms and jitter_ms must be non-negative")
+    rng = rng if rng is not None else np.random.default_rng()
+    if distribution == "fixed" or (jitter_ms == 0 and distribution != "lognormal"):
+        return np.full(n, float(latency_ms))
+    if distribution == "exponential":
+        return latency_ms + rng.exponential(jitter_ms, n)
+    if distribution == "lognormal":
+        if latency_ms == 0:
+            raise ValueError("lognormal latency needs a positive latency_ms (median)")
+        return latency_ms * np.exp(rng.standard_normal(n) * (jitter_ms / latency_ms))
+    return np.maximum(latency_ms + rng.uniform(-jitter_ms, jitter_ms, n), 0.0)
+
+
+def simulate_fills_vectorized(
+    bars: pd.DataFrame,
+    timestamps: Union[Sequence, np.ndarray, pd.DatetimeIndex],
+    sides: Union[Sequence[str], np.ndarray],
+    sizes: Union[Sequence[float], np.ndarray],
+    slippage_pct: float = 0.0,
+    impact_coef: float = 0.1,
+    max_impact: float = 0.1,
+    latency_distribution: str = "fixed",
+    latency_ms: float = 0.0,
+    jitter_ms: float = 0.0,
+    seed: Optional[int] = None,
+    bar_ms: Optional[float] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Columnar fill model for many orders against a bar series.
+
+    Each order is delayed by a sampled latency and fills at the close of the last
+    bar that had closed (index timestamp + `bar_ms`) by the delayed time, located
+    with `searchsorted`. That is the latest price known at the delayed time, so
+    fills never look ahead and sub-bar latency can move a fill to a later bar. The close is
+    moved against the order by `slippage_pct + impact_coef * sqrt(size / volume)`,
+    capped at `max_impact`. Volume comes from that bar; without a 'volume' column
+    only the fixed slippage applies.
+
+    Args:
+        bars: DataFrame indexed by timestamp with 'close' and optionally 'volume'.
+        timestamps: Order submission times.
+        sides: 'buy' or 'sell' per order.
+        sizes: Order size per order (base units).
+        slippage_pct: Fixed slippage applied to every fill.
+        impact_coef: Square-root impact coefficient.
+        max_impact: Cap on total slippage + impact as a fraction of price.
+        latency_distribution: See `sample_latency_ms`.
+        latency_ms: Base latency in milliseconds.
+        jitter_ms: Latency spread in milliseconds.
+        seed: Seed for the latency draws.
+        bar_ms: Bar length in milliseconds; inferred from the median index spacing
+            if None.
+
+    Returns:
+        Dict of equal-length arrays: timestamp (delayed, datetime64[ns]), price,
+        base_price, impact, latency_ms, bar_index (-1 and NaN prices for orders
+        arriving before the first bar closes).
+
+    Raises:
+        ValueError: On mismatched lengths or invalid sides.
+    """
+    sizes = np.asarray(sizes, dtype=float)
+    sides = np.asarray(sides)
+    ts = pd.DatetimeIndex(timestamps)
+    if ts.tz is not None:
+        ts = ts.tz_convert("UTC").tz_localize(None)
+    ts = ts.as_unit("ns")
+    n = len(sizes)
+    if not (len(ts) == len(sides) == n):
+        raise ValueError("timestamps, sides and sizes must have the same length")
+    is_buy = sides == "buy"
+    if not np.all(is_buy | (sides == "sell")):
+        raise ValueError("side must be 'buy' or 'sell'")
+
+    bar_index = pd.DatetimeIndex(bars.index)
+    if bar_index.tz is not None:
+        bar_index = bar_index.tz_convert("UTC").tz_localize(None)
+    bar_ns = bar_index.as_unit("ns").asi8
+    close = bars["close"].to_numpy(dtype=float)
+    if bar_ms is None:
+        bar_len = int(np.median(np.diff(bar_ns))) if len(bar_ns) > 1 else 0
+    else:
+        bar_len = int(round(bar_ms * 1e6))
+
+    latency = sample_latency_ms(n, latency_distribution, latency_ms, jitter_ms, np.random.default_rng(seed))
+    delayed = ts.asi8 + np.round(latency * 1e6).astype(np.int64)
+    pos = np.searchsorted(bar_ns + bar_len, delayed, side="right") - 1
+    valid = pos >= 0
+    safe = np.where(valid, pos, 0)
+
+    base = np.where(valid, close[safe], np.nan)
+    impact = np.full(n, float(slippage_pct))
+    if "volume" in bars and impact_coef:
+        volume = bars["volume"].to_numpy(dtype=float)[safe]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            impact += impact_coef * np.sqrt(np.where(volume > 0, sizes / volume, np.inf))
+    np.minimum(impact, max_impact, out=impact)
+
+    return {
+        "timestamp": delayed.astype("datetime64[ns]"),
+        "price": base * np.where(is_buy, 1.0 + impact, 1.0 - impact),
+        "base_price": base,
+        "impact": impact,
+        "latency_ms": latency,
+        "bar_index": np.where(valid, pos, -1),
+    }
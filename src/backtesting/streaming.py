@@ -0,0 +1,129 @@
+"""
+Out-of-core backtesting: stream OHLCV record batches from the Parquet lake.
+
+Only one batch is held in memory at a time. Strategy state is carried across
+batch boundaries with `generate_signals_stream`, and portfolio state (cash-flow
+PnL, trade count) is carried in the backtester. The result is identical to
+`Backtester.run` on the concatenated history.
+"""
+
+import logging
+import os
+from typing import Dict, Iterable, Iterator, Optional, Sequence
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+logger = logging.getLogger(__name__)
+
+LAKE_ROOT = "data/ohlcv"
+OHLCV_COLUMNS = ["timestamp", "open", "high", "low", "close", "volume"]
+
+
+def lake_path(exchange: str, symbol: str, timeframe: str, root: str = LAKE_ROOT) -> str:
+    """
+    Directory holding all partitions for one exchange/symbol/timeframe.
+    """
+    return os.path.join(root, exchange, symbol.replace("/", "-"), timeframe)
+
+
+def iter_lake_batches(
+    path: str,
+    batch_size: int = 100_000,
+    columns: Optional[Sequence[str]] = None,
+    start: Optional[pd.Timestamp] = None,
+    end: Optional[pd.Timestamp] = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Yield chronologically ordered DataFrame batches from a hive-partitioned lake path.
+
+    Partition files are read in path order (year=/month=/day= sort chronologically)
+    and each file is scanned in record batches of at most `batch_size` rows.
+
+    Args:
+        path: Lake directory (see `lake_path`) or a single Parquet file.
+        batch_size: Maximum rows per batch.
+        columns: Columns to read (default: OHLCV_COLUMNS).
+        start: Inclusive lower timestamp bound.
+        end: Exclusive upper timestamp bound.
+    """
+    if batch_size <= 0:
+        raise ValueError("batch_size must be positive")
+    dataset = ds.dataset(path, format="parquet", partitioning="hive")
+    columns = list(columns or OHLCV_COLUMNS)
+    ts_type = dataset.schema.field("timestamp").type
+    expr = None
+    if start is not None:
+        expr = ds.field("timestamp") >= pa.scalar(pd.Timestamp(start), type=ts_type)
+    if end is not None:
+        upper = ds.field("timestamp") < pa.scalar(pd.Timestamp(end), type=ts_type)
+        expr = upper if expr is None else expr & upper
+
+    for fragment in sorted(dataset.get_fragments(), key=lambda f: f.path):
+        for batch in fragment.to_batches(columns=columns, filter=expr, batch_size=batch_size):
+            if batch.num_rows:
+                yield batch.to_pandas()
+
+
+class StreamingBacktester:
+    """
+    Backtester over an iterable of OHLCV batches with bounded memory.
+    """
+
+    def __init__(self, strategy, batches: Iterable[pd.DataFrame], cfg=None):
+        """
+        Args:
+            strategy: Strategy implementing `generate_signals_stream`.
+            batches: Chronological OHLCV batches (e.g. from `iter_lake_batches`).
+            cfg: Optional config, kept for parity with `Backtester`.
+        """
+        self.strategy = strategy
+        self.batches = batches
+        self.cfg = cfg
+        self.pnl = 0.0
+
+    @classmethod
+    def from_lake(
+        cls,
+        strategy,
+        exchange: str,
+        symbol: str,
+        timeframe: str,
+        root: str = LAKE_ROOT,
+        batch_size: int = 100_000,
+        start: Optional[pd.Timestamp] = None,
+        end: Optional[pd.Timestamp] = None,
+        cfg=None
+    ) -> "StreamingBacktester":
+        """
+        Build a backtester streaming one symbol's partitions from the lake.
+        """
+        path = lake_path(exchange, symbol, timeframe, root)
+        return cls(strategy, iter_lake_batches(path, batch_size, start=start, end=end), cfg)
+
+    def run(self) -> Dict:
+        """
+        Consume all batches.
+
+        Returns:
+            Dict with pnl and trades (as `Backtester.run`), plus batches and rows seen.
+        """
+        state = None
+        trades = n_batches = n_rows = 0
+        for batch in self.batches:
+            signals, state = self.strategy.generate_signals_stream(batch, state)
+            if signals:
+                ts = pd.to_datetime(batch["timestamp"]) if "timestamp" in batch.columns else batch.index
+                close = pd.Series(batch["close"].to_numpy(), index=ts)
+                for sig in signals:
+                    price = close[sig["timestamp"]]
+                    if sig["side"] == "buy":
+                        self.pnl -= price * sig["size"]
+                    else:
+                        self.pnl += price * sig["size"]
+                trades += len(signals)
+            n_batches += 1
+            n_rows += len(batch)
+        logger.info(f"Streaming backtest: {n_rows} rows in {n_batches} batches, {trades} trades")
+        return {"pnl": self.pnl, "trades": trades, "batches": n_batches, "rows": n_rows}
@@ -3,17 +3,69 @@ Stress testing: Monte Carlo simulations and black-swan shocks.
 """
 
 import logging
-from typing import Optional
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, Sequence
 import pandas as pd
 import numpy as np
 
 logger = logging.getLogger(__name__)
 
+BOOTSTRAP_METHODS = ("iid", "moving_block", "stationary")
+
+
+def bootstrap_indices(
+    n_periods: int,
+    n_sims: int,
+    rng: np.random.Generator,
+    method: str = "iid",
+    block_size: int = 20
+) -> np.ndarray:
+    """
+    Draw resampling indices into a return history.
+
+    Args:
+        n_periods: Length of the history (and of each simulated path).
+        n_sims: Number of simulated paths.
+        rng: numpy Generator to draw from.
+        method: "iid" (single periods), "moving_block" (fixed-length contiguous
+            blocks) or "stationary" (Politis-Romano: geometric block lengths with mean
+            `block_size`, wrapping around the end of the history).
+        block_size: Block length (mean block length for "stationary").
+
+    Returns:
+        Integer array of shape (n_periods, n_sims).
+    """
+    if method not in BOOTSTRAP_METHODS:
+        raise ValueError(f"method must be one of {BOOTSTRAP_METHODS}")
+    if block_size <= 0:
+        raise ValueError("block_size must be positive")
+
+    if method == "iid":
+        return rng.integers(0, n_periods, size=(n_periods, n_sims))
+
+    if method == "moving_block":
+        block = min(block_size, n_periods)
+        n_blocks = -(-n_periods // block)
+        starts = rng.integers(0, n_periods - block + 1, size=(n_blocks, 1, n_sims))
+        idx = starts + np.arange(block)[None, :, None]
+        return idx.reshape(n_blocks * block, n_sims)[:n_periods]
+
+    # Stationary bootstrap: a new block starts with probability 1/block_size.
+    starts = rng.integers(0, n_periods, size=(n_periods, n_sims))
+    new_block = rng.random((n_periods, n_sims)) < 1.0 / block_size
+    new_block[0] = True
+    rows = np.arange(n_periods)[:, None]
+    block_row = np.maximum.accumulate(np.where(new_block, rows, 0), axis=0)
+    block_start = np.take_along_axis(starts, block_row, axis=0)
+    return (block_start + rows - block_row) % n_periods
+
 
 def monte_carlo_returns(
     returns: pd.Series,
     n_sims: int,
-    seed: Optional[int] = None
+    seed: Optional[int] = None,
+    method: str = "iid",
+    block_size: int = 20
 ) -> pd.DataFrame:
     """
     Generate Monte Carlo return simulations by sampling with replacement.
@@ -22,14 +74,21 @@ def monte_carlo_returns(
         returns: Series of historical period returns (e.g. 0.01 for +1%).
         n_sims: Number of simulated trajectories.
         seed: Optional RNG seed for reproducibility.
+        method: "iid", "moving_block" or "stationary" (see bootstrap_indices).
+            Block methods keep volatility clustering that i.i.d. sampling destroys.
+        block_size: Block length (mean length for "stationary").
 
     Returns:
         DataFrame of shape (len(returns), n_sims) where each column is one sim.
     """
     rng = np.random.default_rng(seed)
-    sims = rng.choice(returns.values, size=(len(returns), n_sims), replace=True)
+    if method == "iid":
+        sims = rng.choice(returns.values, size=(len(returns), n_sims), replace=True)
+    else:
+        idx = bootstrap_indices(len(returns), n_sims, rng, method, block_size)
+        sims = returns.to_numpy()[idx]
     sim_df = pd.DataFrame(sims, index=returns.index)
-    logger.info(f"Generated {n_sims} Monte Carlo simulations")
+    logger.info(f"Generated {n_sims} Monte Carlo simulations ({method})")
     return sim_df
 
 
@@ -54,6 +113,242 @@ def simulate_pnl(
     return finals
 
 
+STREAMING_STATS = ("final_capital", "max_drawdown", "time_to_ruin")
+
+# Working set per (period, sim) cell: int64 sample indices, gathered log-returns,
+# cumulative log-wealth, running peak, drawdown temporary and the ruin mask.
+_BYTES_PER_CELL = 48
+
+
+def _plan_chunks(n_periods: int, n_sims: int, block_sims: int, memory_limit_mb: float):
+    """
+    Choose (time slab length, sims per chunk) so one slab of one chunk fits the ceiling.
+    """
+    cells = max(1, int(memory_limit_mb * 1024 * 1024) // _BYTES_PER_CELL)
+    slab = max(1, min(n_periods, cells // block_sims))
+    blocks_per_chunk = max(1, cells // (slab * block_sims))
+    return slab, min(n_sims, blocks_per_chunk * block_sims)
+
+
+def streaming_monte_carlo(
+    returns: pd.Series,
+    n_sims: int,
+    initial_capital: float,
+    seed: Optional[int] = None,
+    stats: Sequence[str] = STREAMING_STATS,
+    ruin_threshold: float = 0.5,
+    memory_limit_mb: float = 256.0,
+    block_sims: int = 64
+) -> pd.DataFrame:
+    """
+    Bounded-memory Monte Carlo: i.i.d. resampling with per-simulation statistics only.
+
+    Simulations are processed in column chunks and, for long histories, in time slabs.
+    Log-returns are accumulated per simulation while running peak, max drawdown and
+    the first ruin period are carried across slabs, so no (periods x n_sims) matrix is
+    ever materialized.
+
+    Every block of `block_sims` simulations draws from its own child of
+    SeedSequence(seed), so results depend only on `seed` and `block_sims`, not on
+    how the memory ceiling splits the work.
+
+    Args:
+        returns: Series of historical period returns (e.g. 0.01 for +1%).
+        n_sims: Number of simulated trajectories.
+        initial_capital: Starting capital.
+        seed: Optional RNG seed for reproducibility.
+        stats: Subset of ("final_capital", "max_drawdown", "time_to_ruin").
+        ruin_threshold: Capital fraction of initial_capital at or below which a
+            simulation counts as ruined.
+        memory_limit_mb: Ceiling for the working arrays of one chunk.
+        block_sims: Simulations per RNG block (the unit of reproducible chunking).
+
+    Returns:
+        DataFrame indexed by simulation with one column per requested stat.
+        max_drawdown is a positive fraction of the running peak; time_to_ruin is the
+        1-based period of first ruin, or NaN if the simulation never ruins.
+    """
+    unknown = set(stats) - set(STREAMING_STATS)
+    if unknown:
+        raise ValueError(f"Unknown stats: {sorted(unknown)}")
+    if n_sims <= 0 or block_sims <= 0:
+        raise ValueError("n_sims and block_sims must be positive")
+    if not 0 < ruin_threshold < 1:
+        raise ValueError("ruin_threshold must be in (0, 1)")
+
+    with np.errstate(divide="ignore"):
+        log_r = np.log1p(returns.to_numpy(dtype=float))
+    n_periods = len(log_r)
+    log_ruin = np.log(ruin_threshold)
+
+    n_blocks = -(-n_sims // block_sims)
+    children = np.random.SeedSequence(seed).spawn(n_blocks)
+    slab, chunk_sims = _plan_chunks(n_periods, n_sims, block_sims, memory_limit_mb)
+    blocks_per_chunk = max(1, chunk_sims // block_sims)
+
+    final = np.empty(n_sims)
+    max_dd = np.empty(n_sims)
+    ruin_at = np.full(n_sims, np.nan)
+
+    for first_block in range(0, n_blocks, blocks_per_chunk):
+        blocks = range(first_block, min(first_block + blocks_per_chunk, n_blocks))
+        lo = first_block * block_sims
+        hi = min(n_sims, blocks[-1] * block_sims + block_sims)
+        widths = [min(block_sims, n_sims - b * block_sims) for b in blocks]
+        rngs = [np.random.default_rng(children[b]) for b in blocks]
+
+        wealth = np.zeros(hi - lo)
+        peak = np.zeros(hi - lo)
+        worst = np.zeros(hi - lo)
+        ruined = np.full(hi - lo, np.nan)
+
+        for start in range(0, n_periods, slab):
+            rows = min(slab, n_periods - start)
+            idx = np.hstack([rng.integers(0, n_periods, size=(rows, w)) for rng, w in zip(rngs, widths)])
+            path = np.cumsum(log_r[idx], axis=0)
+            path += wealth
+            running_peak = np.maximum.accumulate(path, axis=0)
+            np.maximum(running_peak, peak, out=running_peak)
+            worst = np.maximum(worst, (running_peak - path).max(axis=0))
+
+            breach = path <= log_ruin
+            hit = breach.any(axis=0) & np.isnan(ruined)
+            ruined[hit] = start + breach[:, hit].argmax(axis=0) + 1
+
+            wealth = path[-1]
+            peak = running_peak[-1]
+
+        final[lo:hi] = initial_capital * np.exp(wealth)
+        max_dd[lo:hi] = 1.0 - np.exp(-worst)
+        ruin_at[lo:hi] = ruined
+
+    logger.info(f"Streamed {n_sims} Monte Carlo simulations in chunks of {chunk_sims} x {slab}")
+    columns = {"final_capital": final, "max_drawdown": max_dd, "time_to_ruin": ruin_at}
+    return pd.DataFrame({k: columns[k] for k in stats})
+
+
+PATH_STATS = ("final_return", "max_drawdown", "min_capital", "worst_n_loss")
+
+
+def path_statistics(
+    sim_returns: np.ndarray,
+    worst_n: int = 60
+) -> Dict[str, np.ndarray]:
+    """
+    Vectorized per-path statistics for a (periods x sims) matrix of returns.
+
+    Args:
+        sim_returns: Array (or DataFrame) of simple returns, one column per path.
+        worst_n: Window length, in bars, for the worst N-bar loss.
+
+    Returns:
+        Dict of per-path arrays:
+          - final_return: compounded return over the whole path
+          - max_drawdown: largest fall from a running peak (positive fraction)
+          - min_capital: lowest capital relative to the starting capital
+          - worst_n_loss: largest compounded loss over any `worst_n` consecutive bars
+    """
+    values = np.asarray(sim_returns, dtype=float)
+    with np.errstate(divide="ignore"):
+        log_path = np.cumsum(np.log1p(values), axis=0)
+    # Prepend the starting point (log-wealth 0) so peaks and windows include it.
+    log_path = np.vstack([np.zeros((1, values.shape[1])), log_path])
+
+    peak = np.maximum.accumulate(log_path, axis=0)
+    n = min(worst_n, values.shape[0])
+    window = log_path[n:] - log_path[:-n]
+    return {
+        "final_return": np.expm1(log_path[-1]),
+        "max_drawdown": 1.0 - np.exp(-(peak - log_path).max(axis=0)),
+        "min_capital": np.exp(log_path.min(axis=0)),
+        "worst_n_loss": -np.expm1(window.min(axis=0)),
+    }
+
+
+def _stress_task(
+    values: np.ndarray,
+    n_sims: int,
+    seed: np.random.SeedSequence,
+    method: str,
+    block_size: int,
+    worst_n: int
+) -> Dict[str, np.ndarray]:
+    # Module-level so ProcessPoolExecutor can pickle it.
+    rng = np.random.default_rng(seed)
+    idx = bootstrap_indices(len(values), n_sims, rng, method, block_size)
+    return path_statistics(values[idx], worst_n)
+
+
+def run_stress_suite(
+    returns: pd.Series,
+    n_sims: int,
+    method: str = "stationary",
+    block_size: int = 20,
+    worst_n: int = 60,
+    var_levels: Sequence[float] = (0.95, 0.99),
+    max_drawdown: Optional[float] = None,
+    seed: Optional[int] = None,
+    n_workers: int = 0,
+    sims_per_task: int = 256
+) -> pd.DataFrame:
+    """
+    Bootstrap stress suite summarized as a compact table.
+
+    Simulations are split into tasks of `sims_per_task`, each with its own
+    SeedSequence child, and spread over a process pool. Results depend only on
+    `seed` and `sims_per_task`, not on `n_workers`.
+
+    Args:
+        returns: Series of historical period returns.
+        n_sims: Number of simulated paths.
+        method: "iid", "moving_block" or "stationary".
+        block_size: Block length (mean length for "stationary").
+        worst_n: Window for the worst N-bar loss.
+        var_levels: Confidence levels for VaR/CVaR of the final return.
+        max_drawdown: Drawdown limit as in Portfolio.max_drawdown; the probability
+            that capital falls below initial * (1 - max_drawdown) is reported.
+        seed: Optional RNG seed for reproducibility.
+        n_workers: Process pool size (0 = run in-process).
+        sims_per_task: Simulations per pool task.
+
+    Returns:
+        DataFrame indexed by metric name with a single 'value' column.
+    """
+    if n_sims <= 0 or sims_per_task <= 0:
+        raise ValueError("n_sims and sims_per_task must be positive")
+    values = returns.to_numpy(dtype=float)
+    sizes = [min(sims_per_task, n_sims - lo) for lo in range(0, n_sims, sims_per_task)]
+    children = np.random.SeedSequence(seed).spawn(len(sizes))
+    args = [(values, n, child, method, block_size, worst_n) for n, child in zip(sizes, children)]
+
+    if n_workers > 0:
+        with ProcessPoolExecutor(n_workers) as pool:
+            parts = list(pool.map(_stress_task, *zip(*args)))
+    else:
+        parts = [_stress_task(*a) for a in args]
+    stats = {k: np.concatenate([p[k] for p in parts]) for k in PATH_STATS}
+
+    final = stats["final_return"]
+    summary: Dict[str, float] = {
+        "n_sims": float(n_sims),
+        "final_return_mean": float(final.mean()),
+        "final_return_median": float(np.median(final)),
+    }
+    for level in var_levels:
+        q = np.quantile(final, 1.0 - level)
+        pct = f"{level * 100:g}"
+        summary[f"var_{pct}"] = float(-q)
+        summary[f"cvar_{pct}"] = float(-final[final <= q].mean())
+    summary["max_drawdown_mean"] = float(stats["max_drawdown"].mean())
+    summary["max_drawdown_p95"] = float(np.quantile(stats["max_drawdown"], 0.95))
+    summary[f"worst_{worst_n}_bar_loss_p95"] = float(np.quantile(stats["worst_n_loss"], 0.95))
+    if max_drawdown is not None:
+        summary["prob_breach_max_drawdown"] = float((stats["min_capital"] < 1.0 - max_drawdown).mean())
+
+    logger.info(f"Stress suite ({method}) over {n_sims} simulations complete")
+    return pd.DataFrame({"value": pd.Series(summary)})
+
+
 def inject_black_swan(
     returns: pd.Series,
     shock_pct: float,
@@ -6,7 +6,7 @@ import ccxt
 import time
 import threading
 import os
-from typing import Any, Callable, Dict, Tuple
+from typing import Any, Callable, Dict, Optional, Tuple
 from functools import wraps
 
 # Simple TTL cache decorator
@@ -49,14 +49,33 @@ class RateLimiter:
                 time.sleep(wait)
             self.last_time = time.time()
 
-# One RateLimiter per exchange
+# One shared client per exchange and market type, one RateLimiter per exchange
+_exchanges: Dict[Tuple[str, Optional[str]], Any] = {}
+_exchanges_lock = threading.Lock()
 _rate_limiters: Dict[str, RateLimiter] = {}
 
+def get_exchange(exchange_id: str, market_type: Optional[str] = None) -> Any:
+    """
+    Shared rate-limited ccxt client for `exchange_id` (one HTTP session per process).
+
+    Args:
+        exchange_id: ccxt exchange id.
+        market_type: ccxt options.defaultType, e.g. "spot" or "swap"; None keeps the
+            exchange's default. Each market type gets its own client.
+    """
+    key = (exchange_id, market_type)
+    with _exchanges_lock:
+        if key not in _exchanges:
+            exchange_cls = getattr(ccxt, exchange_id)
+            params: Dict[str, Any] = {"enableRateLimit": True}
+            if market_type is not None:
+                params["options"] = {"defaultType": market_type}
+            _exchanges[key] = exchange_cls(params)
+        return _exchanges[key]
+
 def get_rate_limiter(exchange_id: str) -> RateLimiter:
     if exchange_id not in _rate_limiters:
-        exchange_cls = getattr(ccxt, exchange_id)
-        exch = exchange_cls({"enableRateLimit": True})
-        _rate_limiters[exchange_id] = RateLimiter(exch.rateLimit)
+        _rate_limiters[exchange_id] = RateLimiter(get_exchange(exchange_id).rateLimit)
     return _rate_limiters[exchange_id]
 
 @ttl_cache(ttl_seconds=300)
@@ -66,9 +85,7 @@ def fetch_markets(exchange_id: str) -> Any:
     """
     limiter = get_rate_limiter(exchange_id)
     limiter()
-    exchange_cls = getattr(ccxt, exchange_id)
-    exch = exchange_cls({"enableRateLimit": True})
-    return exch.fetch_markets()
+    return get_exchange(exchange_id).fetch_markets()
 
 @ttl_cache(ttl_seconds=10)
 def fetch_ticker(exchange_id: str, symbol: str) -> Any:
@@ -77,9 +94,25 @@ def fetch_ticker(exchange_id: str, symbol: str) -> Any:
     """
     limiter = get_rate_limiter(exchange_id)
     limiter()
-    exchange_cls = getattr(ccxt, exchange_id)
-    exch = exchange_cls({"enableRateLimit": True})
-    return exch.fetch_ticker(symbol)
+    return get_exchange(exchange_id).fetch_ticker(symbol)
+
+@ttl_cache(ttl_seconds=10)
+def fetch_tickers(
+    exchange_id: str,
+    symbols: Optional[Tuple[str, ...]] = None,
+    market_type: Optional[str] = None
+) -> Any:
+    """
+    Fetch and cache tickers for many symbols in one request (10-second TTL).
+
+    Args:
+        exchange_id: ccxt exchange id.
+        symbols: Tuple of symbols, or None for every market of `market_type`.
+        market_type: See `get_exchange`.
+    """
+    limiter = get_rate_limiter(exchange_id)
+    limiter()
+    return get_exchange(exchange_id, market_type).fetch_tickers(list(symbols) if symbols else None)
 
 @ttl_cache(ttl_seconds=10)
 def fetch_order_book(exchange_id: str, symbol: str, limit: int = None) -> Any:
@@ -88,6 +121,4 @@ def fetch_order_book(exchange_id: str, symbol: str, limit: int = None) -> Any:
     """
     limiter = get_rate_limiter(exchange_id)
     limiter()
-    exchange_cls = getattr(ccxt, exchange_id)
-    exch = exchange_cls({"enableRateLimit": True})
-    return exch.fetch_order_book(symbol, limit)
+    return get_exchange(exchange_id).fetch_order_book(symbol, limit)
@@ -0,0 +1,121 @@
+"""
+Fixed-size OHLCV ring buffer for live strategy input.
+
+Rows are ccxt-style [timestamp_ms, open, high, low, close, volume] stored as
+float64 (millisecond timestamps are exact in float64). Every row is written twice,
+at slot i and slot i + capacity of a (2 * capacity, 6) array, so the most recent
+N rows are always one contiguous slice. Reads are therefore zero-copy views, with
+no wrap-around stitching.
+"""
+
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+OHLCV_COLUMNS = ["timestamp", "open", "high", "low", "close", "volume"]
+_COLUMN_POS = {name: i for i, name in enumerate(OHLCV_COLUMNS)}
+
+
+class OHLCVRingBuffer:
+    """
+    Preallocated per-symbol/timeframe bar store with O(1) appends.
+
+    Appending a bar with the same timestamp as the last one replaces it (the
+    still-forming candle). Bars older than the last one are ignored.
+    """
+
+    def __init__(self, capacity: int):
+        """
+        Args:
+            capacity: Maximum number of bars retained.
+        """
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self._data = np.zeros((2 * capacity, len(OHLCV_COLUMNS)))
+        self._pos = 0
+        self.size = 0
+        self.last_ts: Optional[int] = None
+
+    def __len__(self) -> int:
+        return self.size
+
+    def append(self, row: Sequence[float]) -> bool:
+        """
+        Add one bar.
+
+        Args:
+            row: [timestamp_ms, open, high, low, close, volume].
+
+        Returns:
+            True if the bar was appended or replaced the forming bar, False if ignored.
+        """
+        ts = int(row[0])
+        if self.last_ts is not None:
+            if ts < self.last_ts:
+                return False
+            if ts == self.last_ts:
+                slot = (self._pos - 1) % self.capacity
+                self._data[slot] = row
+                self._data[slot + self.capacity] = row
+                return True
+        slot = self._pos
+        self._data[slot] = row
+        self._data[slot + self.capacity] = row
+        self._pos = (slot + 1) % self.capacity
+        if self.size < self.capacity:
+            self.size += 1
+        self.last_ts = ts
+        return True
+
+    def extend(self, rows: Sequence[Sequence[float]]) -> int:
+        """
+        Add bars in order; returns how many were appended or replaced.
+        """
+        # Only the last `capacity` rows can survive, so skip the rest up front.
+        rows = rows[-self.capacity - 1:] if len(rows) > self.capacity + 1 else rows
+        return sum(self.append(row) for row in rows)
+
+    def view(self, n: Optional[int] = None) -> np.ndarray:
+        """
+        Read-only zero-copy (n, 6) view of the most recent `n` bars (all by default),
+        oldest first. The view reflects later writes, so copy it to keep a snapshot.
+        """
+        n = self.size if n is None else min(n, self.size)
+        end = self._pos + self.capacity
+        out = self._data[end - n:end]
+        out.flags.writeable = False
+        return out
+
+    def column(self, name: str, n: Optional[int] = None) -> np.ndarray:
+        """
+        Zero-copy view of one field (e.g. "close") over the most recent `n` bars.
+        """
+        return self.view(n)[:, _COLUMN_POS[name]]
+
+    def to_frame(self, n: Optional[int] = None) -> pd.DataFrame:
+        """
+        DataFrame of the most recent `n` bars with UTC timestamps, for strategies
+        that take DataFrames (same layout as `candles_to_frame`).
+        """
+        data = self.view(n)
+        df = pd.DataFrame(data, columns=OHLCV_COLUMNS)
+        df["timestamp"] = pd.to_datetime(data[:, 0].astype(np.int64), unit="ms", utc=True)
+        return df
+
+    def get_state(self) -> Dict[str, Any]:
+        """
+        Checkpointable state: the retained bars, oldest first.
+        """
+        return {"bars": self.view().copy()}
+
+    def set_state(self, state: Dict[str, Any]) -> None:
+        """
+        Replace the contents with bars from `get_state` (keeping the last `capacity`).
+        """
+        self._pos = 0
+        self.size = 0
+        self.last_ts = None
+        bars = np.asarray(state["bars"], dtype=float).reshape(-1, len(OHLCV_COLUMNS))
+        self.extend(bars)
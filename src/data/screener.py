@@ -0,0 +1,217 @@
+"""
+Universe screener over bulk ticker snapshots.
+
+One `fetch_tickers` call returns every market at once. `tickers_to_frame` turns
+those tickers into a columnar DataFrame indexed by symbol, including derived
+spread and 24h-range columns. `Screener` applies vectorized filters and a
+weighted percentile-rank score to that table. A full-universe refresh is a single
+rate-limited request plus a few milliseconds of numpy work, instead of one
+`fetch_ticker` per symbol. Without an explicit client, snapshots go through the
+shared, rate-limited and TTL-cached `cache.fetch_tickers`.
+"""
+
+import logging
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.data import cache
+
+logger = logging.getLogger(__name__)
+
+# ccxt ticker field -> table column
+TICKER_FIELDS = {
+    "last": "last",
+    "bid": "bid",
+    "ask": "ask",
+    "open": "open",
+    "high": "high",
+    "low": "low",
+    "baseVolume": "base_volume",
+    "quoteVolume": "quote_volume",
+    "percentage": "change_pct",
+    "timestamp": "timestamp",
+}
+# Venue-specific ticker info keys that carry the current funding rate.
+_FUNDING_INFO_KEYS = ("fundingRate", "lastFundingRate")
+
+
+def _column(tickers: Sequence[Dict[str, Any]], field: str) -> np.ndarray:
+    return np.array([t.get(field) for t in tickers], dtype=float)
+
+
+def _info_funding(ticker: Dict[str, Any]) -> Optional[float]:
+    info = ticker.get("info") or {}
+    for key in _FUNDING_INFO_KEYS:
+        if info.get(key) is not None:
+            return info[key]
+    return None
+
+
+def tickers_to_frame(
+    tickers: Dict[str, Dict[str, Any]],
+    funding: Optional[Dict[str, Dict[str, Any]]] = None
+) -> pd.DataFrame:
+    """
+    Columnar table from ccxt `fetch_tickers` output.
+
+    Args:
+        tickers: symbol -> ccxt ticker.
+        funding: Optional symbol -> ccxt funding-rate dict (from `fetch_funding_rates`);
+            otherwise funding is read from ticker info where the venue includes it.
+
+    Returns:
+        Float DataFrame indexed by symbol with the TICKER_FIELDS columns plus quote,
+        funding_rate, mid, spread_bps and range_pct ((high - low) / last). Missing
+        values are NaN.
+    """
+    symbols = list(tickers)
+    rows = [tickers[s] for s in symbols]
+    table = pd.DataFrame({col: _column(rows, field) for field, col in TICKER_FIELDS.items()},
+                         index=pd.Index(symbols, name="symbol"))
+
+    if funding is not None:
+        rates = [(funding.get(s) or {}).get("fundingRate") for s in symbols]
+    else:
+        rates = [_info_funding(t) for t in rows]
+    table["funding_rate"] = np.array(rates, dtype=float)
+
+    last = table["last"].to_numpy()
+    bid, ask = table["bid"].to_numpy(), table["ask"].to_numpy()
+    quote_volume = table["quote_volume"].to_numpy(copy=True)
+    missing = np.isnan(quote_volume)
+    quote_volume[missing] = table["base_volume"].to_numpy()[missing] * last[missing]
+    table["quote_volume"] = quote_volume
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mid = (bid + ask) / 2.0
+        table["mid"] = mid
+        table["spread_bps"] = (ask - bid) / mid * 1e4
+        table["range_pct"] = (table["high"].to_numpy() - table["low"].to_numpy()) / last
+    table.insert(0, "quote", table.index.str.split("/").str[-1].str.split(":").str[0])
+    return table
+
+
+class Screener:
+    """
+    Filters and ranks a universe from one bulk ticker snapshot.
+
+    Every filter left as None is not applied. The ranking score is a weighted sum
+    of percentile ranks (0-1) of the `rank_by` columns. A negative weight means
+    lower is better, e.g. {"quote_volume": 1.0, "spread_bps": -0.5}.
+    """
+
+    def __init__(
+        self,
+        exchange: Any = None,
+        exchange_id: str = "binance",
+        market_type: str = "swap",
+        symbols: Optional[Sequence[str]] = None,
+        quote: Optional[str] = None,
+        min_quote_volume: Optional[float] = None,
+        max_spread_bps: Optional[float] = None,
+        min_range_pct: Optional[float] = None,
+        max_range_pct: Optional[float] = None,
+        max_abs_funding: Optional[float] = None,
+        rank_by: Optional[Dict[str, float]] = None,
+        top_n: Optional[int] = None,
+        fetch_funding: bool = False
+    ):
+        """
+        Args:
+            exchange: ccxt-like client. If None, the shared client for
+                (`exchange_id`, `market_type`) is used through `cache.fetch_tickers`.
+            exchange_id: ccxt id used when `exchange` is None.
+            market_type: ccxt defaultType used when `exchange` is None; perpetual
+                swaps by default, since spot tickers carry no funding rates.
+            symbols: Restrict the snapshot to these symbols (None = all markets).
+            quote: Keep only markets quoted in this currency, e.g. "USDT".
+            min_quote_volume: Minimum 24h quote volume.
+            max_spread_bps: Maximum bid/ask spread in basis points.
+            min_range_pct: Minimum 24h (high - low) / last.
+            max_range_pct: Maximum 24h (high - low) / last.
+            max_abs_funding: Maximum absolute funding rate (symbols without funding
+                data fail this filter).
+            rank_by: column -> weight for the score; defaults to {"quote_volume": 1.0}.
+            top_n: Keep the best `top_n` symbols by score.
+            fetch_funding: Also call `fetch_funding_rates` (one more bulk request) for
+                venues whose tickers carry no funding rate.
+        """
+        self.exchange_id = exchange_id
+        self.market_type = market_type
+        self._shared = exchange is None
+        self.exchange = exchange if exchange is not None else cache.get_exchange(exchange_id, market_type)
+        self.symbols = list(symbols) if symbols is not None else None
+        self.quote = quote
+        self.min_quote_volume = min_quote_volume
+        self.max_spread_bps = max_spread_bps
+        self.min_range_pct = min_range_pct
+        self.max_range_pct = max_range_pct
+        self.max_abs_funding = max_abs_funding
+        self.rank_by = dict(rank_by or {"quote_volume": 1.0})
+        self.top_n = top_n
+        self.fetch_funding = fetch_funding
+        self.table: Optional[pd.DataFrame] = None
+        self.refreshed_at: Optional[float] = None
+        self.refresh_ms: Optional[float] = None
+
+    def refresh(self) -> pd.DataFrame:
+        """
+        Pull one bulk ticker snapshot (plus funding rates if configured) into `table`.
+        """
+        start = time.perf_counter()
+        if self._shared:
+            symbols = tuple(self.symbols) if self.symbols is not None else None
+            tickers = cache.fetch_tickers(self.exchange_id, symbols, self.market_type)
+        else:
+            tickers = self.exchange.fetch_tickers(self.symbols)
+        funding = self.exchange.fetch_funding_rates(self.symbols) if self.fetch_funding else None
+        self.table = tickers_to_frame(tickers, funding)
+        self.refreshed_at = time.time()
+        self.refresh_ms = (time.perf_counter() - start) * 1000.0
+        logger.debug("Screener refreshed %d tickers in %.1f ms", len(self.table), self.refresh_ms)
+        return self.table
+
+    def mask(self, table: pd.DataFrame) -> np.ndarray:
+        """
+        Boolean array of rows passing every configured filter.
+        """
+        keep = np.isfinite(table["last"].to_numpy())
+        if self.quote is not None:
+            keep &= (table["quote"] == self.quote).to_numpy()
+        # NaN compares False, so rows missing a filtered field are dropped.
+        if self.min_quote_volume is not None:
+            keep &= table["quote_volume"].to_numpy() >= self.min_quote_volume
+        if self.max_spread_bps is not None:
+            keep &= table["spread_bps"].to_numpy() <= self.max_spread_bps
+        if self.min_range_pct is not None:
+            keep &= table["range_pct"].to_numpy() >= self.min_range_pct
+        if self.max_range_pct is not None:
+            keep &= table["range_pct"].to_numpy() <= self.max_range_pct
+        if self.max_abs_funding is not None:
+            keep &= np.abs(table["funding_rate"].to_numpy()) <= self.max_abs_funding
+        return keep
+
+    def screen(self, table: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+        """
+        Filtered rows with a 'score' column, best first (truncated to `top_n`).
+        """
+        table = table if table is not None else self.table
+        if table is None:
+            table = self.refresh()
+        passed = table[self.mask(table)]
+        score = np.zeros(len(passed))
+        for column, weight in self.rank_by.items():
+            ranks = passed[column].rank(pct=True, ascending=weight >= 0).fillna(0.0).to_numpy()
+            score += abs(weight) * ranks
+        passed = passed.assign(score=score).sort_values("score", ascending=False, kind="stable")
+        return passed.head(self.top_n) if self.top_n is not None else passed
+
+    def universe(self, refresh: bool = True) -> List[str]:
+        """
+        Tradable symbols, best first; refreshes the snapshot first by default.
+        """
+        if refresh or self.table is None:
+            self.refresh()
+        return self.screen().index.tolist()
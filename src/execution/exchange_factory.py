@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Sequence
 import types
 import ccxt
 
@@ -13,19 +13,12 @@ def _binance_timeframes() -> Dict[str, str]:
     }
 
 
-def _seed_minimal_market(ex: Any, symbol: str, market_type: str = "spot") -> None:
-    """
-    Preload a complete-enough markets structure so ccxt/binance can call public Klines
-    without ever hitting exchangeInfo or currencies endpoints.
-    """
-    if not symbol or "/" not in symbol:
-        return
-
+def _minimal_market(symbol: str, market_type: str = "spot") -> Dict[str, Any]:
     base, quote = symbol.split("/")
     market_id = base + quote  # e.g. BTC/USDT -> BTCUSDT
     is_spot = (market_type == "spot")
 
-    m = {
+    return {
         "id": market_id,
         "symbol": symbol,
         "base": base,
@@ -52,11 +45,29 @@ def _seed_minimal_market(ex: Any, symbol: str, market_type: str = "spot") -> Non
         "info": {},
     }
 
+
+def _seed_minimal_market(ex: Any, symbol: str, market_type: str = "spot") -> None:
+    """
+    Preload a complete-enough markets structure so ccxt/binance can call public Klines
+    without ever hitting exchangeInfo or currencies endpoints.
+    """
+    _seed_minimal_markets(ex, [symbol], market_type)
+
+
+def _seed_minimal_markets(ex: Any, symbols: Sequence[str], market_type: str = "spot") -> None:
+    """
+    Multi-symbol form of `_seed_minimal_market`: one shared session serves every symbol.
+    """
+    symbols = [s for s in symbols if s and "/" in s]
+    if not symbols:
+        return
+    markets = {s: _minimal_market(s, market_type) for s in symbols}
+
     # Minimal markets/indexes
-    ex.markets = {symbol: m}
-    ex.markets_by_id = {market_id: m}
-    ex.symbols = [symbol]
-    ex.ids = [market_id]
+    ex.markets = markets
+    ex.markets_by_id = {m["id"]: m for m in markets.values()}
+    ex.symbols = list(markets)
+    ex.ids = list(ex.markets_by_id)
 
     # Timeframes used by fetch_ohlcv
     ex.timeframes = _binance_timeframes()
@@ -75,7 +86,7 @@ def _seed_minimal_market(ex: Any, symbol: str, market_type: str = "spot") -> Non
         return {}
 
     def _no_fetch_markets(self, params: Dict[str, Any] | None = None):
-        return [m]
+        return list(markets.values())
 
     def _no_load_markets(self, reload: bool = False, params: Dict[str, Any] | None = None):
         return self.markets
@@ -95,13 +106,17 @@ def make_exchange(
     api_secret: Optional[str] = None,
     market_type: str = "spot",
     symbol: Optional[str] = None,
+    symbols: Optional[Sequence[str]] = None,
 ):
     """
     Build a ccxt exchange instance with safe options that avoid geo-blocked Binance endpoints.
     For Binance* we:
       - Disable fetchCurrencies()
-      - Seed a minimal market for `symbol`
+      - Seed a minimal market for `symbol` and every entry of `symbols`
       - Override load_markets/fetch_markets/fetch_currencies to no-ops
+
+    Passing `symbols` lets one instance (one HTTP session and rate limiter) serve a
+    whole trading universe.
     """
     exchange_cls = getattr(ccxt, exchange_id)
     ex = exchange_cls(
@@ -120,7 +135,10 @@ def make_exchange(
 
     if exchange_id.lower().startswith("binance"):
         ex.options["fetchCurrencies"] = False
-        if symbol:
-            _seed_minimal_market(ex, symbol, market_type)
+        seeded = list(symbols or [])
+        if symbol and symbol not in seeded:
+            seeded.insert(0, symbol)
+        if seeded:
+            _seed_minimal_markets(ex, seeded, market_type)
 
     return ex
@@ -0,0 +1,472 @@
+"""
+Asyncio order router for live trading on top of a ccxt exchange from `make_exchange`.
+
+`create_order` only enqueues and returns a pending order record, so the strategy
+loop never waits on the network. A submit task drains the queue. When the exchange
+supports `createOrders`, it batches orders per symbol; otherwise it sends them
+concurrently. A reconcile task polls acknowledged orders until they reach a final
+state and reports fills through `on_update`.
+
+Every order carries a clientOrderId and stays in `in_flight` until it is final.
+Retries reuse the same id. After an ambiguous network error (the request may have
+reached the exchange), the router first looks the id up on the exchange. It only
+resubmits once a lookup succeeds without finding the order; a failed lookup is
+retried, so a retry never doubles an order. Backoff is
+exponential with jitter and never shorter than the exchange's `rateLimit`, and all
+requests are paced by that same interval.
+"""
+
+import asyncio
+import itertools
+import logging
+import time
+from collections import deque
+from contextlib import suppress
+from typing import Any, Callable, Dict, List, Optional
+
+import ccxt
+import numpy as np
+
+from src.utils.latency import LatencyTracker
+
+logger = logging.getLogger(__name__)
+
+FINAL_STATUSES = ("closed", "canceled", "rejected", "expired")
+
+
+class _InFlight:
+    """
+    One routed order and its latest exchange view.
+    """
+
+    __slots__ = ("client_id", "symbol", "type", "side", "amount", "price", "params",
+                 "queued_at", "attempts", "order", "future")
+
+    def __init__(self, client_id, symbol, type, side, amount, price, params, future):
+        self.client_id = client_id
+        self.symbol = symbol
+        self.type = type
+        self.side = side
+        self.amount = amount
+        self.price = price
+        self.params = params
+        self.queued_at = time.perf_counter()
+        self.attempts = 0
+        self.future = future
+        self.order: Dict[str, Any] = {
+            "id": None, "clientOrderId": client_id, "symbol": symbol, "type": type, "side": side,
+            "amount": amount, "price": price, "filled": 0.0, "status": "pending",
+        }
+
+    def request(self) -> Dict[str, Any]:
+        return {"symbol": self.symbol, "type": self.type, "side": self.side,
+                "amount": self.amount, "price": self.price, "params": self.params}
+
+
+class OrderRouter:
+    """
+    Non-blocking order submission with batching, idempotent retries and fill reconciliation.
+    """
+
+    def __init__(
+        self,
+        exchange: Any,
+        max_batch: int = 5,
+        batch_window_ms: float = 5.0,
+        max_concurrency: int = 4,
+        max_retries: int = 5,
+        base_backoff_ms: float = 100.0,
+        max_backoff_ms: float = 10_000.0,
+        rate_limit_ms: Optional[float] = None,
+        reconcile_every_s: float = 1.0,
+        client_id_prefix: str = "rt",
+        on_update: Optional[Callable[[Dict[str, Any]], None]] = None,
+        seed: Optional[int] = None
+    ):
+        """
+        Args:
+            exchange: ccxt-like exchange (e.g. from `make_exchange`).
+            max_batch: Most orders per createOrders request (1 disables batching).
+            batch_window_ms: How long to collect orders before sending a batch.
+            max_concurrency: Maximum submit requests in flight.
+            max_retries: Retries per order after the first attempt.
+            base_backoff_ms: First retry delay before jitter; doubles per retry.
+            max_backoff_ms: Cap on the retry delay.
+            rate_limit_ms: Minimum spacing between requests; the exchange's `rateLimit`
+                if None.
+            reconcile_every_s: Polling interval for acknowledged, unfinished orders.
+            client_id_prefix: Prefix for generated clientOrderIds.
+            on_update: Called with the order dict whenever its status or fill changes.
+            seed: Seed for backoff jitter.
+        """
+        self.exchange = exchange
+        has = getattr(exchange, "has", None) or {}
+        self.max_batch = max_batch if has.get("createOrders") else 1
+        self.batch_window_ms = batch_window_ms
+        self.max_retries = max_retries
+        self.base_backoff_ms = base_backoff_ms
+        self.max_backoff_ms = max_backoff_ms
+        if rate_limit_ms is None:
+            rate_limit_ms = float(getattr(exchange, "rateLimit", 0) or 0)
+        self.rate_limit_ms = rate_limit_ms
+        self.reconcile_every_s = reconcile_every_s
+        self.on_update = on_update
+        self._can_lookup_closed = bool(has.get("fetchOrders"))
+        self._prefix = f"{client_id_prefix}-{int(time.time() * 1000):x}-"
+        self._ids = itertools.count(1)
+        self._rng = np.random.default_rng(seed)
+        self._max_concurrency = max_concurrency
+
+        self.in_flight: Dict[str, _InFlight] = {}
+        self.completed: deque = deque(maxlen=1000)
+        self.submit_latency = LatencyTracker()
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+        self.deduplicated = 0
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._sends: set = set()
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._pace_lock: Optional[asyncio.Lock] = None
+        self._next_slot = 0.0
+
+    # lifecycle ----------------------------------------------------------------------
+
+    async def start(self) -> None:
+        """
+        Start the submit and reconcile tasks on the running loop (idempotent).
+        """
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue()
+        self._semaphore = asyncio.Semaphore(self._max_concurrency)
+        self._pace_lock = asyncio.Lock()
+        self._tasks = [
+            asyncio.create_task(self._submit_loop(), name="order-router-submit"),
+            asyncio.create_task(self._reconcile_loop(), name="order-router-reconcile"),
+        ]
+
+    async def aclose(self, timeout: float = 10.0) -> None:
+        """
+        Wait up to `timeout` seconds for queued submissions, then stop the tasks.
+        """
+        if not self._tasks:
+            return
+        with suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(self.drain(), timeout)
+        tasks = [*self._tasks, *self._sends]
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            with suppress(asyncio.CancelledError):
+                await task
+        self._tasks = []
+
+    async def drain(self) -> None:
+        """
+        Wait until every queued order has been acknowledged or has failed.
+        """
+        await self._queue.join()
+        while self._sends:
+            await asyncio.gather(*list(self._sends), return_exceptions=True)
+
+    async def __aenter__(self) -> "OrderRouter":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.aclose()
+
+    # submission ---------------------------------------------------------------------
+
+    def create_order(
+        self,
+        symbol: str,
+        type: str,
+        side: str,
+        amount: float,
+        price: Optional[float] = None,
+        params: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Queue an order and return its pending record immediately.
+
+        The record is updated in place as the order is acknowledged and filled.
+        Queuing a clientOrderId that is still in flight returns the existing record
+        instead of sending a duplicate. Must be called from the event loop thread.
+        """
+        return self._enqueue(symbol, type, side, amount, price, params).order
+
+    async def submit(
+        self,
+        symbol: str,
+        type: str,
+        side: str,
+        amount: float,
+        price: Optional[float] = None,
+        params: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Queue an order and wait for the exchange acknowledgement.
+
+        Raises:
+            ccxt.BaseError: The error that made the order fail after retries.
+        """
+        return await asyncio.shield(self._enqueue(symbol, type, side, amount, price, params).future)
+
+    def _enqueue(self, symbol, type, side, amount, price, params) -> _InFlight:
+        if self._queue is None:
+            raise RuntimeError("OrderRouter.start() must be awaited before routing orders")
+        params = dict(params or {})
+        client_id = params.setdefault("clientOrderId", f"{self._prefix}{next(self._ids)}")
+        existing = self.in_flight.get(client_id)
+        if existing is not None:
+            self.deduplicated += 1
+            return existing
+        type = type.lower()
+        price = price if type == "limit" else None
+        tracked = _InFlight(client_id, symbol, type, side, amount, price, params,
+                            asyncio.get_running_loop().create_future())
+        self.in_flight[client_id] = tracked
+        self._queue.put_nowait(tracked)
+        return tracked
+
+    async def _submit_loop(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            if self.max_batch > 1:
+                await asyncio.sleep(self.batch_window_ms / 1000.0)
+                while len(batch) < self.max_batch * self._max_concurrency and not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+            by_symbol: Dict[str, List[_InFlight]] = {}
+            for tracked in batch:
+                by_symbol.setdefault(tracked.symbol, []).append(tracked)
+            for group in by_symbol.values():
+                for i in range(0, len(group), self.max_batch):
+                    chunk = group[i:i + self.max_batch]
+                    send = self._send_batch(chunk) if len(chunk) > 1 else self._send_one(chunk[0])
+                    task = asyncio.create_task(send)
+                    self._sends.add(task)
+                    task.add_done_callback(self._sends.discard)
+            for _ in batch:
+                self._queue.task_done()
+
+    async def _send_batch(self, batch: List[_InFlight]) -> None:
+        async with self._semaphore:
+            await self._pace()
+            for tracked in batch:
+                tracked.attempts += 1
+            try:
+                results = await asyncio.to_thread(self.exchange.create_orders, [t.request() for t in batch])
+            except ccxt.NetworkError as e:
+                # Some orders may have landed: resolve each one individually.
+                logger.warning("Batch of %d orders failed (%s); retrying individually", len(batch), e)
+                retry = [(t, not isinstance(e, ccxt.DDoSProtection)) for t in batch]
+            except Exception as e:
+                for tracked in batch:
+                    self._fail(tracked, e)
+                return
+            else:
+                retry = []
+                for tracked, order in zip(batch, results):
+                    if order.get("status") == "rejected" or order.get("id") is None:
+                        error = getattr(ccxt, (order.get("info") or {}).get("error", ""), ccxt.ExchangeError)
+                        if issubclass(error, ccxt.NetworkError):
+                            retry.append((tracked, not issubclass(error, ccxt.DDoSProtection)))
+                        else:
+                            self._fail(tracked, error((order.get("info") or {}).get("message", "rejected")))
+                    else:
+                        self._ack(tracked, order)
+        if retry:
+            self.retries += len(retry)
+            await asyncio.sleep(self._backoff(0))
+            await asyncio.gather(*(self._send_one(t, ambiguous) for t, ambiguous in retry))
+
+    async def _send_one(self, tracked: _InFlight, ambiguous: bool = False) -> None:
+        error: Exception = ccxt.ExchangeError("no attempts made")
+        while tracked.attempts <= self.max_retries:
+            if ambiguous:
+                try:
+                    found = await self._lookup(tracked)
+                except Exception as e:
+                    # Still unknown whether the order landed: look again later, never resend blind.
+                    error = e
+                    tracked.attempts += 1
+                else:
+                    if found is not None:
+                        self._ack(tracked, found)
+                        return
+                    ambiguous = False
+            if not ambiguous:
+                async with self._semaphore:
+                    await self._pace()
+                    tracked.attempts += 1
+                    try:
+                        order = await asyncio.to_thread(
+                            self.exchange.create_order, tracked.symbol, tracked.type, tracked.side,
+                            tracked.amount, tracked.price, tracked.params,
+                        )
+                    except ccxt.DuplicateOrderId as e:
+                        # An earlier attempt landed after all; find it instead of resending.
+                        error, ambiguous = e, True
+                        continue
+                    except ccxt.DDoSProtection as e:
+                        error, ambiguous = e, False
+                    except ccxt.NetworkError as e:
+                        error, ambiguous = e, True
+                    except Exception as e:
+                        self._fail(tracked, e)
+                        return
+                    else:
+                        self._ack(tracked, order)
+                        return
+            if tracked.attempts > self.max_retries:
+                break
+            self.retries += 1
+            delay = self._backoff(tracked.attempts - 1)
+            logger.warning("Order %s attempt %d failed (%s); retrying in %.0f ms",
+                           tracked.client_id, tracked.attempts, error, delay * 1000.0)
+            await asyncio.sleep(delay)
+        self._fail(tracked, error)
+
+    async def _lookup(self, tracked: _InFlight) -> Optional[Dict[str, Any]]:
+        """
+        Find an order on the exchange by clientOrderId.
+
+        Open orders are searched first, then closed ones through fetch_orders. Venues
+        without fetchOrders are asked with fetch_order by clientOrderId instead, so
+        a filled order is still found.
+
+        Returns:
+            The exchange's order, or None if the lookup succeeded and it never landed.
+
+        Raises:
+            Exception: Whatever the exchange raised; the order's fate is then unknown.
+        """
+        await self._pace()
+        orders = await asyncio.to_thread(self.exchange.fetch_open_orders, tracked.symbol)
+        found = next((o for o in orders if o.get("clientOrderId") == tracked.client_id), None)
+        if found is None and self._can_lookup_closed:
+            await self._pace()
+            orders = await asyncio.to_thread(self.exchange.fetch_orders, tracked.symbol)
+            found = next((o for o in orders if o.get("clientOrderId") == tracked.client_id), None)
+        elif found is None:
+            await self._pace()
+            try:
+                found = await asyncio.to_thread(
+                    self.exchange.fetch_order, None, tracked.symbol, {"clientOrderId": tracked.client_id}
+                )
+            except ccxt.OrderNotFound:
+                found = None
+        if found is not None:
+            self.deduplicated += 1
+        return found
+
+    # reconciliation -----------------------------------------------------------------
+
+    async def _reconcile_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.reconcile_every_s)
+            try:
+                await self.reconcile()
+            except Exception:
+                logger.exception("Order reconciliation failed")
+
+    async def reconcile(self) -> None:
+        """
+        Refresh every acknowledged, unfinished order from the exchange.
+
+        One fetch_open_orders per symbol covers orders still resting; orders that left
+        the open set are fetched individually for their final state.
+        """
+        acked: Dict[str, List[_InFlight]] = {}
+        for tracked in list(self.in_flight.values()):
+            if tracked.order.get("id") is not None:
+                acked.setdefault(tracked.symbol, []).append(tracked)
+        for symbol, tracked_orders in acked.items():
+            await self._pace()
+            open_orders = await asyncio.to_thread(self.exchange.fetch_open_orders, symbol)
+            by_id = {o["id"]: o for o in open_orders}
+            for tracked in tracked_orders:
+                order = by_id.get(tracked.order["id"])
+                if order is None:
+                    await self._pace()
+                    try:
+                        order = await asyncio.to_thread(self.exchange.fetch_order, tracked.order["id"], symbol)
+                    except ccxt.OrderNotFound:
+                        logger.warning("Order %s disappeared from %s", tracked.client_id, symbol)
+                        self._fail(tracked, ccxt.OrderNotFound(tracked.order["id"]))
+                        continue
+                self._update(tracked, order)
+
+    # bookkeeping --------------------------------------------------------------------
+
+    def _ack(self, tracked: _InFlight, order: Dict[str, Any]) -> None:
+        self.submit_latency.record_since(tracked.queued_at)
+        self._update(tracked, order)
+        if not tracked.future.done():
+            tracked.future.set_result(tracked.order)
+
+    def _update(self, tracked: _InFlight, order: Dict[str, Any]) -> None:
+        changed = (order.get("status"), order.get("filled")) != (tracked.order["status"], tracked.order["filled"])
+        tracked.order.update(order)
+        tracked.order["clientOrderId"] = tracked.client_id
+        if tracked.order["status"] in FINAL_STATUSES:
+            self.in_flight.pop(tracked.client_id, None)
+            self.completed.append(tracked.order)
+        if changed and self.on_update is not None:
+            try:
+                self.on_update(tracked.order)
+            except Exception:
+                logger.exception("on_update callback failed for %s", tracked.client_id)
+
+    def _fail(self, tracked: _InFlight, error: Exception) -> None:
+        self.failures += 1
+        logger.error("Order %s failed: %s", tracked.client_id, error)
+        tracked.order["status"] = "failed"
+        tracked.order["error"] = str(error)
+        self.in_flight.pop(tracked.client_id, None)
+        self.completed.append(tracked.order)
+        if self.on_update is not None:
+            try:
+                self.on_update(tracked.order)
+            except Exception:
+                logger.exception("on_update callback failed for %s", tracked.client_id)
+        if not tracked.future.done():
+            tracked.future.set_exception(error)
+            tracked.future.exception()  # mark retrieved; create_order callers never await it
+
+    def _backoff(self, attempt: int) -> float:
+        """
+        Seconds before retry `attempt` (0-based): equal-jitter exponential backoff,
+        never shorter than the rate-limit interval.
+        """
+        cap = min(self.max_backoff_ms, self.base_backoff_ms * 2 ** attempt)
+        delay_ms = max(self._rng.uniform(cap / 2, cap), self.rate_limit_ms)
+        return delay_ms / 1000.0
+
+    async def _pace(self) -> None:
+        self.requests += 1
+        if self.rate_limit_ms <= 0:
+            return
+        loop = asyncio.get_running_loop()
+        async with self._pace_lock:
+            wait = self._next_slot - loop.time()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self._next_slot = max(loop.time(), self._next_slot) + self.rate_limit_ms / 1000.0
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Router health: submit latency (queue to acknowledgement, ms) and counters.
+        """
+        return {
+            "in_flight": len(self.in_flight),
+            "requests": self.requests,
+            "retries": self.retries,
+            "failures": self.failures,
+            "deduplicated": self.deduplicated,
+            "submit_ms": self.submit_latency.summary(),
+        }
@@ -0,0 +1,364 @@
+"""
+Pre-trade risk gate: position, notional, order-rate and drawdown checks.
+
+`RiskGate` keeps these counters, all updated incrementally:
+  - signed position and marked notional per symbol
+  - gross notional across all symbols
+  - a token bucket for the order rate
+  - filled positions and cash from completed orders, marked to market per bar
+    (see `mark`), and the equity peak
+
+Each `check` is therefore a few dict lookups and float comparisons: O(1), on the
+order of a microsecond, independent of how many symbols or orders exist.
+
+Approved amounts are reserved as exposure immediately, so orders still in flight
+count against the limits. The unfilled remainder is released once the order reaches
+a final state (see `on_order_update`). `GatedSink` puts a gate in front of any
+`create_order` sink, whether a PaperExchangeSimulator or an OrderRouter.
+"""
+
+import logging
+import time
+from typing import Any, Callable, Dict, Optional
+
+import ccxt
+
+from src.execution.order_router import OrderRouter
+
+logger = logging.getLogger(__name__)
+
+REJECT_REASONS = ("invalid", "halted", "rate", "order_notional", "symbol_notional", "gross_notional")
+RELEASE_STATUSES = ("closed", "canceled", "rejected", "expired", "failed", "partial")
+
+
+class RiskRejected(ccxt.InvalidOrder):
+    """
+    Order refused by the pre-trade risk gate; `reason` is one of REJECT_REASONS.
+    """
+
+    def __init__(self, reason: str, message: str):
+        super().__init__(message)
+        self.reason = reason
+
+
+class RiskGate:
+    """
+    O(1) pre-trade checks against per-symbol and global limits.
+
+    Limits are in quote currency. Any limit left as None is not enforced.
+    """
+
+    def __init__(
+        self,
+        max_order_notional: Optional[float] = None,
+        max_symbol_notional: Optional[float] = None,
+        max_gross_notional: Optional[float] = None,
+        max_orders_per_s: Optional[float] = None,
+        burst: Optional[int] = None,
+        max_drawdown: Optional[float] = None,
+        symbol_limits: Optional[Dict[str, float]] = None,
+        clip: bool = True,
+        min_amount: float = 1e-8,
+        capital: float = 10_000.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Args:
+            max_order_notional: Largest single order.
+            max_symbol_notional: Largest absolute position per symbol.
+            max_gross_notional: Largest sum of absolute positions across symbols.
+            max_orders_per_s: Sustained order rate (token bucket refill).
+            burst: Token bucket size; defaults to one second of orders.
+            max_drawdown: Fractional drawdown from the equity peak that halts new
+                exposure (see `mark` and `update_equity`); reducing orders still pass.
+            symbol_limits: Per-symbol overrides of max_symbol_notional.
+            clip: Shrink orders to fit the limits instead of rejecting them.
+            min_amount: Orders clipped below this size are rejected, counted under the
+                limit that clipped them.
+            capital: Starting equity that fill PnL is added to for the drawdown check.
+            clock: Monotonic seconds, for the rate limit.
+        """
+        self.max_order_notional = max_order_notional
+        self.max_symbol_notional = max_symbol_notional
+        self.max_gross_notional = max_gross_notional
+        self.max_orders_per_s = max_orders_per_s
+        self.burst = float(burst if burst is not None else max(max_orders_per_s or 1.0, 1.0))
+        self.max_drawdown = max_drawdown
+        self.symbol_limits = dict(symbol_limits or {})
+        self.clip = clip
+        self.min_amount = min_amount
+        self.capital = capital
+        self._clock = clock
+
+        self.positions: Dict[str, float] = {}
+        self.prices: Dict[str, float] = {}
+        self.notional: Dict[str, float] = {}
+        self.gross = 0.0
+        self._tokens = self.burst
+        self._refilled_at = clock()
+        self.filled: Dict[str, float] = {}
+        self.cash = 0.0
+        self._filled_value: Dict[str, float] = {}
+        self._book_value = 0.0
+        self.equity = capital
+        self.peak_equity: Optional[float] = None
+        self.drawdown = 0.0
+        self.halted = False
+
+        self.checks = 0
+        self.approved = 0
+        self.clipped = 0
+        self.rejections: Dict[str, int] = {reason: 0 for reason in REJECT_REASONS}
+        self.last_reason: Optional[str] = None
+
+    @classmethod
+    def from_config(cls, cfg: Any) -> "RiskGate":
+        """
+        Build from MAX_ORDER_NOTIONAL, MAX_SYMBOL_NOTIONAL, MAX_GROSS_NOTIONAL,
+        MAX_ORDERS_PER_SEC and MAX_DRAWDOWN on `cfg` (missing or None = unlimited),
+        with CAPITAL as the starting equity.
+        """
+        return cls(
+            max_order_notional=getattr(cfg, "MAX_ORDER_NOTIONAL", None),
+            max_symbol_notional=getattr(cfg, "MAX_SYMBOL_NOTIONAL", None),
+            max_gross_notional=getattr(cfg, "MAX_GROSS_NOTIONAL", None),
+            max_orders_per_s=getattr(cfg, "MAX_ORDERS_PER_SEC", None),
+            max_drawdown=getattr(cfg, "MAX_DRAWDOWN", None),
+            capital=getattr(cfg, "CAPITAL", 10_000.0),
+        )
+
+    def check(self, symbol: str, side: str, amount: float, price: float) -> float:
+        """
+        Approve, clip or reject one order and reserve the approved amount.
+
+        Args:
+            symbol: Market symbol.
+            side: "buy" or "sell".
+            amount: Requested amount (base currency).
+            price: Reference price used to value the order and to mark the symbol.
+
+        Returns:
+            Approved amount (<= amount), or 0.0 if rejected; the reason is in
+            `last_reason` and counted in `rejections`.
+        """
+        self.checks += 1
+        if not (amount > 0 and price is not None and price > 0) or (side != "buy" and side != "sell"):
+            return self._reject("invalid")
+
+        qty = self.positions.get(symbol, 0.0)
+        old = self.notional.get(symbol, 0.0)
+        held = abs(qty)
+        marked = held * price
+        self.gross += marked - old
+        self.notional[symbol] = marked
+        self.prices[symbol] = price
+
+        if self.max_orders_per_s is not None:
+            now = self._clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.max_orders_per_s)
+            self._refilled_at = now
+            if self._tokens < 1.0:
+                return self._reject("rate")
+            self._tokens -= 1.0
+
+        opposite = (qty > 0 and side == "sell") or (qty < 0 and side == "buy")
+        if self.halted and not (opposite and amount <= held):
+            return self._reject("halted")
+
+        allowed, reason = amount, None
+        if self.max_order_notional is not None and amount * price > self.max_order_notional:
+            allowed, reason = self.max_order_notional / price, "order_notional"
+
+        # Cap the resulting absolute position, then convert to an order size.
+        cap_abs, cap_reason = float("inf"), None
+        symbol_limit = self.symbol_limits.get(symbol, self.max_symbol_notional)
+        if symbol_limit is not None:
+            cap_abs, cap_reason = symbol_limit / price, "symbol_notional"
+        if self.max_gross_notional is not None:
+            gross_cap = (self.max_gross_notional - self.gross) / price + held
+            if gross_cap < cap_abs:
+                cap_abs, cap_reason = gross_cap, "gross_notional"
+        # Reducing orders may always close the position, whatever the limits.
+        max_amount = held + max(cap_abs, 0.0) if opposite else cap_abs - held
+        if max_amount < allowed:
+            allowed, reason = max_amount, cap_reason
+
+        if reason is not None:
+            if not self.clip or allowed < self.min_amount:
+                return self._reject(reason)
+            self.clipped += 1
+
+        self.approved += 1
+        self.last_reason = reason
+        self._apply(symbol, allowed if side == "buy" else -allowed, price)
+        return allowed
+
+    def release(self, symbol: str, side: str, amount: float) -> None:
+        """
+        Return a reserved amount that was not filled (order failed or canceled).
+        """
+        if amount > 0:
+            self._apply(symbol, -amount if side == "buy" else amount, self.prices.get(symbol, 0.0))
+
+    def on_order_update(self, order: Dict[str, Any]) -> None:
+        """
+        Once an order reaches a final status, book its fill and release the unfilled part.
+
+        Usable directly as an OrderRouter `on_update` callback.
+        """
+        if order.get("status") not in RELEASE_STATUSES:
+            return
+        symbol, side = order["symbol"], order["side"]
+        amount = order.get("amount") or 0.0
+        filled = order.get("filled") or 0.0
+        if filled > 0:
+            price = order.get("average") or order.get("price") or self.prices.get(symbol, 0.0)
+            signed = filled if side == "buy" else -filled
+            self.cash -= signed * price
+            self.filled[symbol] = self.filled.get(symbol, 0.0) + signed
+            self._revalue(symbol, price)
+        self.release(symbol, side, amount - filled)
+
+    def mark(self, symbol: str, price: float) -> None:
+        """
+        Mark `symbol` at `price` (e.g. each bar close): re-value its notional and
+        filled position, and feed the resulting equity to `update_equity`.
+        """
+        self.prices[symbol] = price
+        self._apply(symbol, 0.0, price)
+        self._revalue(symbol, price)
+        self.update_equity(self.capital + self.cash + self._book_value)
+
+    def update_equity(self, equity: float) -> None:
+        """
+        Track the equity peak; halt new exposure once drawdown reaches max_drawdown.
+        """
+        self.equity = equity
+        if self.peak_equity is None or equity > self.peak_equity:
+            self.peak_equity = equity
+        self.drawdown = 1.0 - equity / self.peak_equity if self.peak_equity > 0 else 0.0
+        if self.max_drawdown is not None and self.drawdown >= self.max_drawdown and not self.halted:
+            self.halted = True
+            logger.error("Risk gate halted: drawdown %.2f%% >= %.2f%%", self.drawdown * 100, self.max_drawdown * 100)
+
+    def resume(self) -> None:
+        """
+        Lift a drawdown halt (manual intervention); the peak resets to current equity.
+        """
+        self.halted = False
+        self.peak_equity = None
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Gate counters: checks, approvals, clips and rejections by reason.
+        """
+        return {
+            "checks": self.checks,
+            "approved": self.approved,
+            "clipped": self.clipped,
+            "rejected": sum(self.rejections.values()),
+            "rejections": dict(self.rejections),
+            "gross_notional": self.gross,
+            "equity": self.equity,
+            "drawdown": self.drawdown,
+            "halted": self.halted,
+        }
+
+    def get_state(self) -> Dict[str, Any]:
+        """
+        Checkpointable state: positions, fills, marks, equity peak and halt flag.
+        """
+        return {
+            "positions": dict(self.positions),
+            "prices": dict(self.prices),
+            "filled": dict(self.filled),
+            "cash": self.cash,
+            "peak_equity": self.peak_equity,
+            "halted": self.halted,
+        }
+
+    def set_state(self, state: Dict[str, Any]) -> None:
+        self.positions = {s: float(q) for s, q in state["positions"].items()}
+        self.prices = {s: float(p) for s, p in state["prices"].items()}
+        self.notional = {s: abs(q) * self.prices.get(s, 0.0) for s, q in self.positions.items()}
+        self.gross = sum(self.notional.values())
+        self.filled = {s: float(q) for s, q in state.get("filled", {}).items()}
+        self.cash = float(state.get("cash", 0.0))
+        self._filled_value = {s: q * self.prices.get(s, 0.0) for s, q in self.filled.items()}
+        self._book_value = sum(self._filled_value.values())
+        self.equity = self.capital + self.cash + self._book_value
+        self.peak_equity = state.get("peak_equity")
+        self.halted = bool(state.get("halted", False))
+
+    def _apply(self, symbol: str, signed_amount: float, price: float) -> None:
+        qty = self.positions.get(symbol, 0.0) + signed_amount
+        if abs(qty) < self.min_amount:
+            qty = 0.0
+        self.positions[symbol] = qty
+        marked = abs(qty) * price
+        self.gross += marked - self.notional.get(symbol, 0.0)
+        self.notional[symbol] = marked
+
+    def _revalue(self, symbol: str, price: float) -> None:
+        value = self.filled.get(symbol, 0.0) * price
+        self._book_value += value - self._filled_value.get(symbol, 0.0)
+        self._filled_value[symbol] = value
+
+    def _reject(self, reason: str) -> float:
+        self.rejections[reason] += 1
+        self.last_reason = reason
+        return 0.0
+
+
+class GatedSink:
+    """
+    `create_order` front end that runs every order through a RiskGate first.
+
+    Wraps a PaperExchangeSimulator, OrderRouter or any ccxt-like exchange; other
+    attributes pass through to the wrapped sink.
+    """
+
+    def __init__(self, sink: Any, gate: RiskGate):
+        self.sink = sink
+        self.gate = gate
+        if isinstance(sink, OrderRouter):
+            # Router orders finish asynchronously; release their remainders on update.
+            downstream = sink.on_update
+
+            def on_update(order: Dict[str, Any]) -> None:
+                gate.on_order_update(order)
+                if downstream is not None:
+                    downstream(order)
+
+            sink.on_update = on_update
+
+    def create_order(
+        self,
+        symbol: str,
+        type: str,
+        side: str,
+        amount: float,
+        price: Optional[float] = None,
+        params: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Check the order, then forward the approved (possibly clipped) amount.
+
+        Raises:
+            RiskRejected: If the gate rejects the order.
+        """
+        reference = price if price is not None else self.gate.prices.get(symbol)
+        approved = self.gate.check(symbol, side, amount, reference)
+        if approved <= 0:
+            reason = self.gate.last_reason
+            raise RiskRejected(reason, f"{side} {amount} {symbol} rejected by risk gate ({reason})")
+        try:
+            order = self.sink.create_order(symbol, type, side, approved, price, params)
+        except Exception:
+            self.gate.release(symbol, side, approved)
+            raise
+        self.gate.on_order_update(order)
+        return order
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.sink, name)
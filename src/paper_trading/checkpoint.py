@@ -0,0 +1,149 @@
+"""
+Atomic checkpoints of live component state for warm restarts.
+
+A checkpoint is one compressed .npz file. NumPy arrays from each component's
+`get_state()` are stored as "component/key" entries, and all other values go into a
+JSON document stored under "__meta__". Writes go to a temporary file in the same
+directory and are moved into place with os.replace, so a crash never leaves a
+torn checkpoint.
+"""
+
+import json
+import logging
+import os
+import tempfile
+import time
+from contextlib import suppress
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_META_KEY = "__meta__"
+CHECKPOINT_VERSION = 1
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Cannot checkpoint value of type {type(value).__name__}")
+
+
+def save_checkpoint(path: str, states: Dict[str, Dict[str, Any]]) -> None:
+    """
+    Atomically write component states to `path`.
+
+    Args:
+        path: Target .npz file.
+        states: component name -> state dict (values: ndarrays or JSON-serializable).
+    """
+    arrays: Dict[str, np.ndarray] = {}
+    meta: Dict[str, Any] = {"version": CHECKPOINT_VERSION, "saved_at": time.time(), "components": {}}
+    for component, state in states.items():
+        scalars = {}
+        for key, value in state.items():
+            if isinstance(value, np.ndarray):
+                arrays[f"{component}/{key}"] = value
+            else:
+                scalars[key] = value
+        meta["components"][component] = scalars
+    arrays[_META_KEY] = np.frombuffer(json.dumps(meta, default=_json_default).encode(), dtype=np.uint8)
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=".ckpt-", suffix=".npz")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            np.savez_compressed(fh, **arrays)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        with suppress(OSError):
+            os.remove(tmp)
+        raise
+
+
+def load_checkpoint(path: str) -> Optional[Dict[str, Dict[str, Any]]]:
+    """
+    Load component states written by `save_checkpoint`.
+
+    Returns:
+        component name -> state dict, or None if the file is missing or unreadable.
+    """
+    if not os.path.exists(path):
+        return None
+    try:
+        with np.load(path, allow_pickle=False) as npz:
+            meta = json.loads(npz[_META_KEY].tobytes().decode())
+            if meta.get("version") != CHECKPOINT_VERSION:
+                logger.warning("Ignoring checkpoint %s with version %s", path, meta.get("version"))
+                return None
+            states = {component: dict(scalars) for component, scalars in meta["components"].items()}
+            for key in npz.files:
+                if key == _META_KEY:
+                    continue
+                component, _, name = key.partition("/")
+                states.setdefault(component, {})[name] = npz[key]
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning("Could not read checkpoint %s: %s", path, e)
+        return None
+    return states
+
+
+class Checkpointer:
+    """
+    Periodically snapshots components exposing get_state()/set_state().
+    """
+
+    def __init__(self, path: str, components: Dict[str, Any], every_s: float = 60.0):
+        """
+        Args:
+            path: Checkpoint file.
+            components: name -> object with get_state()/set_state().
+            every_s: Minimum seconds between periodic saves.
+        """
+        self.path = path
+        self.components = components
+        self.every_s = every_s
+        self._last_save = time.monotonic()
+        self.saves = 0
+
+    def save(self) -> None:
+        """
+        Snapshot all components now.
+        """
+        save_checkpoint(self.path, {name: c.get_state() for name, c in self.components.items()})
+        self._last_save = time.monotonic()
+        self.saves += 1
+
+    def maybe_save(self) -> bool:
+        """
+        Save if at least `every_s` seconds passed since the last save.
+        """
+        if time.monotonic() - self._last_save < self.every_s:
+            return False
+        self.save()
+        return True
+
+    def restore(self) -> Optional[Dict[str, Dict[str, Any]]]:
+        """
+        Load the checkpoint and apply it to every known component present in it.
+
+        Returns:
+            The loaded states (including unknown components), or None without a checkpoint.
+        """
+        states = load_checkpoint(self.path)
+        if states is not None:
+            self.apply(states)
+        return states
+
+    def apply(self, states: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Apply loaded states to every known component present in them.
+        """
+        for name, component in self.components.items():
+            if name in states:
+                component.set_state(states[name])
+        logger.info("Restored %d components from checkpoint %s", len(states), self.path)
@@ -2,10 +2,17 @@
 Failure-mode drills for the paper-trading simulator.
 """
 
+import json
+import time
+import asyncio
 import logging
-from typing import List, Dict, Any
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Dict, Any, Optional
 
 from src.paper_trading.simulator import PaperExchangeSimulator
+from src.utils.latency import latency_summary
 
 logger = logging.getLogger(__name__)
 
@@ -62,3 +69,217 @@ def drill_partial_fill_analysis(
             results.append({"order": order, "error": str(e)})
             logger.error(f"Order {order} error: {e}")
     return results
+
+
+class _DrillStats:
+    """
+    Thread-safe accumulators for one load-test run.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.submit_ms: List[float] = []
+        self.attempt_ms: List[float] = []
+        self.wait_ms: List[float] = []
+        self.attempts = 0
+        self.errors = 0
+        self.failed = 0
+        self.shed = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    def enter(self) -> None:
+        with self.lock:
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def leave(self) -> None:
+        with self.lock:
+            self.in_flight -= 1
+
+
+def _attempt_sync(client: Any, order: Dict[str, Any], max_retries: int, stats: _DrillStats) -> None:
+    start = time.perf_counter()
+    for _ in range(max_retries + 1):
+        t0 = time.perf_counter()
+        try:
+            client.create_order(**order)
+            ok = True
+        except Exception:
+            ok = False
+        elapsed = (time.perf_counter() - t0) * 1000.0
+        with stats.lock:
+            stats.attempts += 1
+            stats.attempt_ms.append(elapsed)
+            if not ok:
+                stats.errors += 1
+        if ok:
+            stats.submit_ms.append((time.perf_counter() - start) * 1000.0)
+            return
+    with stats.lock:
+        stats.failed += 1
+
+
+def _run_threads(
+    client: Any,
+    order: Dict[str, Any],
+    n_orders: int,
+    concurrency: int,
+    max_retries: int,
+    gate: Optional[threading.BoundedSemaphore],
+    queue_timeout_s: float,
+    stats: _DrillStats,
+) -> None:
+    def one() -> None:
+        t0 = time.perf_counter()
+        if gate is not None and not gate.acquire(timeout=queue_timeout_s):
+            with stats.lock:
+                stats.shed += 1
+            return
+        stats.wait_ms.append((time.perf_counter() - t0) * 1000.0)
+        stats.enter()
+        try:
+            _attempt_sync(client, order, max_retries, stats)
+        finally:
+            stats.leave()
+            if gate is not None:
+                gate.release()
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for _ in range(n_orders):
+            pool.submit(one)
+
+
+async def _run_tasks(
+    client: Any,
+    order: Dict[str, Any],
+    n_orders: int,
+    concurrency: int,
+    max_retries: int,
+    max_in_flight: Optional[int],
+    queue_timeout_s: float,
+    stats: _DrillStats,
+) -> None:
+    streams = asyncio.Semaphore(concurrency)
+    gate = asyncio.Semaphore(max_in_flight) if max_in_flight else None
+    is_async = asyncio.iscoroutinefunction(getattr(client, "create_order", None))
+
+    async def submit() -> None:
+        if is_async:
+            await client.create_order(**order)
+        else:
+            await asyncio.to_thread(client.create_order, **order)
+
+    async def one() -> None:
+        async with streams:
+            t0 = time.perf_counter()
+            if gate is not None:
+                try:
+                    await asyncio.wait_for(gate.acquire(), queue_timeout_s)
+                except asyncio.TimeoutError:
+                    stats.shed += 1
+                    return
+            stats.wait_ms.append((time.perf_counter() - t0) * 1000.0)
+            stats.enter()
+            try:
+                start = time.perf_counter()
+                for _ in range(max_retries + 1):
+                    a0 = time.perf_counter()
+                    try:
+                        await submit()
+                        ok = True
+                    except Exception:
+                        ok = False
+                    stats.attempts += 1
+                    stats.attempt_ms.append((time.perf_counter() - a0) * 1000.0)
+                    if ok:
+                        stats.submit_ms.append((time.perf_counter() - start) * 1000.0)
+                        return
+                    stats.errors += 1
+                stats.failed += 1
+            finally:
+                stats.leave()
+                if gate is not None:
+                    gate.release()
+
+    await asyncio.gather(*(one() for _ in range(n_orders)))
+
+
+def drill_order_throughput(
+    client: Any,
+    order: Dict[str, Any],
+    n_orders: int = 1000,
+    concurrency: int = 8,
+    mode: str = "thread",
+    max_retries: int = 2,
+    max_in_flight: Optional[int] = None,
+    queue_timeout_s: float = 1.0,
+    report_path: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Fire concurrent order streams at an order client and measure where it falls over.
+
+    Args:
+        client: PaperExchangeSimulator or any ccxt-like client with create_order
+            (sync, or async when mode="asyncio").
+        order: Dict with keys matching create_order args, sent `n_orders` times.
+        n_orders: Total orders to submit.
+        concurrency: Number of concurrent submit streams (threads or tasks).
+        mode: "thread" (ThreadPoolExecutor) or "asyncio" (tasks).
+        max_retries: Retries per order after a failed attempt.
+        max_in_flight: Backpressure cap on orders in flight (None = streams only).
+        queue_timeout_s: How long an order waits for an in-flight slot before it is shed.
+        report_path: Optional JSON file the report is written to.
+
+    Returns:
+        Report dict with throughput, submit/attempt/queue-wait latency summaries
+        (count, mean, p50, p99, p999, max in ms), retry amplification
+        (attempts per order) and backpressure counters.
+    """
+    if mode not in ("thread", "asyncio"):
+        raise ValueError("mode must be 'thread' or 'asyncio'")
+    if n_orders <= 0 or concurrency <= 0:
+        raise ValueError("n_orders and concurrency must be positive")
+
+    stats = _DrillStats()
+    start = time.perf_counter()
+    if mode == "thread":
+        gate = threading.BoundedSemaphore(max_in_flight) if max_in_flight else None
+        _run_threads(client, order, n_orders, concurrency, max_retries, gate, queue_timeout_s, stats)
+    else:
+        asyncio.run(_run_tasks(
+            client, order, n_orders, concurrency, max_retries, max_in_flight, queue_timeout_s, stats
+        ))
+    wall_s = time.perf_counter() - start
+
+    submitted = n_orders - stats.shed
+    succeeded = len(stats.submit_ms)
+    report = {
+        "mode": mode,
+        "n_orders": n_orders,
+        "concurrency": concurrency,
+        "max_retries": max_retries,
+        "max_in_flight": max_in_flight,
+        "wall_s": wall_s,
+        "throughput_per_s": succeeded / wall_s if wall_s > 0 else None,
+        "succeeded": succeeded,
+        "failed": stats.failed,
+        "attempts": stats.attempts,
+        "errors": stats.errors,
+        "retry_amplification": stats.attempts / submitted if submitted else None,
+        "submit_latency_ms": latency_summary(stats.submit_ms),
+        "attempt_latency_ms": latency_summary(stats.attempt_ms),
+        "backpressure": {
+            "shed": stats.shed,
+            "peak_in_flight": stats.peak_in_flight,
+            "queue_wait_ms": latency_summary(stats.wait_ms),
+        },
+    }
+    logger.info(
+        "Throughput drill (%s x%d): %d/%d ok, p99=%s ms, amplification=%s",
+        mode, concurrency, succeeded, n_orders,
+        report["submit_latency_ms"]["p99"], report["retry_amplification"],
+    )
+    if report_path:
+        Path(report_path).write_text(json.dumps(report, indent=2))
+    return report
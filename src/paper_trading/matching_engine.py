@@ -0,0 +1,382 @@
+"""
+Price-time priority matching engine for paper trading and execution replay.
+
+Each symbol gets an OrderBook made of price levels (FIFO queues of resting orders)
+indexed by heaps of bid/ask prices. Orders and fills are returned in ccxt's unified
+order/trade shape, and errors are raised as the matching ccxt exceptions.
+"""
+
+import heapq
+import time
+from collections import OrderedDict, deque
+from typing import Any, Callable, Dict, List, Optional
+
+import ccxt
+
+_EPS = 1e-12
+
+
+class _Order:
+    """
+    Internal order record; converted to a ccxt-shaped dict on the way out.
+    """
+
+    __slots__ = (
+        "id", "client_id", "symbol", "type", "side", "price", "amount",
+        "filled", "cost", "status", "timestamp", "tif", "post_only", "trades",
+    )
+
+    def __init__(self, oid, client_id, symbol, type, side, price, amount, timestamp, tif, post_only):
+        self.id = oid
+        self.client_id = client_id
+        self.symbol = symbol
+        self.type = type
+        self.side = side
+        self.price = price
+        self.amount = amount
+        self.filled = 0.0
+        self.cost = 0.0
+        self.status = "open"
+        self.timestamp = timestamp
+        self.tif = tif
+        self.post_only = post_only
+        self.trades: List[tuple] = []
+
+
+class OrderBook:
+    """
+    One symbol's resting orders: FIFO queues per price level plus best-price heaps.
+    """
+
+    def __init__(self, symbol: str):
+        self.symbol = symbol
+        # price -> deque of resting _Order (FIFO = time priority)
+        self.bid_levels: Dict[float, deque] = {}
+        self.ask_levels: Dict[float, deque] = {}
+        # price -> total live remaining quantity at that level
+        self.bid_depth: Dict[float, float] = {}
+        self.ask_depth: Dict[float, float] = {}
+        # Heaps may hold stale prices; they are dropped lazily when seen at the top.
+        self._bid_heap: List[float] = []  # negated prices
+        self._ask_heap: List[float] = []
+
+    def best_bid(self) -> Optional[float]:
+        heap = self._bid_heap
+        while heap and -heap[0] not in self.bid_depth:
+            heapq.heappop(heap)
+        return -heap[0] if heap else None
+
+    def best_ask(self) -> Optional[float]:
+        heap = self._ask_heap
+        while heap and heap[0] not in self.ask_depth:
+            heapq.heappop(heap)
+        return heap[0] if heap else None
+
+    def add(self, order: _Order) -> None:
+        price = order.price
+        remaining = order.amount - order.filled
+        if order.side == "buy":
+            levels, depth, heap, key = self.bid_levels, self.bid_depth, self._bid_heap, -price
+        else:
+            levels, depth, heap, key = self.ask_levels, self.ask_depth, self._ask_heap, price
+        level = levels.get(price)
+        if level is None:
+            levels[price] = level = deque()
+            depth[price] = 0.0
+            heapq.heappush(heap, key)
+        level.append(order)
+        depth[price] += remaining
+
+    def remove(self, order: _Order) -> None:
+        """
+        Take a resting order's remaining quantity off its level (the queue entry is
+        skipped lazily during matching).
+        """
+        if order.side == "buy":
+            levels, depth = self.bid_levels, self.bid_depth
+        else:
+            levels, depth = self.ask_levels, self.ask_depth
+        price = order.price
+        left = depth.get(price, 0.0) - (order.amount - order.filled)
+        if left <= _EPS:
+            depth.pop(price, None)
+            levels.pop(price, None)
+        else:
+            depth[price] = left
+
+    def snapshot(self, limit: Optional[int] = None) -> Dict[str, List[List[float]]]:
+        bids = sorted(self.bid_depth.items(), key=lambda kv: -kv[0])
+        asks = sorted(self.ask_depth.items())
+        if limit is not None:
+            bids, asks = bids[:limit], asks[:limit]
+        return {"bids": [[p, q] for p, q in bids], "asks": [[p, q] for p, q in asks]}
+
+
+class MatchingEngine:
+    """
+    Multi-symbol price-time priority matching engine with a ccxt-like surface.
+
+    Supported order types: 'limit' and 'market' (case-insensitive), with
+    params {'timeInForce': 'GTC' | 'IOC' | 'PO', 'postOnly': bool, 'clientOrderId': str}.
+    """
+
+    def __init__(
+        self,
+        clock: Optional[Callable[[], int]] = None,
+        fee_rate: float = 0.0,
+        max_trades: int = 100_000,
+        max_closed_orders: int = 10_000,
+    ):
+        """
+        Args:
+            clock: Returns the current time in ms; replays can pass a simulated clock.
+            fee_rate: Fee charged on each fill's cost (in quote currency).
+            max_trades: Number of most recent fills kept for fetch_my_trades.
+            max_closed_orders: Number of most recently finished orders kept for fetch_order.
+        """
+        self.clock = clock if clock is not None else (lambda: int(time.time() * 1000))
+        self.fee_rate = fee_rate
+        self.books: Dict[str, OrderBook] = {}
+        self.open_orders: Dict[str, _Order] = {}
+        self.closed_orders: "OrderedDict[str, _Order]" = OrderedDict()
+        self.max_closed_orders = max_closed_orders
+        self.trades: deque = deque(maxlen=max_trades)
+        self._next_order_id = 1
+        self._next_trade_id = 1
+        self._iso_cache = (None, None)
+
+    def book(self, symbol: str) -> OrderBook:
+        book = self.books.get(symbol)
+        if book is None:
+            book = self.books[symbol] = OrderBook(symbol)
+        return book
+
+    def create_order(
+        self,
+        symbol: str,
+        type: str,
+        side: str,
+        amount: float,
+        price: Optional[float] = None,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Submit an order, match it against the book and rest any GTC limit remainder.
+
+        Returns:
+            ccxt-shaped order dict, with this order's fills under 'trades'.
+
+        Raises:
+            ccxt.InvalidOrder: Bad side/type/amount/price or time in force.
+            ccxt.OrderImmediatelyFillable: A post-only order would take liquidity.
+        """
+        if params:
+            tif = params.get("timeInForce", "GTC").upper()
+            post_only = bool(params.get("postOnly", False)) or tif == "PO"
+            client_id = params.get("clientOrderId")
+            ts = params.get("timestamp") or self.clock()
+        else:
+            tif, post_only, client_id, ts = "GTC", False, None, self.clock()
+        type = type.lower()
+        if side != "buy" and side != "sell":
+            raise ccxt.InvalidOrder("side must be 'buy' or 'sell'")
+        if amount <= 0:
+            raise ccxt.InvalidOrder("amount must be positive")
+        if type == "limit":
+            if price is None or price <= 0:
+                raise ccxt.InvalidOrder("limit orders require a positive price")
+        elif type == "market":
+            if post_only:
+                raise ccxt.InvalidOrder("market orders cannot be post-only")
+            price = None
+            tif = "IOC"
+        else:
+            raise ccxt.InvalidOrder(f"unsupported order type {type}")
+        if tif not in ("GTC", "IOC", "PO"):
+            raise ccxt.InvalidOrder(f"unsupported timeInForce {tif}")
+
+        book = self.book(symbol)
+        if post_only:
+            best = book.best_ask() if side == "buy" else book.best_bid()
+            if best is not None and (price >= best if side == "buy" else price <= best):
+                raise ccxt.OrderImmediatelyFillable(f"post-only {side} at {price} would cross {best}")
+
+        oid = str(self._next_order_id)
+        self._next_order_id += 1
+        order = _Order(oid, client_id, symbol, type, side, price, amount, ts, tif, post_only)
+
+        if book.ask_depth if side == "buy" else book.bid_depth:
+            self._match(book, order)
+
+        if order.amount - order.filled <= _EPS:
+            order.status = "closed"
+            self._finish(order)
+        elif tif == "IOC":
+            order.status = "canceled"
+            self._finish(order)
+        else:
+            book.add(order)
+            self.open_orders[oid] = order
+        return self._order_dict(order)
+
+    def cancel_order(self, id: str, symbol: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Cancel a resting order.
+
+        Raises:
+            ccxt.OrderNotFound: If the order is not open.
+        """
+        order = self.open_orders.pop(id, None)
+        if order is None or (symbol is not None and order.symbol != symbol):
+            if order is not None:
+                self.open_orders[id] = order
+            raise ccxt.OrderNotFound(f"order {id} is not open")
+        self.books[order.symbol].remove(order)
+        order.status = "canceled"
+        self._finish(order)
+        return self._order_dict(order)
+
+    def fetch_order(self, id: str, symbol: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Return an open or recently finished order (see max_closed_orders).
+
+        Raises:
+            ccxt.OrderNotFound: If the order is neither open nor kept as finished.
+        """
+        order = self.open_orders.get(id) or self.closed_orders.get(id)
+        if order is None:
+            raise ccxt.OrderNotFound(f"order {id} not found")
+        return self._order_dict(order)
+
+    def fetch_open_orders(self, symbol: Optional[str] = None) -> List[Dict[str, Any]]:
+        return [
+            self._order_dict(o) for o in self.open_orders.values()
+            if symbol is None or o.symbol == symbol
+        ]
+
+    def fetch_order_book(self, symbol: str, limit: Optional[int] = None) -> Dict[str, Any]:
+        snap = self.book(symbol).snapshot(limit)
+        ts = self.clock()
+        snap.update({"symbol": symbol, "timestamp": ts, "datetime": self._iso(ts), "nonce": None})
+        return snap
+
+    def fetch_my_trades(
+        self,
+        symbol: Optional[str] = None,
+        since: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        out = [
+            f for f in self.trades
+            if (symbol is None or f[1].symbol == symbol) and (since is None or f[3] >= since)
+        ]
+        if limit:
+            out = out[-limit:]
+        return [self._trade_dict(f) for f in out]
+
+    def _match(self, book: OrderBook, taker: _Order) -> None:
+        if taker.side == "buy":
+            levels, depth, best = book.ask_levels, book.ask_depth, book.best_ask
+        else:
+            levels, depth, best = book.bid_levels, book.bid_depth, book.best_bid
+        limit = taker.price
+        remaining = taker.amount - taker.filled
+
+        while remaining > _EPS:
+            price = best()
+            if price is None:
+                break
+            if limit is not None and (price > limit if taker.side == "buy" else price < limit):
+                break
+            level = levels[price]
+            while level and remaining > _EPS:
+                maker = level[0]
+                if maker.status != "open":
+                    level.popleft()
+                    continue
+                qty = min(remaining, maker.amount - maker.filled)
+                self._fill(taker, maker, price, qty)
+                remaining -= qty
+                depth[price] -= qty
+                if maker.amount - maker.filled <= _EPS:
+                    maker.status = "closed"
+                    level.popleft()
+                    del self.open_orders[maker.id]
+                    self._finish(maker)
+            if depth[price] <= _EPS or not level:
+                del depth[price]
+                del levels[price]
+
+    def _finish(self, order: _Order) -> None:
+        self.closed_orders[order.id] = order
+        if len(self.closed_orders) > self.max_closed_orders:
+            self.closed_orders.popitem(last=False)
+
+    def _fill(self, taker: _Order, maker: _Order, price: float, qty: float) -> None:
+        # Fills are kept as tuples and only turned into ccxt dicts when read back.
+        trade_id = self._next_trade_id
+        self._next_trade_id += 1
+        ts = taker.timestamp
+        cost = price * qty
+        taker.filled += qty
+        taker.cost += cost
+        maker.filled += qty
+        maker.cost += cost
+        taker_fill = (trade_id, taker, "taker", ts, price, qty)
+        maker_fill = (trade_id, maker, "maker", ts, price, qty)
+        taker.trades.append(taker_fill)
+        maker.trades.append(maker_fill)
+        self.trades.append(taker_fill)
+        self.trades.append(maker_fill)
+
+    def _trade_dict(self, fill: tuple) -> Dict[str, Any]:
+        trade_id, order, role, ts, price, qty = fill
+        cost = price * qty
+        return {
+            "id": str(trade_id),
+            "order": order.id,
+            "timestamp": ts,
+            "datetime": self._iso(ts),
+            "symbol": order.symbol,
+            "type": order.type,
+            "side": order.side,
+            "takerOrMaker": role,
+            "price": price,
+            "amount": qty,
+            "cost": cost,
+            "fee": {"cost": cost * self.fee_rate, "currency": None},
+            "info": {},
+        }
+
+    def _iso(self, ts: int) -> Optional[str]:
+        # Replays stamp many events with the same ms; reuse the last formatted value.
+        cached_ts, cached = self._iso_cache
+        if ts != cached_ts:
+            cached = ccxt.Exchange.iso8601(ts)
+            self._iso_cache = (ts, cached)
+        return cached
+
+    def _order_dict(self, order: _Order) -> Dict[str, Any]:
+        remaining = max(order.amount - order.filled, 0.0)
+        return {
+            "id": order.id,
+            "clientOrderId": order.client_id,
+            "timestamp": order.timestamp,
+            "datetime": self._iso(order.timestamp),
+            "lastTradeTimestamp": order.trades[-1][3] if order.trades else None,
+            "symbol": order.symbol,
+            "type": order.type,
+            "timeInForce": order.tif,
+            "postOnly": order.post_only,
+            "side": order.side,
+            "price": order.price,
+            "average": order.cost / order.filled if order.filled > 0 else None,
+            "amount": order.amount,
+            "filled": order.filled,
+            "remaining": remaining,
+            "cost": order.cost,
+            "status": order.status,
+            "trades": [self._trade_dict(f) for f in order.trades],
+            "fee": {"cost": order.cost * self.fee_rate, "currency": None},
+            "info": {},
+        }
@@ -1,39 +1,370 @@
 from __future__ import annotations
 import os
+import time
+import asyncio
 import logging
-from typing import Any
+from collections import deque
+from contextlib import suppress
+from typing import Any, Dict, List, Optional, Sequence
 
+import pandas as pd
+
+from src.backtesting.portfolio import PortfolioLedger
+from src.data.ring_buffer import OHLCVRingBuffer
 from src.execution.exchange_factory import make_exchange
+from src.execution.order_router import OrderRouter
+from src.governance.risk_gate import GatedSink, RiskGate
+from src.paper_trading.checkpoint import Checkpointer, load_checkpoint
+from src.paper_trading.simulator import PaperExchangeSimulator
+from src.strategy.base_strategy import BaseStrategy
+from src.strategy.ensemble import OnlineEnsembleManager
+from src.utils.latency import LatencyTracker
 
 logger = logging.getLogger(__name__)
 
+OHLCV_COLUMNS = ["timestamp", "open", "high", "low", "close", "volume"]
+
+
+def closed_new_candles(
+    ohlcv: Sequence[Sequence[float]],
+    last_ts: Optional[int],
+    timeframe_ms: int,
+    now_ms: float,
+) -> List[Sequence[float]]:
+    """
+    Select candles that are newer than `last_ts` and already closed at `now_ms`.
+
+    Args:
+        ohlcv: ccxt-style list of [timestamp_ms, open, high, low, close, volume].
+        last_ts: Timestamp (ms) of the last candle already processed, or None.
+        timeframe_ms: Candle duration in milliseconds.
+        now_ms: Current wall-clock time in milliseconds.
+
+    Returns:
+        The new closed candles, in ascending timestamp order.
+    """
+    out: List[Sequence[float]] = []
+    for row in ohlcv:
+        ts = row[0]
+        if last_ts is not None and ts <= last_ts:
+            continue
+        if ts + timeframe_ms > now_ms:
+            # Still-forming candle; it will be picked up once it closes.
+            continue
+        if out and ts <= out[-1][0]:
+            continue
+        out.append(row)
+    return out
+
+
+def candles_to_frame(rows: Sequence[Sequence[float]]) -> pd.DataFrame:
+    """
+    Build a strategy input DataFrame from ccxt OHLCV rows with UTC timestamps.
+    """
+    df = pd.DataFrame(list(rows), columns=OHLCV_COLUMNS)
+    df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms", utc=True)
+    return df
+
+
+def supports_streaming(strategy: Any) -> bool:
+    """
+    True if the strategy overrides `BaseStrategy.generate_signals_stream`.
+    """
+    method = getattr(type(strategy), "generate_signals_stream", None)
+    return method is not None and method is not BaseStrategy.generate_signals_stream
+
+
+def next_bar_close_delay(now_ms: float, timeframe_ms: int, close_delay_ms: int) -> float:
+    """
+    Seconds from `now_ms` until the next bar close plus `close_delay_ms`.
+    """
+    next_close = (now_ms // timeframe_ms + 1) * timeframe_ms + close_delay_ms
+    return (next_close - now_ms) / 1000.0
+
+
+def route_signals(
+    simulator: Any,
+    symbol: str,
+    signals: List[Dict],
+    new_bars: Sequence[Sequence[float]],
+    tick: float,
+    latency: LatencyTracker,
+    orders: deque,
+) -> List[Dict]:
+    """
+    Send signals that fall on `new_bars` to the simulator as MARKET orders at the bar close.
+
+    Signals on older bars were already acted on and are skipped. Each placed order
+    records its tick-to-order latency against the `tick` perf_counter reading.
+
+    Returns:
+        The orders placed, also appended to `orders`.
+    """
+    closes = {int(row[0]): row[4] for row in new_bars}
+    placed: List[Dict] = []
+    for sig in signals:
+        ts_ms = pd.Timestamp(sig["timestamp"]).value // 1_000_000
+        price = closes.get(ts_ms)
+        if price is None:
+            continue
+        try:
+            order = simulator.create_order(symbol, "MARKET", sig["side"], sig["size"], price)
+        except Exception as e:
+            logger.warning("Order for %s rejected: %s", symbol, e)
+            continue
+        latency.record_since(tick)
+        orders.append(order)
+        placed.append(order)
+    return placed
+
+
+class ExchangeClock:
+    """
+    Non-blocking view of an exchange's clock for the trading loops.
+
+    `sync` reads `exchange.milliseconds()` (an HTTP round trip for a ReplayHTTPClient),
+    so loops run it in a worker thread once per poll. `now_ms` extrapolates from the
+    last successful sync with the local monotonic clock, scaled by the exchange's
+    replay speed. Before the first sync, or without an exchange clock, it is wall time.
+    """
+
+    def __init__(self, exchange: Any):
+        self.exchange = exchange
+        self._anchor: Optional[tuple] = None  # (exchange ms, local monotonic s) at the last sync
+
+    def sync(self) -> None:
+        clock = getattr(self.exchange, "milliseconds", None)
+        if clock is None:
+            return
+        try:
+            self._anchor = (float(clock()), time.monotonic())
+        except Exception as e:
+            logger.warning("Exchange clock sync failed; extrapolating from the last sync: %s", e)
+
+    def now_ms(self) -> float:
+        if self._anchor is None:
+            return time.time() * 1000.0
+        synced_ms, synced_at = self._anchor
+        speed = getattr(self.exchange, "replay_speed", 1.0)
+        return synced_ms + (time.monotonic() - synced_at) * 1000.0 * speed
+
 
 class PaperTrader:
     """
-    Minimal paper-trading runner that pulls OHLCV via ccxt and hands it to the strategy.
+    Long-running asyncio paper-trading loop.
+
+    A fetcher task wakes up at each bar close, pulls only candles newer than the last
+    one seen, and queues them. An executor task feeds the bars to the strategy and routes
+    new signals to the PaperExchangeSimulator, so fetching and execution overlap.
+
+    Strategies implementing `generate_signals_stream` get only the new bars plus their
+    carried state; the others get the whole bar history as a DataFrame each batch.
+    The carried state is checkpointed, so a warm restart resumes it without re-priming.
     """
 
-    def __init__(self, strategy: Any, cfg: Any):
+    def __init__(
+        self,
+        strategy: Any,
+        cfg: Any,
+        exchange: Any = None,
+        simulator: Optional[PaperExchangeSimulator] = None,
+        history_bars: int = 500,
+        close_delay_ms: int = 1000,
+        checkpoint_path: Optional[str] = None,
+        checkpoint_every_s: float = 60.0,
+        checkpoint_components: Optional[Dict[str, Any]] = None,
+        risk_gate: Optional[RiskGate] = None,
+        ledger: Optional[PortfolioLedger] = None,
+        ensemble: Optional[OnlineEnsembleManager] = None,
+    ):
+        """
+        Args:
+            strategy: Object exposing `generate_signals(df)`.
+            cfg: Config object (EXCHANGE_ID, SYMBOL, TIMEFRAME, DEFAULT_MARKET_TYPE).
+            exchange: Optional pre-built ccxt-like exchange; built via make_exchange if None.
+            simulator: Order sink; a default PaperExchangeSimulator if None. Pass an
+                OrderRouter to trade live: it is started and drained with the loop.
+            history_bars: Number of most recent bars handed to the strategy.
+            close_delay_ms: Delay after each bar close before polling, so the exchange
+                has published the closed candle.
+            checkpoint_path: Optional .npz file for warm-restart checkpoints. Bar history,
+                streaming indicator state, strategy state (if it has get_state/set_state),
+                the risk gate, ledger, ensemble and `checkpoint_components` are saved
+                every `checkpoint_every_s` seconds and on shutdown.
+            checkpoint_every_s: Minimum seconds between periodic checkpoints.
+            checkpoint_components: Extra name -> object with get_state()/set_state().
+            risk_gate: Optional pre-trade RiskGate checked before every order reaches
+                the simulator or router. It is marked at each bar close, so its drawdown
+                halt fires, and checkpointed with the other components.
+            ledger: Optional PortfolioLedger; every fill the simulator reports when an
+                order is placed is recorded in it.
+            ensemble: Optional OnlineEnsembleManager whose online scores are
+                checkpointed with the trader.
+        """
         self.strategy = strategy
         self.cfg = cfg
 
         exchange_id = getattr(cfg, "EXCHANGE_ID", os.getenv("EXCHANGE_ID", "binance"))
         market_type = getattr(cfg, "DEFAULT_MARKET_TYPE", os.getenv("DEFAULT_MARKET_TYPE", "spot"))
-        symbol = getattr(cfg, "SYMBOL", os.getenv("SYMBOL", "BTC/USDT"))
-
-        api_key = os.getenv("API_KEY")
-        api_secret = os.getenv("API_SECRET")
-
-        self.exchange = make_exchange(
-            exchange_id,
-            api_key=api_key,
-            api_secret=api_secret,
-            market_type=market_type,
-            symbol=symbol,
-        )
+        self.symbol = getattr(cfg, "SYMBOL", os.getenv("SYMBOL", "BTC/USDT"))
+        self.timeframe = getattr(cfg, "TIMEFRAME", os.getenv("TIMEFRAME", "1m"))
+
+        if exchange is None:
+            api_key = os.getenv("API_KEY")
+            api_secret = os.getenv("API_SECRET")
+            exchange = make_exchange(
+                exchange_id,
+                api_key=api_key,
+                api_secret=api_secret,
+                market_type=market_type,
+                symbol=self.symbol,
+            )
+        self.exchange = exchange
+        self.clock = ExchangeClock(exchange)
         self._is_binance_like = exchange_id.lower().startswith("binance")
 
-    def run(self) -> None:
+        self.simulator = simulator if simulator is not None else PaperExchangeSimulator()
+        self.risk_gate = risk_gate
+        self.ledger = ledger
+        self.ensemble = ensemble
+        self._order_sink = GatedSink(self.simulator, risk_gate) if risk_gate is not None else self.simulator
+        self.history_bars = history_bars
+        self.close_delay_ms = close_delay_ms
+        self.timeframe_ms = int(self.exchange.parse_timeframe(self.timeframe) * 1000)
+
+        self.last_ts: Optional[int] = None
+        self.orders: deque = deque(maxlen=1000)
+        self.tick_to_order = LatencyTracker()
+        self.loop_jitter = LatencyTracker()
+        self._bars = OHLCVRingBuffer(history_bars)
+        self._streaming = supports_streaming(strategy)
+        self._stream_state: Any = None
+        self._stream_ts: Optional[int] = None  # last bar folded into _stream_state
+        self._stopped = False
+        self._catch_up = False
+
+        self.checkpointer: Optional[Checkpointer] = None
+        if checkpoint_path:
+            components: Dict[str, Any] = {"trader": self, "bars": self._bars}
+            if hasattr(strategy, "get_state") and hasattr(strategy, "set_state"):
+                components["strategy"] = strategy
+            if risk_gate is not None:
+                components["risk"] = risk_gate
+            if ledger is not None:
+                components["ledger"] = ledger
+            if ensemble is not None:
+                components["ensemble"] = ensemble
+            components.update(checkpoint_components or {})
+            self.checkpointer = Checkpointer(checkpoint_path, components, checkpoint_every_s)
+
+    def run(self, max_iterations: Optional[int] = None) -> None:
+        """
+        Run the event loop until `stop()` is called or `max_iterations` polls complete.
+        """
+        asyncio.run(self.run_async(max_iterations))
+
+    def stop(self) -> None:
+        """
+        Ask the loop to exit after the current poll.
+        """
+        self._stopped = True
+
+    async def run_async(self, max_iterations: Optional[int] = None) -> None:
+        """
+        Coroutine form of `run`, for embedding in an existing event loop.
+        """
+        self._prepare_markets()
+        await asyncio.to_thread(self.clock.sync)
+        self.restore()
+        router = self.simulator if isinstance(self.simulator, OrderRouter) else None
+        if router is not None:
+            await router.start()
+        queue: asyncio.Queue = asyncio.Queue()
+        executor = asyncio.create_task(self._execute_loop(queue))
+        try:
+            await self._fetch_loop(queue, max_iterations)
+            await queue.join()
+        finally:
+            executor.cancel()
+            with suppress(asyncio.CancelledError):
+                await executor
+            if router is not None:
+                await router.aclose()
+            if self.checkpointer is not None:
+                self.checkpointer.save()
+
+    def get_state(self) -> Dict[str, Any]:
+        """
+        Checkpoint identity and progress: the last bar actually processed, plus the
+        streaming strategy state if it covers exactly the buffered bars.
+        """
+        last_ts = self._bars.last_ts
+        stream_state = self._stream_state if self._stream_ts == last_ts else None
+        return {
+            "symbol": self.symbol,
+            "timeframe": self.timeframe,
+            "last_ts": last_ts,
+            "stream_state": stream_state,
+        }
+
+    def set_state(self, state: Dict[str, Any]) -> None:
+        self.last_ts = state["last_ts"]
+        self._catch_up = self.last_ts is not None
+        self._stream_state = state.get("stream_state") if self._streaming else None
+        self._stream_ts = self.last_ts if self._stream_state is not None else None
+
+    def restore(self) -> bool:
+        """
+        Warm-start from the checkpoint if it matches this symbol/timeframe and is recent.
+
+        A checkpoint older than `history_bars` bars is discarded, since the gap could not
+        be refetched in one call. After a restore only bars since the checkpoint are
+        fetched, and that first catch-up batch acts on its latest bar alone.
+
+        Returns:
+            True if state was restored.
+        """
+        if self.checkpointer is None:
+            return False
+        states = load_checkpoint(self.checkpointer.path)
+        if states is None:
+            return False
+        trader = states.get("trader", {})
+        if trader.get("symbol") != self.symbol or trader.get("timeframe") != self.timeframe:
+            logger.warning("Checkpoint %s is for another market; starting cold", self.checkpointer.path)
+            return False
+        last_ts = trader.get("last_ts")
+        if last_ts is None or self._now_ms() - last_ts > self.history_bars * self.timeframe_ms:
+            logger.info("Checkpoint %s is stale; starting cold", self.checkpointer.path)
+            return False
+        self.checkpointer.apply(states)
+        return True
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Loop health metrics: tick-to-order latency and wakeup jitter (milliseconds).
+        """
+        metrics = {
+            "symbol": self.symbol,
+            "last_ts": self.last_ts,
+            "orders": len(self.orders),
+            "tick_to_order_ms": self.tick_to_order.summary(),
+            "loop_jitter_ms": self.loop_jitter.summary(),
+        }
+        if isinstance(self.simulator, OrderRouter):
+            metrics["router"] = self.simulator.metrics()
+        if self.risk_gate is not None:
+            metrics["risk"] = self.risk_gate.metrics()
+        return metrics
+
+    def _record_fills(self, orders: List[Dict], timestamp: int) -> None:
+        for order in orders:
+            filled = float(order.get("filled") or 0.0)
+            if filled > 0:
+                qty = filled if order["side"] == "buy" else -filled
+                self.ledger.record_fill(self.symbol, qty, float(order["price"]), timestamp=timestamp)
+
+    def _prepare_markets(self) -> None:
         # For Binance we deliberately skip load_markets; our factory seeded everything
         if not self._is_binance_like:
             try:
@@ -43,6 +374,77 @@ class PaperTrader:
         else:
             logger.info("Using seeded Binance markets (no exchangeInfo/currencies calls).")
 
-        ohlcv = self.exchange.fetch_ohlcv(self.cfg.SYMBOL, self.cfg.TIMEFRAME, limit=100)
-        logger.info("Fetched %d candles for %s %s", len(ohlcv), self.cfg.SYMBOL, self.cfg.TIMEFRAME)
-        # TODO: hand off to your signal/backtest pipeline
+    def _now_ms(self) -> float:
+        # Exchange clock: wall time for ccxt, simulated time for a ReplayExchange.
+        return self.clock.now_ms()
+
+    def _next_wakeup_delay(self, now_ms: float) -> float:
+        return next_bar_close_delay(now_ms, self.timeframe_ms, self.close_delay_ms)
+
+    def _fetch_new(self) -> List[Sequence[float]]:
+        if self.last_ts is None:
+            return self.exchange.fetch_ohlcv(self.symbol, self.timeframe, limit=self.history_bars)
+        return self.exchange.fetch_ohlcv(self.symbol, self.timeframe, since=self.last_ts + 1)
+
+    async def _fetch_loop(self, queue: asyncio.Queue, max_iterations: Optional[int]) -> None:
+        iteration = 0
+        while not self._stopped:
+            iteration += 1
+            await asyncio.to_thread(self.clock.sync)
+            try:
+                ohlcv = await asyncio.to_thread(self._fetch_new)
+            except Exception as e:
+                logger.warning("fetch_ohlcv failed for %s: %s", self.symbol, e)
+                ohlcv = []
+            tick = time.perf_counter()
+
+            warmup = self.last_ts is None or self._catch_up
+            new_bars = closed_new_candles(ohlcv, self.last_ts, self.timeframe_ms, self._now_ms())
+            if new_bars:
+                self.last_ts = int(new_bars[-1][0])
+                self._catch_up = False
+                queue.put_nowait((tick, new_bars, warmup))
+
+            if max_iterations is not None and iteration >= max_iterations:
+                break
+
+            delay = self._next_wakeup_delay(self._now_ms())
+            target_ms = self._now_ms() + delay * 1000.0
+            await asyncio.sleep(delay / getattr(self.exchange, "replay_speed", 1.0))
+            self.loop_jitter.record(max(0.0, self._now_ms() - target_ms))
+
+    async def _execute_loop(self, queue: asyncio.Queue) -> None:
+        while True:
+            tick, new_bars, warmup = await queue.get()
+            try:
+                self._bars.extend(new_bars)
+                if self._streaming:
+                    # Without carried state (first batch, restart, error) prime on the whole buffer.
+                    batch = self._bars.to_frame() if self._stream_state is None else candles_to_frame(new_bars)
+                    signals, self._stream_state = await asyncio.to_thread(
+                        self.strategy.generate_signals_stream, batch, self._stream_state
+                    )
+                    self._stream_ts = int(new_bars[-1][0])
+                else:
+                    signals = await asyncio.to_thread(self.strategy.generate_signals, self._bars.to_frame())
+                # The warm-up history only primes indicators; act on its latest bar alone.
+                acted = new_bars[-1:] if warmup else new_bars
+                if self.risk_gate is not None:
+                    for row in acted:
+                        self.risk_gate.mark(self.symbol, row[4])
+                placed = route_signals(
+                    self._order_sink, self.symbol, signals, acted,
+                    tick, self.tick_to_order, self.orders,
+                )
+                if self.ledger is not None:
+                    self._record_fills(placed, int(acted[-1][0]))
+            except Exception:
+                self._stream_state = None
+                logger.exception("Failed to process %d new bars for %s", len(new_bars), self.symbol)
+            try:
+                if self.checkpointer is not None:
+                    await asyncio.to_thread(self.checkpointer.maybe_save)
+            except Exception:
+                logger.exception("Checkpoint save failed for %s", self.symbol)
+            finally:
+                queue.task_done()
@@ -0,0 +1,610 @@
+"""
+Local replay exchange: stored OHLCV history served as a fake live, ccxt-compatible venue.
+
+`ReplayExchange` is an in-process stand-in for a ccxt exchange. A `ReplayClock`
+moves through the history at `speed` x real time (or is advanced by hand), and only
+bars that have opened by the replay time are visible. A bar still forming is shown
+as of the replay time: its open as open/high/low/close, with volume pro-rated by the
+elapsed part of the bar, so nothing from the future leaks. Orders go through a
+MatchingEngine against synthetic market-maker liquidity quoted around the latest
+known price (the forming bar's open, re-quoted at its close once it closes). As on real venues, clientOrderIds are unique
+and past orders stay queryable (fetch_order/fetch_orders). Every call can be
+delayed by sampled latency and can fail with injected ccxt network errors.
+
+`start_replay_server` exposes the same exchange over HTTP (ThreadingHTTPServer),
+and `ReplayHTTPClient` is the matching ccxt-like client, so many processes or
+threads can hit one replay concurrently.
+"""
+
+import json
+import logging
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import ccxt
+import numpy as np
+import pandas as pd
+
+from src.backtesting.slippage import sample_latency_ms
+from src.backtesting.streaming import LAKE_ROOT, iter_lake_batches, lake_path
+from src.paper_trading.matching_engine import MatchingEngine
+
+logger = logging.getLogger(__name__)
+
+_MAKER_PREFIX = "replay-mm-"
+INJECTED_ERRORS = (ccxt.RequestTimeout, ccxt.ExchangeNotAvailable, ccxt.NetworkError)
+
+
+class ReplayClock:
+    """
+    Simulated exchange time: `start_ms` plus elapsed wall time scaled by `speed`.
+
+    With speed=0 the clock only moves through `advance`.
+    """
+
+    def __init__(self, start_ms: int, speed: float = 1.0, wall: Callable[[], float] = time.monotonic):
+        if speed < 0:
+            raise ValueError("speed must be non-negative")
+        self.speed = speed
+        self._wall = wall
+        self._origin_wall = wall()
+        self._origin_ms = float(start_ms)
+        self._lock = threading.Lock()
+
+    def now_ms(self) -> int:
+        with self._lock:
+            return int(self._origin_ms + (self._wall() - self._origin_wall) * 1000.0 * self.speed)
+
+    def advance(self, ms: float) -> None:
+        """
+        Jump forward by `ms` of replay time.
+        """
+        with self._lock:
+            self._origin_ms += ms
+
+
+def _frame_to_arrays(df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    ts = df["timestamp"] if "timestamp" in df.columns else df.index.to_series()
+    ts = pd.DatetimeIndex(pd.to_datetime(ts, utc=True)).as_unit("ms").asi8
+    order = np.argsort(ts, kind="stable")
+    values = df[["open", "high", "low", "close", "volume"]].to_numpy(dtype=float)[order]
+    return ts[order], values
+
+
+class ReplayExchange:
+    """
+    In-process, thread-safe ccxt-like exchange replaying stored bars.
+    """
+
+    def __init__(
+        self,
+        frames: Dict[str, pd.DataFrame],
+        timeframe: str = "1m",
+        speed: float = 1.0,
+        start_ms: Optional[int] = None,
+        warmup_bars: int = 500,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        latency_distribution: str = "fixed",
+        error_rate: float = 0.0,
+        spread_bps: float = 2.0,
+        depth_levels: int = 10,
+        seed: Optional[int] = None,
+        clock: Optional[ReplayClock] = None,
+        rate_limit_ms: int = 0
+    ):
+        """
+        Args:
+            frames: symbol -> OHLCV DataFrame (timestamp column or DatetimeIndex).
+            timeframe: Timeframe of the stored bars.
+            speed: Replay speed multiplier (60 = one 1m bar per wall second; 0 = manual).
+            start_ms: Replay start time; defaults to `warmup_bars` bars after the
+                earliest stored bar, so history is available from the first call.
+            warmup_bars: See `start_ms`.
+            latency_ms: Base latency added to every call (see `sample_latency_ms`).
+            jitter_ms: Latency spread.
+            latency_distribution: "fixed", "exponential", "lognormal" or "uniform".
+            error_rate: Probability that a call raises an injected ccxt network error.
+            spread_bps: Synthetic market-maker spread around each bar's close.
+            depth_levels: Synthetic price levels per side.
+            seed: Seed for latency and error draws.
+            clock: Custom clock; built from `start_ms`/`speed` if None.
+            rate_limit_ms: Advertised ccxt `rateLimit` (not enforced by the replay).
+        """
+        if not frames:
+            raise ValueError("frames must not be empty")
+        if not 0 <= error_rate < 1:
+            raise ValueError("error_rate must be in [0, 1)")
+        self.id = "replay"
+        self.rateLimit = rate_limit_ms
+        self.has = {"createOrders": True, "fetchOrders": True, "fetchOpenOrders": True}
+        self.timeframe = timeframe
+        self.timeframe_ms = int(ccxt.Exchange.parse_timeframe(timeframe) * 1000)
+        self._data = {symbol: _frame_to_arrays(df) for symbol, df in frames.items()}
+        self.symbols = list(self._data)
+        if start_ms is None:
+            first = min(int(ts[0]) for ts, _ in self._data.values() if len(ts))
+            start_ms = first + warmup_bars * self.timeframe_ms
+        self.clock = clock if clock is not None else ReplayClock(start_ms, speed)
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.latency_distribution = latency_distribution
+        self.error_rate = error_rate
+        self.spread_bps = spread_bps
+        self.depth_levels = depth_levels
+        self.engine = MatchingEngine(clock=self.clock.now_ms)
+        self.markets = {
+            s: {"id": s.replace("/", ""), "symbol": s, "base": s.split("/")[0], "quote": s.split("/")[-1],
+                "type": "spot", "spot": True, "active": True}
+            for s in self.symbols
+        }
+        self._rng = np.random.default_rng(seed)
+        self._lock = threading.RLock()
+        self._quoted: Dict[str, Tuple[int, bool]] = {}
+        self._maker_ids: Dict[str, List[str]] = {}
+        # User orders by id: None while resting (read from the engine), else the final dict.
+        self._orders: Dict[str, Optional[Dict[str, Any]]] = {}
+        self._resting: set = set()
+        self._client_ids: Dict[str, str] = {}
+        self.calls = 0
+        self.injected_errors = 0
+
+    @property
+    def replay_speed(self) -> float:
+        return self.clock.speed or 1.0
+
+    @classmethod
+    def from_lake(
+        cls,
+        exchange_id: str,
+        symbols: Sequence[str],
+        timeframe: str = "1m",
+        root: str = LAKE_ROOT,
+        start: Optional[pd.Timestamp] = None,
+        end: Optional[pd.Timestamp] = None,
+        **kwargs: Any
+    ) -> "ReplayExchange":
+        """
+        Build a replay from the Parquet lake (see `src.backtesting.streaming`).
+        """
+        frames = {}
+        for symbol in symbols:
+            batches = list(iter_lake_batches(lake_path(exchange_id, symbol, timeframe, root), start=start, end=end))
+            if not batches:
+                raise ValueError(f"No lake data for {exchange_id} {symbol} {timeframe}")
+            frames[symbol] = pd.concat(batches, ignore_index=True)
+        return cls(frames, timeframe=timeframe, **kwargs)
+
+    # ccxt surface -----------------------------------------------------------------
+
+    @staticmethod
+    def parse_timeframe(timeframe: str) -> int:
+        return ccxt.Exchange.parse_timeframe(timeframe)
+
+    def milliseconds(self) -> int:
+        return self.clock.now_ms()
+
+    def load_markets(self, reload: bool = False) -> Dict[str, Dict[str, Any]]:
+        self._gate()
+        return self.markets
+
+    def fetch_ohlcv(
+        self,
+        symbol: str,
+        timeframe: str = "1m",
+        since: Optional[int] = None,
+        limit: Optional[int] = None,
+        params: Optional[Dict[str, Any]] = None
+    ) -> List[List[float]]:
+        """
+        Bars opened by the current replay time; a forming last bar is shown as of now.
+        """
+        self._gate()
+        if timeframe != self.timeframe:
+            raise ccxt.BadRequest(f"replay only serves {self.timeframe} bars")
+        ts, values = self._series(symbol)
+        now = self.clock.now_ms()
+        visible = int(np.searchsorted(ts, now, side="right"))
+        limit = limit or 500
+        if since is None:
+            lo = max(visible - limit, 0)
+            hi = visible
+        else:
+            lo = int(np.searchsorted(ts, since, side="left"))
+            hi = min(lo + limit, visible)
+        rows = np.column_stack([ts[lo:hi].astype(float), values[lo:hi]])
+        if hi == visible and hi > lo:
+            rows[-1, 1:] = self._as_of(int(ts[hi - 1]), values[hi - 1], now)
+        return [[int(r[0]), *r[1:]] for r in rows.tolist()]
+
+    def fetch_ticker(self, symbol: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        self._gate()
+        with self._lock:
+            bar_ts, bar, depth_volume = self._current_bar(symbol)
+            self._requote(symbol, bar_ts, bar, depth_volume)
+            book = self.engine.book(symbol)
+            now = self.clock.now_ms()
+            return {
+                "symbol": symbol,
+                "timestamp": now,
+                "datetime": ccxt.Exchange.iso8601(now),
+                "open": bar[0], "high": bar[1], "low": bar[2], "close": bar[3], "last": bar[3],
+                "bid": book.best_bid(), "ask": book.best_ask(),
+                "baseVolume": bar[4],
+                "info": {},
+            }
+
+    def fetch_order_book(
+        self,
+        symbol: str,
+        limit: Optional[int] = None,
+        params: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        self._gate()
+        with self._lock:
+            self._requote(symbol, *self._current_bar(symbol))
+            return self.engine.fetch_order_book(symbol, limit)
+
+    def create_order(
+        self,
+        symbol: str,
+        type: str,
+        side: str,
+        amount: float,
+        price: Optional[float] = None,
+        params: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Match against synthetic liquidity quoted around the latest known price.
+
+        Raises:
+            ccxt.DuplicateOrderId: If the clientOrderId was already used.
+        """
+        self._gate()
+        with self._lock:
+            return self._create(symbol, type, side, amount, price, params)
+
+    def create_orders(self, orders: List[Dict[str, Any]], params: Optional[Dict[str, Any]] = None):
+        """
+        Batch form of `create_order` (one request). Orders that fail are returned
+        with status 'rejected' and the error under info, as exchanges report them.
+        """
+        self._gate()
+        out = []
+        with self._lock:
+            for o in orders:
+                try:
+                    out.append(self._create(o["symbol"], o["type"], o["side"], o["amount"],
+                                            o.get("price"), o.get("params")))
+                except ccxt.BaseError as e:
+                    out.append({
+                        "id": None, "clientOrderId": (o.get("params") or {}).get("clientOrderId"),
+                        "symbol": o["symbol"], "status": "rejected",
+                        "info": {"error": type(e).__name__, "message": str(e)},
+                    })
+        return out
+
+    def cancel_order(self, id: str, symbol: Optional[str] = None, params: Optional[Dict[str, Any]] = None):
+        self._gate()
+        with self._lock:
+            order = self.engine.cancel_order(id, symbol)
+            if id in self._orders:
+                self._orders[id] = order
+                self._resting.discard(id)
+            return order
+
+    def fetch_order(self, id: Optional[str], symbol: Optional[str] = None, params: Optional[Dict[str, Any]] = None):
+        """
+        Any user order, open or finished, by id or by params["clientOrderId"].
+
+        Raises:
+            ccxt.OrderNotFound: If no such order was placed.
+        """
+        self._gate()
+        client_id = (params or {}).get("clientOrderId")
+        with self._lock:
+            if client_id is not None:
+                id = self._client_ids.get(client_id)
+                if id is None:
+                    raise ccxt.OrderNotFound(f"clientOrderId {client_id} does not exist")
+            return self._order_view(id)
+
+    def fetch_orders(self, symbol: Optional[str] = None, since=None, limit=None, params=None):
+        self._gate()
+        with self._lock:
+            out = [self._order_view(oid) for oid in self._orders]
+            out = [o for o in out if (symbol is None or o["symbol"] == symbol)
+                   and (since is None or o["timestamp"] >= since)]
+            return out[-limit:] if limit else out
+
+    def fetch_open_orders(self, symbol: Optional[str] = None, since=None, limit=None, params=None):
+        self._gate()
+        with self._lock:
+            return [o for o in self.engine.fetch_open_orders(symbol)
+                    if not (o["clientOrderId"] or "").startswith(_MAKER_PREFIX)]
+
+    # internals --------------------------------------------------------------------
+
+    def _gate(self) -> None:
+        with self._lock:
+            self.calls += 1
+            delay = sample_latency_ms(1, self.latency_distribution, self.latency_ms, self.jitter_ms, self._rng)[0] \
+                if self.latency_ms or self.jitter_ms else 0.0
+            fail = self.error_rate > 0 and self._rng.random() < self.error_rate
+            if fail:
+                self.injected_errors += 1
+                error_cls = INJECTED_ERRORS[int(self._rng.integers(len(INJECTED_ERRORS)))]
+        if delay > 0:
+            time.sleep(delay / 1000.0)
+        if fail:
+            raise error_cls("injected replay error")
+
+    def _series(self, symbol: str) -> Tuple[np.ndarray, np.ndarray]:
+        try:
+            return self._data[symbol]
+        except KeyError:
+            raise ccxt.BadSymbol(f"replay has no market {symbol}") from None
+
+    def _current_bar(self, symbol: str) -> Tuple[int, np.ndarray, float]:
+        """
+        Latest bar opened by replay time, as of that time, plus the volume of the
+        latest closed bar (used to size the maker ladder).
+        """
+        ts, values = self._series(symbol)
+        now = self.clock.now_ms()
+        i = int(np.searchsorted(ts, now, side="right")) - 1
+        if i < 0:
+            raise ccxt.ExchangeNotAvailable(f"{symbol} has no bars yet at replay time")
+        if now - ts[i] >= self.timeframe_ms or i == 0:
+            # The very first bar has no closed predecessor; size from its own volume.
+            depth_volume = float(values[i][4])
+        else:
+            depth_volume = float(values[i - 1][4])
+        return int(ts[i]), self._as_of(int(ts[i]), values[i], now), depth_volume
+
+    def _as_of(self, bar_ts: int, bar: np.ndarray, now: float) -> np.ndarray:
+        """
+        `bar` as visible at `now`: unchanged once closed, else open-only prices and
+        volume pro-rated by the elapsed part of the bar.
+        """
+        elapsed = now - bar_ts
+        if elapsed >= self.timeframe_ms:
+            return bar
+        o = bar[0]
+        return np.array([o, o, o, o, bar[4] * elapsed / self.timeframe_ms])
+
+    def _create(self, symbol, type, side, amount, price, params) -> Dict[str, Any]:
+        client_id = (params or {}).get("clientOrderId")
+        if client_id is not None and client_id in self._client_ids:
+            raise ccxt.DuplicateOrderId(f"clientOrderId {client_id} already used")
+        self._requote(symbol, *self._current_bar(symbol))
+        order = self.engine.create_order(symbol, type, side, amount, price, params)
+        self._settle()
+        if order["status"] == "open":
+            self._orders[order["id"]] = None
+            self._resting.add(order["id"])
+        else:
+            self._orders[order["id"]] = order
+        if client_id is not None:
+            self._client_ids[client_id] = order["id"]
+        return order
+
+    def _settle(self) -> None:
+        """
+        Snapshot resting user orders that just finished, before the engine's bounded
+        finished-order history (churned by the maker ladder) drops them.
+        """
+        for oid in [oid for oid in self._resting if oid not in self.engine.open_orders]:
+            self._resting.discard(oid)
+            self._orders[oid] = self.engine.fetch_order(oid)
+
+    def _order_view(self, id: str) -> Dict[str, Any]:
+        if id not in self._orders:
+            raise ccxt.OrderNotFound(f"order {id} does not exist")
+        order = self._orders[id]
+        return order if order is not None else self.engine.fetch_order(id)
+
+    def _requote(self, symbol: str, bar_ts: int, bar: np.ndarray, depth_volume: float) -> None:
+        """
+        Replace the synthetic maker ladder around the bar's as-of close: once when the
+        bar opens (its open) and once more if it is still current after closing.
+        """
+        closed = self.clock.now_ms() - bar_ts >= self.timeframe_ms
+        key = (bar_ts, closed)
+        if self._quoted.get(symbol) == key:
+            return
+        for oid in self._maker_ids.pop(symbol, []):
+            if oid in self.engine.open_orders:
+                self.engine.cancel_order(oid, symbol)
+        close = float(bar[3])
+        step = close * self.spread_bps / 1e4
+        qty = max(depth_volume / (2 * self.depth_levels), 1e-8)
+        ids = []
+        for level in range(self.depth_levels):
+            offset = step * (0.5 + level)
+            for side, px in (("buy", close - offset), ("sell", close + offset)):
+                order = self.engine.create_order(
+                    symbol, "limit", side, qty, px,
+                    {"clientOrderId": f"{_MAKER_PREFIX}{bar_ts}{'c' if closed else ''}-{side}-{level}"},
+                )
+                if order["status"] == "open":
+                    ids.append(order["id"])
+        self._maker_ids[symbol] = ids
+        self._quoted[symbol] = key
+        self._settle()
+
+
+# HTTP ------------------------------------------------------------------------------
+
+def _make_handler(exchange: ReplayExchange):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format: str, *args: Any) -> None:
+            logger.debug("replay http: " + format, *args)
+
+        def _reply(self, status: int, payload: Any) -> None:
+            body = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _dispatch(self, method: str) -> None:
+            url = urllib.parse.urlparse(self.path)
+            q = {k: v[-1] for k, v in urllib.parse.parse_qs(url.query).items()}
+            num = lambda key: int(q[key]) if q.get(key) else None
+            try:
+                if method == "GET" and url.path == "/ohlcv":
+                    result = exchange.fetch_ohlcv(q["symbol"], q.get("timeframe", exchange.timeframe),
+                                                  num("since"), num("limit"))
+                elif method == "GET" and url.path == "/ticker":
+                    result = exchange.fetch_ticker(q["symbol"])
+                elif method == "GET" and url.path == "/orderbook":
+                    result = exchange.fetch_order_book(q["symbol"], num("limit"))
+                elif method == "GET" and url.path == "/markets":
+                    result = exchange.load_markets()
+                elif method == "GET" and url.path == "/time":
+                    result = {"milliseconds": exchange.milliseconds(), "speed": exchange.replay_speed}
+                elif method == "GET" and url.path == "/order":
+                    result = exchange.fetch_order(q.get("id"), q.get("symbol"),
+                                                  {"clientOrderId": q["clientOrderId"]} if q.get("clientOrderId") else None)
+                elif method == "GET" and url.path == "/orders":
+                    result = exchange.fetch_orders(q.get("symbol"), num("since"), num("limit"))
+                elif method == "GET" and url.path == "/open_orders":
+                    result = exchange.fetch_open_orders(q.get("symbol"))
+                elif method == "DELETE" and url.path == "/order":
+                    result = exchange.cancel_order(q["id"], q.get("symbol"))
+                elif method == "POST" and url.path in ("/order", "/orders"):
+                    length = int(self.headers.get("Content-Length") or 0)
+                    body = json.loads(self.rfile.read(length) or b"{}")
+                    if url.path == "/orders":
+                        result = exchange.create_orders(body["orders"])
+                    else:
+                        result = exchange.create_order(body["symbol"], body["type"], body["side"], body["amount"],
+                                                       body.get("price"), body.get("params"))
+                else:
+                    self._reply(404, {"error": "NotSupported", "message": f"{method} {url.path}"})
+                    return
+            except ccxt.NetworkError as e:
+                self._reply(503, {"error": type(e).__name__, "message": str(e)})
+                return
+            except ccxt.BaseError as e:
+                self._reply(400, {"error": type(e).__name__, "message": str(e)})
+                return
+            except (KeyError, ValueError) as e:
+                self._reply(400, {"error": "BadRequest", "message": str(e)})
+                return
+            self._reply(200, result)
+
+        def do_GET(self) -> None:
+            self._dispatch("GET")
+
+        def do_POST(self) -> None:
+            self._dispatch("POST")
+
+        def do_DELETE(self) -> None:
+            self._dispatch("DELETE")
+
+    return Handler
+
+
+class _ReplayHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Many clients connect at once (one per trader/worker); the default backlog of 5
+    # resets connections under load.
+    request_queue_size = 128
+
+
+def start_replay_server(
+    exchange: ReplayExchange,
+    host: str = "127.0.0.1",
+    port: int = 0
+) -> Tuple[ThreadingHTTPServer, threading.Thread]:
+    """
+    Serve `exchange` over HTTP in a background thread (one thread per connection).
+
+    Returns:
+        (server, thread); the bound port is `server.server_address[1]`. Call
+        `server.shutdown()` to stop.
+    """
+    server = _ReplayHTTPServer((host, port), _make_handler(exchange))
+    thread = threading.Thread(target=server.serve_forever, name="replay-http", daemon=True)
+    thread.start()
+    logger.info("Replay exchange serving on %s:%d", *server.server_address[:2])
+    return server, thread
+
+
+class ReplayHTTPClient:
+    """
+    Minimal ccxt-like client for a replay server.
+    """
+
+    def __init__(self, base_url: str, timeout: float = 10.0):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.id = "replay"
+        self.has = {"createOrders": True, "fetchOrders": True, "fetchOpenOrders": True}
+        info = self._request("GET", "/time")
+        self.replay_speed = info["speed"]
+
+    @staticmethod
+    def parse_timeframe(timeframe: str) -> int:
+        return ccxt.Exchange.parse_timeframe(timeframe)
+
+    def _request(self, method: str, path: str, query: Optional[Dict[str, Any]] = None, body: Any = None) -> Any:
+        query = {k: v for k, v in (query or {}).items() if v is not None}
+        url = f"{self.base_url}{path}" + (f"?{urllib.parse.urlencode(query)}" if query else "")
+        data = json.dumps(body).encode() if body is not None else None
+        req = urllib.request.Request(url, data=data, method=method, headers={"Content-Type": "application/json"})
+        try:
+            with urllib.request.urlopen(req, timeout=self.timeout) as resp:
+                return json.loads(resp.read())
+        except urllib.error.HTTPError as e:
+            payload = json.loads(e.read() or b"{}")
+            error_cls = getattr(ccxt, payload.get("error", ""), ccxt.ExchangeError)
+            raise error_cls(payload.get("message", str(e))) from None
+        except (urllib.error.URLError, TimeoutError) as e:
+            raise ccxt.NetworkError(str(e)) from None
+
+    def milliseconds(self) -> int:
+        return self._request("GET", "/time")["milliseconds"]
+
+    def load_markets(self, reload: bool = False) -> Dict[str, Any]:
+        return self._request("GET", "/markets")
+
+    def fetch_ohlcv(self, symbol, timeframe="1m", since=None, limit=None, params=None):
+        return self._request("GET", "/ohlcv", {"symbol": symbol, "timeframe": timeframe, "since": since, "limit": limit})
+
+    def fetch_ticker(self, symbol, params=None):
+        return self._request("GET", "/ticker", {"symbol": symbol})
+
+    def fetch_order_book(self, symbol, limit=None, params=None):
+        return self._request("GET", "/orderbook", {"symbol": symbol, "limit": limit})
+
+    def create_order(self, symbol, type, side, amount, price=None, params=None):
+        return self._request("POST", "/order", body={
+            "symbol": symbol, "type": type, "side": side, "amount": amount, "price": price, "params": params,
+        })
+
+    def create_orders(self, orders, params=None):
+        return self._request("POST", "/orders", body={"orders": orders})
+
+    def cancel_order(self, id, symbol=None, params=None):
+        return self._request("DELETE", "/order", {"id": id, "symbol": symbol})
+
+    def fetch_order(self, id, symbol=None, params=None):
+        return self._request("GET", "/order", {"id": id, "symbol": symbol,
+                                               "clientOrderId": (params or {}).get("clientOrderId")})
+
+    def fetch_orders(self, symbol=None, since=None, limit=None, params=None):
+        return self._request("GET", "/orders", {"symbol": symbol, "since": since, "limit": limit})
+
+    def fetch_open_orders(self, symbol=None, since=None, limit=None, params=None):
+        return self._request("GET", "/open_orders", {"symbol": symbol})
@@ -0,0 +1,284 @@
+"""
+Multi-symbol paper-trading runner: one shared exchange session, per-symbol workers.
+
+A single fetcher multiplexes `fetch_ohlcv` calls for the whole universe over one
+exchange instance and publishes new closed bars on an in-process EventBus. Each symbol
+has its own worker task and strategy instance; signal generation runs in a thread or,
+for CPU-heavy strategies, in a shared process pool. Strategies implementing
+`generate_signals_stream` are sent only the new bars and their carried state.
+"""
+
+from __future__ import annotations
+import os
+import time
+import asyncio
+import logging
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import suppress
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from src.data.ring_buffer import OHLCVRingBuffer
+from src.execution.exchange_factory import make_exchange
+from src.governance.risk_gate import GatedSink, RiskGate
+from src.paper_trading.paper_trader import (
+    ExchangeClock,
+    candles_to_frame,
+    closed_new_candles,
+    next_bar_close_delay,
+    route_signals,
+    supports_streaming,
+)
+from src.paper_trading.simulator import PaperExchangeSimulator
+from src.utils.event_bus import EventBus
+from src.utils.latency import LatencyTracker
+
+logger = logging.getLogger(__name__)
+
+
+def _generate_signals(strategy: Any, df: Any) -> List[Dict]:
+    # Module-level so it can be pickled into a process pool.
+    return strategy.generate_signals(df)
+
+
+def _generate_signals_stream(strategy: Any, df: Any, state: Any) -> Tuple[List[Dict], Any]:
+    return strategy.generate_signals_stream(df, state)
+
+
+def bars_topic(symbol: str) -> str:
+    """
+    Event bus topic carrying new closed bars for `symbol`.
+    """
+    return f"bars:{symbol}"
+
+
+class SymbolWorker:
+    """
+    Per-symbol state: strategy instance, bar history, streaming state and placed orders.
+    """
+
+    def __init__(self, symbol: str, strategy: Any, history_bars: int = 500):
+        self.symbol = symbol
+        self.strategy = strategy
+        self.last_ts: Optional[int] = None
+        self.bars = OHLCVRingBuffer(history_bars)
+        self.streaming = supports_streaming(strategy)
+        self.stream_state: Any = None
+        self.orders: deque = deque(maxlen=1000)
+
+
+class MultiSymbolRunner:
+    """
+    Runs one strategy instance per symbol over a shared exchange session.
+    """
+
+    def __init__(
+        self,
+        strategy_factory: Callable[[str], Any],
+        cfg: Any,
+        symbols: Optional[Sequence[str]] = None,
+        exchange: Any = None,
+        simulator: Optional[PaperExchangeSimulator] = None,
+        history_bars: int = 500,
+        close_delay_ms: int = 1000,
+        max_concurrent_fetches: int = 8,
+        process_workers: int = 0,
+        risk_gate: Optional[RiskGate] = None,
+        max_pending_batches: int = 0,
+    ):
+        """
+        Args:
+            strategy_factory: Called once per symbol to build that symbol's strategy.
+            cfg: Config object (EXCHANGE_ID, SYMBOLS, TIMEFRAME, DEFAULT_MARKET_TYPE).
+            symbols: Universe to trade; defaults to cfg.SYMBOLS, then [cfg.SYMBOL].
+            exchange: Optional pre-built ccxt-like exchange shared by all symbols.
+            simulator: Optional order simulator shared by all symbols.
+            history_bars: Number of most recent bars handed to each strategy.
+            close_delay_ms: Delay after each bar close before polling.
+            max_concurrent_fetches: Upper bound on in-flight fetch_ohlcv calls.
+            process_workers: Size of the process pool for signal generation
+                (0 = run strategies in threads).
+            risk_gate: Optional pre-trade RiskGate shared by all symbols, so global
+                limits and the drawdown halt see the whole universe.
+            max_pending_batches: Bar batches queued per symbol before the fetcher waits
+                for that symbol's worker (0 = unbounded). Bars are never dropped, so a
+                worker's `last_ts` only moves past bars it will process.
+        """
+        self.cfg = cfg
+        if symbols is None:
+            symbols = getattr(cfg, "SYMBOLS", None) or [getattr(cfg, "SYMBOL", "BTC/USDT")]
+        self.symbols = list(symbols)
+        if not self.symbols:
+            raise ValueError("At least one symbol is required")
+
+        exchange_id = getattr(cfg, "EXCHANGE_ID", os.getenv("EXCHANGE_ID", "binance"))
+        market_type = getattr(cfg, "DEFAULT_MARKET_TYPE", os.getenv("DEFAULT_MARKET_TYPE", "spot"))
+        self.timeframe = getattr(cfg, "TIMEFRAME", os.getenv("TIMEFRAME", "1m"))
+
+        if exchange is None:
+            exchange = make_exchange(
+                exchange_id,
+                api_key=os.getenv("API_KEY"),
+                api_secret=os.getenv("API_SECRET"),
+                market_type=market_type,
+                symbols=self.symbols,
+            )
+        self.exchange = exchange
+        self.clock = ExchangeClock(exchange)
+        self._is_binance_like = exchange_id.lower().startswith("binance")
+
+        self.simulator = simulator if simulator is not None else PaperExchangeSimulator()
+        self.risk_gate = risk_gate
+        self._order_sink = GatedSink(self.simulator, risk_gate) if risk_gate is not None else self.simulator
+        self.history_bars = history_bars
+        self.close_delay_ms = close_delay_ms
+        self.max_concurrent_fetches = max_concurrent_fetches
+        self.process_workers = process_workers
+        self.timeframe_ms = int(self.exchange.parse_timeframe(self.timeframe) * 1000)
+
+        self.bus = EventBus(max_pending_batches)
+        self.workers: Dict[str, SymbolWorker] = {
+            s: SymbolWorker(s, strategy_factory(s), history_bars) for s in self.symbols
+        }
+        self.tick_to_order = LatencyTracker()
+        self.loop_jitter = LatencyTracker()
+        self.fetch_latency = LatencyTracker()
+        self._stopped = False
+
+    def run(self, max_iterations: Optional[int] = None) -> None:
+        """
+        Run until `stop()` is called or `max_iterations` universe polls complete.
+        """
+        asyncio.run(self.run_async(max_iterations))
+
+    def stop(self) -> None:
+        """
+        Ask the runner to exit after the current poll.
+        """
+        self._stopped = True
+
+    async def run_async(self, max_iterations: Optional[int] = None) -> None:
+        """
+        Coroutine form of `run`, for embedding in an existing event loop.
+        """
+        if not self._is_binance_like:
+            try:
+                self.exchange.load_markets(reload=False)
+            except Exception as e:
+                logger.warning("load_markets failed (continuing anyway): %s", e)
+
+        pool = ProcessPoolExecutor(self.process_workers) if self.process_workers > 0 else None
+        queues = {s: self.bus.subscribe(bars_topic(s)) for s in self.symbols}
+        tasks = [
+            asyncio.create_task(self._worker_loop(self.workers[s], queues[s], pool))
+            for s in self.symbols
+        ]
+        try:
+            await self._fetch_loop(max_iterations)
+            await asyncio.gather(*(q.join() for q in queues.values()))
+        finally:
+            for task in tasks:
+                task.cancel()
+            for task in tasks:
+                with suppress(asyncio.CancelledError):
+                    await task
+            if pool is not None:
+                pool.shutdown(wait=True)
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Runner health metrics (milliseconds) plus per-symbol order counts.
+        """
+        metrics = {
+            "symbols": len(self.symbols),
+            "orders": {s: len(w.orders) for s, w in self.workers.items()},
+            "dropped_events": self.bus.dropped,
+            "fetch_ms": self.fetch_latency.summary(),
+            "tick_to_order_ms": self.tick_to_order.summary(),
+            "loop_jitter_ms": self.loop_jitter.summary(),
+        }
+        if self.risk_gate is not None:
+            metrics["risk"] = self.risk_gate.metrics()
+        return metrics
+
+    def _now_ms(self) -> float:
+        # Exchange clock: wall time for ccxt, simulated time for a ReplayExchange.
+        return self.clock.now_ms()
+
+    def _next_wakeup_delay(self, now_ms: float) -> float:
+        return next_bar_close_delay(now_ms, self.timeframe_ms, self.close_delay_ms)
+
+    async def _fetch_loop(self, max_iterations: Optional[int]) -> None:
+        semaphore = asyncio.Semaphore(self.max_concurrent_fetches)
+        iteration = 0
+        while not self._stopped:
+            iteration += 1
+            await asyncio.to_thread(self.clock.sync)
+            await asyncio.gather(*(self._poll_symbol(w, semaphore) for w in self.workers.values()))
+
+            if max_iterations is not None and iteration >= max_iterations:
+                break
+
+            delay = self._next_wakeup_delay(self._now_ms())
+            target_ms = self._now_ms() + delay * 1000.0
+            await asyncio.sleep(delay / getattr(self.exchange, "replay_speed", 1.0))
+            self.loop_jitter.record(max(0.0, self._now_ms() - target_ms))
+
+    async def _poll_symbol(self, worker: SymbolWorker, semaphore: asyncio.Semaphore) -> None:
+        if worker.last_ts is None:
+            kwargs = {"limit": self.history_bars}
+        else:
+            kwargs = {"since": worker.last_ts + 1}
+
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                ohlcv = await asyncio.to_thread(
+                    self.exchange.fetch_ohlcv, worker.symbol, self.timeframe, **kwargs
+                )
+            except Exception as e:
+                logger.warning("fetch_ohlcv failed for %s: %s", worker.symbol, e)
+                return
+            self.fetch_latency.record_since(start)
+        tick = time.perf_counter()
+
+        warmup = worker.last_ts is None
+        new_bars = closed_new_candles(ohlcv, worker.last_ts, self.timeframe_ms, self._now_ms())
+        if new_bars:
+            worker.last_ts = int(new_bars[-1][0])
+            await self.bus.publish_wait(bars_topic(worker.symbol), (tick, new_bars, warmup))
+
+    async def _worker_loop(
+        self,
+        worker: SymbolWorker,
+        queue: asyncio.Queue,
+        pool: Optional[Executor],
+    ) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            tick, new_bars, warmup = await queue.get()
+            try:
+                worker.bars.extend(new_bars)
+                if worker.streaming:
+                    # New bars only once state is carried; the state round-trips through the pool.
+                    batch = worker.bars.to_frame() if worker.stream_state is None else candles_to_frame(new_bars)
+                    signals, worker.stream_state = await loop.run_in_executor(
+                        pool, _generate_signals_stream, worker.strategy, batch, worker.stream_state
+                    )
+                else:
+                    df = worker.bars.to_frame()
+                    signals = await loop.run_in_executor(pool, _generate_signals, worker.strategy, df)
+                # The warm-up history only primes indicators; act on its latest bar alone.
+                acted = new_bars[-1:] if warmup else new_bars
+                if self.risk_gate is not None:
+                    for row in acted:
+                        self.risk_gate.mark(worker.symbol, row[4])
+                route_signals(
+                    self._order_sink, worker.symbol, signals, acted,
+                    tick, self.tick_to_order, worker.orders,
+                )
+            except Exception:
+                worker.stream_state = None
+                logger.exception("Failed to process %d new bars for %s", len(new_bars), worker.symbol)
+            finally:
+                queue.task_done()
@@ -3,9 +3,12 @@ Paper-trading simulator: simulates CCXT exchange behavior with slippage,
 partial fills, and error injection.
 """
 
-import random
 import logging
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from src.paper_trading.matching_engine import MatchingEngine
 
 logger = logging.getLogger(__name__)
 
@@ -19,17 +22,36 @@ class PaperExchangeSimulator:
         self,
         slippage_pct: float = 0.001,
         error_rate: float = 0.01,
-        partial_fill_min: float = 0.5
+        partial_fill_min: float = 0.5,
+        mode: str = "random",
+        engine: Optional[MatchingEngine] = None,
+        seed: Union[int, np.random.SeedSequence, None] = None,
+        slippage_std: float = 0.0
     ):
         """
         Args:
             slippage_pct: Fractional slippage applied to the fill price.
             error_rate: Probability [0–1] of raising a simulated error on create_order.
             partial_fill_min: Minimum fraction of order that will be filled when partial.
+            mode: "random" for random partial fills with fixed slippage, or "matching"
+                to match orders against per-symbol price-time priority order books.
+            engine: MatchingEngine to use in "matching" mode (a fresh one if None).
+            seed: Seed (or SeedSequence) for this instance's own numpy Generator, used for
+                every error and fill draw. Each instance draws from an independent stream.
+            slippage_std: Relative dispersion of batched slippage around slippage_pct
+                (0 = fixed slippage, as in create_order).
         """
+        if mode not in ("random", "matching"):
+            raise ValueError("mode must be 'random' or 'matching'")
         self.slippage_pct = slippage_pct
         self.error_rate = error_rate
         self.partial_fill_min = partial_fill_min
+        self.mode = mode
+        self.slippage_std = slippage_std
+        self.rng = np.random.default_rng(seed)
+        self.engine: Optional[MatchingEngine] = None
+        if mode == "matching":
+            self.engine = engine if engine is not None else MatchingEngine()
 
     def create_order(
         self,
@@ -37,7 +59,8 @@ class PaperExchangeSimulator:
         type: str,
         side: str,
         amount: float,
-        price: Optional[float] = None
+        price: Optional[float] = None,
+        params: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """
         Simulate placing an order.
@@ -48,21 +71,27 @@ class PaperExchangeSimulator:
             side: "buy" or "sell".
             amount: Intended amount.
             price: Limit price (for LIMIT orders) or None for MARKET.
+            params: Extra ccxt-style params; in "matching" mode supports
+                timeInForce ('GTC'/'IOC'/'PO'), postOnly and clientOrderId.
 
         Returns:
             A dict mimicking CCXT order response with keys:
               - symbol, type, side, amount, filled, price, status
+            In "matching" mode, the full ccxt-shaped order including its 'trades'.
 
         Raises:
             Exception: Simulated exchange error.
         """
         # Possibly throw a simulated error
-        if random.random() < self.error_rate:
+        if self.rng.random() < self.error_rate:
             logger.error("Simulated exchange error")
             raise Exception("Simulated exchange error")
 
+        if self.engine is not None:
+            return self.engine.create_order(symbol, type, side, amount, price, params)
+
         # Determine fill fraction
-        frac = random.uniform(self.partial_fill_min, 1.0)
+        frac = float(self.rng.uniform(self.partial_fill_min, 1.0))
         filled = round(amount * frac, 8)
 
         # Determine fill price with slippage
@@ -88,3 +117,115 @@ class PaperExchangeSimulator:
             "price": exec_price,
             "status": status,
         }
+
+    @classmethod
+    def spawn(cls, n: int, seed: Optional[int] = None, **kwargs: Any) -> List["PaperExchangeSimulator"]:
+        """
+        Build `n` simulators with statistically independent RNG streams for parallel
+        workers. The same `seed` always yields the same streams, in the same order.
+
+        Args:
+            n: Number of simulators.
+            seed: Root seed; children are derived with SeedSequence.spawn.
+            **kwargs: Passed to each simulator's constructor.
+        """
+        children = np.random.SeedSequence(seed).spawn(n)
+        return [cls(seed=child, **kwargs) for child in children]
+
+    def create_orders_batch(
+        self,
+        symbols: Sequence[str],
+        types: Sequence[str],
+        sides: Sequence[str],
+        amounts: Sequence[float],
+        prices: Optional[Sequence[float]] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Simulate many orders in one vectorized pass using this instance's Generator.
+
+        Errors, partial-fill fractions and slippage are drawn as whole arrays, so a
+        given seed and batch always produce the same results. Errors are reported per
+        order instead of raised.
+
+        Args:
+            symbols: Market symbol per order.
+            types: Order type per order ("MARKET"/"LIMIT").
+            sides: "buy" or "sell" per order.
+            amounts: Intended amount per order.
+            prices: Reference price per order (NaN or None for unknown).
+
+        Returns:
+            Dict of equal-length arrays: symbol, type, side, amount, filled, price,
+            status ('closed'/'partial'/'rejected') and error (bool).
+
+        Raises:
+            ValueError: On mismatched lengths or invalid sides.
+            RuntimeError: In "matching" mode, where fills depend on book state.
+        """
+        if self.engine is not None:
+            raise RuntimeError("create_orders_batch requires mode='random'")
+
+        amounts = np.asarray(amounts, dtype=float)
+        n = len(amounts)
+        sides = np.asarray(sides)
+        if prices is None:
+            prices = np.full(n, np.nan)
+        elif isinstance(prices, np.ndarray):
+            prices = prices.astype(float, copy=False)
+        else:
+            prices = np.array([np.nan if p is None else p for p in prices], dtype=float)
+        if not (len(symbols) == len(types) == len(sides) == len(prices) == n):
+            raise ValueError("All order columns must have the same length")
+        is_buy = sides == "buy"
+        if not np.all(is_buy | (sides == "sell")):
+            raise ValueError("side must be 'buy' or 'sell'")
+
+        # Fixed draw order keeps results reproducible for a given seed.
+        errors = self.rng.random(n) < self.error_rate
+        frac = self.rng.uniform(self.partial_fill_min, 1.0, n)
+        slip = self.slippage_pct * (1.0 + self.slippage_std * self.rng.standard_normal(n))
+        np.maximum(slip, 0.0, out=slip)
+
+        filled = np.round(amounts * frac, 8)
+        exec_price = prices * np.where(is_buy, 1.0 + slip, 1.0 - slip)
+        filled[errors] = 0.0
+        exec_price[errors] = np.nan
+        status = np.where(errors, "rejected", np.where(filled >= amounts, "closed", "partial"))
+
+        return {
+            "symbol": np.asarray(symbols),
+            "type": np.asarray(types),
+            "side": sides,
+            "amount": amounts,
+            "filled": filled,
+            "price": exec_price,
+            "status": status,
+            "error": errors,
+        }
+
+    def cancel_order(self, id: str, symbol: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Cancel a resting order ("matching" mode only).
+
+        Raises:
+            RuntimeError: If the simulator is not in "matching" mode.
+            ccxt.OrderNotFound: If the order is not open.
+        """
+        return self._require_engine().cancel_order(id, symbol)
+
+    def fetch_order_book(self, symbol: str, limit: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Snapshot of the simulated order book ("matching" mode only).
+        """
+        return self._require_engine().fetch_order_book(symbol, limit)
+
+    def fetch_open_orders(self, symbol: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Resting orders ("matching" mode only).
+        """
+        return self._require_engine().fetch_open_orders(symbol)
+
+    def _require_engine(self) -> MatchingEngine:
+        if self.engine is None:
+            raise RuntimeError("Order book operations require mode='matching'")
+        return self.engine
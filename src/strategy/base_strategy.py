@@ -1,4 +1,5 @@
-from typing import List, Dict
+from typing import Any, List, Dict, Optional, Tuple
+import numpy as np
 import pandas as pd
 
 
@@ -20,3 +21,84 @@ class BaseStrategy:
               - 'size': float position size
         """
         raise NotImplementedError("Subclasses must implement generate_signals")
+
+    def get_state(self) -> Dict[str, Any]:
+        """
+        Indicator state to checkpoint for warm restarts (none by default).
+        """
+        return {}
+
+    def set_state(self, state: Dict[str, Any]) -> None:
+        """
+        Restore state produced by `get_state`.
+        """
+
+    def required_features(self) -> List[str]:
+        """
+        Names of shared features (see src.strategy.features) this strategy can reuse.
+        """
+        return []
+
+    def generate_signals_from_features(self, df: pd.DataFrame, features: Dict[str, np.ndarray]) -> List[Dict]:
+        """
+        Generate signals reusing precomputed features; defaults to `generate_signals`.
+
+        Args:
+            df: OHLCV data, as for `generate_signals`.
+            features: Mapping containing at least `required_features()`.
+        """
+        return self.generate_signals(df)
+
+    def generate_signals_stream(
+        self,
+        df: pd.DataFrame,
+        state: Optional[Any] = None
+    ) -> Tuple[List[Dict], Any]:
+        """
+        Generate signals for one batch of a longer history, carrying state across batches.
+
+        Feeding consecutive batches with the returned state must yield the same
+        signals as `generate_signals` on the concatenated history.
+        PaperTrader checkpoints the state, so it should be a NumPy array or
+        JSON-serializable (tuples are restored as lists).
+
+        Args:
+            df: Next batch of OHLCV rows (same layout as `generate_signals`).
+            state: State returned for the previous batch, or None for the first.
+
+        Returns:
+            (signals for this batch, state for the next batch).
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support streaming")
+
+    def generate_signal_matrix(
+        self,
+        panel: Dict[str, np.ndarray],
+        index: pd.DatetimeIndex,
+        observed: np.ndarray
+    ) -> np.ndarray:
+        """
+        Generate signals for many symbols at once on an aligned symbols x time grid.
+
+        The default runs `generate_signals` per symbol on that symbol's own bars;
+        vectorizable strategies should override it.
+
+        Args:
+            panel: Field name ('open', 'high', 'low', 'close', 'volume') -> symbols x time
+                array, forward-filled onto the shared index.
+            index: Shared time index (length T).
+            observed: symbols x time bool mask of bars the symbol actually printed.
+
+        Returns:
+            symbols x time array of signed signal sizes (buy > 0, sell < 0, 0 = none).
+        """
+        out = np.zeros(observed.shape)
+        pos = pd.Series(np.arange(len(index)), index=index)
+        for i in range(observed.shape[0]):
+            rows = observed[i]
+            df = pd.DataFrame({field: values[i, rows] for field, values in panel.items()}, index=index[rows])
+            df.index.name = "timestamp"
+            for sig in self.generate_signals(df):
+                t = pos[sig["timestamp"]]
+                out[i, t] += sig["size"] if sig["side"] == "buy" else -sig["size"]
+        return out
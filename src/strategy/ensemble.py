@@ -2,15 +2,85 @@
 Ensemble manager to choose the best strategy per regime.
 """
 
+import json
 import logging
-from typing import Dict
+import math
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
 import pandas as pd
 
 from src.strategy.base_strategy import BaseStrategy
+from src.strategy.features import compute_features
+from src.strategy.regime_detector import REGIME_LABELS, RegimeBatch
 
 logger = logging.getLogger(__name__)
 
 
+EVALUATION_MODES = ("serial", "thread", "process")
+
+
+def _member_signals(strategy: BaseStrategy, df: pd.DataFrame, features: Dict[str, np.ndarray]) -> Tuple[List[Dict], float]:
+    """
+    Run one member on shared features and time it (module-level so process pools can pickle it).
+    """
+    start = time.perf_counter()
+    signals = strategy.generate_signals_from_features(df, features)
+    return signals, (time.perf_counter() - start) * 1000.0
+
+
+def evaluate_members(
+    strategies: Dict[str, BaseStrategy],
+    df: pd.DataFrame,
+    mode: str = "thread",
+    max_workers: Optional[int] = None,
+    executor: Optional[Executor] = None
+) -> Dict:
+    """
+    Shadow-run every member on one batch of bars over shared features.
+
+    The union of all members' `required_features()` is computed once, then every
+    member generates signals concurrently from those arrays.
+
+    Args:
+        strategies: Mapping of strategy names to BaseStrategy instances.
+        df: OHLCV batch.
+        mode: "serial", "thread" or "process" (ignored when `executor` is given).
+        max_workers: Pool size for a temporary pool.
+        executor: Existing pool to reuse across bars.
+
+    Returns:
+        Dict with features_ms, wall_ms and members: {name: {"signals", "elapsed_ms"}}.
+    """
+    if mode not in EVALUATION_MODES:
+        raise ValueError(f"mode must be one of {EVALUATION_MODES}")
+    start = time.perf_counter()
+    features = compute_features(df, [f for s in strategies.values() for f in s.required_features()])
+    features_ms = (time.perf_counter() - start) * 1000.0
+
+    names = list(strategies)
+    if executor is None and mode == "serial":
+        results = [_member_signals(strategies[n], df, features) for n in names]
+    else:
+        pool = executor
+        if pool is None:
+            pool_cls = ThreadPoolExecutor if mode == "thread" else ProcessPoolExecutor
+            pool = pool_cls(max_workers=max_workers)
+        try:
+            futures = [pool.submit(_member_signals, strategies[n], df, features) for n in names]
+            results = [f.result() for f in futures]
+        finally:
+            if executor is None:
+                pool.shutdown()
+    return {
+        "features_ms": features_ms,
+        "wall_ms": (time.perf_counter() - start) * 1000.0,
+        "members": {n: {"signals": sig, "elapsed_ms": ms} for n, (sig, ms) in zip(names, results)},
+    }
+
+
 class EnsembleManager:
     """
     Manages multiple strategies and selects one based on regime performance.
@@ -46,10 +116,197 @@ class EnsembleManager:
             The chosen BaseStrategy instance.
         """
         current = regimes.iloc[-1]
-        logger.info(f"Current regime: {current}")
         best_name = max(
             self.performance_data.keys(),
             key=lambda name: self.performance_data[name].get(current, 0.0)
         )
-        logger.info(f"Selected strategy: {best_name}")
+        logger.debug("Regime %s: selected strategy %s", current, best_name)
         return self.strategies[best_name]
+
+    def evaluate_all(
+        self,
+        df: pd.DataFrame,
+        mode: str = "thread",
+        max_workers: Optional[int] = None,
+        executor: Optional[Executor] = None
+    ) -> Dict:
+        """
+        Shadow-run all member strategies on `df`; see `evaluate_members`.
+        """
+        return evaluate_members(self.strategies, df, mode, max_workers, executor)
+
+
+
+class OnlineEnsembleManager(EnsembleManager):
+    """
+    Ensemble whose per-(strategy, regime) scores are learned from realized trades.
+
+    Each (strategy, regime) pair keeps exponentially decayed sums of trade PnL,
+    squared PnL and wins. Its score is either the decayed Sharpe (mean / std per
+    trade) or the decayed hit rate. Until a pair has `min_trades` trades it scores
+    its prior from `performance_data` (0.0 if absent). The best strategy per regime
+    is cached and recomputed only when one of that regime's scores changes, so
+    `select` is a single dict lookup.
+    """
+
+    SCORING = ("sharpe", "hit_rate")
+
+    def __init__(
+        self,
+        strategies: Dict[str, BaseStrategy],
+        performance_data: Dict[str, Dict[str, float]] = None,
+        regimes: Iterable[str] = REGIME_LABELS,
+        halflife: float = 50.0,
+        scoring: str = "sharpe",
+        min_trades: int = 5
+    ):
+        """
+        Args:
+            strategies: Mapping of strategy names to BaseStrategy instances.
+            performance_data: Optional prior scores {strategy_name: {regime_label: score}}.
+            regimes: Regime labels to maintain a selection for.
+            halflife: Number of a pair's own trades after which a result's weight halves.
+            scoring: "sharpe" or "hit_rate".
+            min_trades: Trades required before a pair's learned score replaces its prior.
+        """
+        if scoring not in self.SCORING:
+            raise ValueError(f"scoring must be one of {self.SCORING}")
+        if halflife <= 0:
+            raise ValueError("halflife must be positive")
+        self.strategies = strategies
+        self.priors = performance_data or {}
+        self.regimes = list(regimes)
+        self.halflife = halflife
+        self.decay = 0.5 ** (1.0 / halflife)
+        self.scoring = scoring
+        self.min_trades = min_trades
+        # (strategy, regime) -> [weight, sum_pnl, sum_pnl_sq, wins, n_trades]
+        self._stats: Dict[tuple, list] = {}
+        self.performance_data = {
+            name: {r: self.priors.get(name, {}).get(r, 0.0) for r in self.regimes} for name in strategies
+        }
+        self._best: Dict[str, str] = {}
+        for regime in self.regimes:
+            self._refresh(regime)
+
+    def _score(self, stats: list) -> float:
+        weight, s1, s2, wins, n = stats
+        if self.scoring == "hit_rate":
+            return wins / weight
+        mean = s1 / weight
+        var = max(s2 / weight - mean * mean, 0.0)
+        return mean / math.sqrt(var) if var > 0 else 0.0
+
+    def _refresh(self, regime: str) -> None:
+        best = max(self.strategies, key=lambda name: self.performance_data[name].get(regime, 0.0))
+        if self._best.get(regime) != best:
+            logger.info("Regime %s: best strategy is now %s", regime, best)
+            self._best[regime] = best
+
+    def record_trade(self, strategy_name: str, regime: str, pnl: float) -> None:
+        """
+        Fold one realized trade result into the (strategy, regime) score.
+        """
+        if strategy_name not in self.strategies:
+            raise KeyError(f"Unknown strategy {strategy_name}")
+        stats = self._stats.get((strategy_name, regime))
+        if stats is None:
+            stats = self._stats[(strategy_name, regime)] = [0.0, 0.0, 0.0, 0.0, 0]
+            if regime not in self._best:
+                self.regimes.append(regime)
+                for name in self.strategies:
+                    self.performance_data[name].setdefault(regime, self.priors.get(name, {}).get(regime, 0.0))
+                self._refresh(regime)
+        d = self.decay
+        stats[0] = stats[0] * d + 1.0
+        stats[1] = stats[1] * d + pnl
+        stats[2] = stats[2] * d + pnl * pnl
+        stats[3] = stats[3] * d + (pnl > 0)
+        stats[4] += 1
+        if stats[4] < self.min_trades:
+            return
+        score = self._score(stats)
+        if score != self.performance_data[strategy_name].get(regime):
+            self.performance_data[strategy_name][regime] = score
+            self._refresh(regime)
+
+    def select(self, regime: str) -> BaseStrategy:
+        """
+        Best strategy for `regime` (one lookup).
+        """
+        return self.strategies[self._best[regime]]
+
+    def select_strategy(self, regimes: pd.Series) -> BaseStrategy:
+        """
+        Pick the best strategy for the latest regime label in `regimes`.
+        """
+        return self.select(regimes.iloc[-1])
+
+    def select_for_batch(
+        self,
+        batch: RegimeBatch,
+        window: int,
+        threshold: Optional[float] = None
+    ) -> Dict[str, BaseStrategy]:
+        """
+        Best strategy per symbol for the latest bar of a batch regime detection.
+        """
+        k = batch._pair(window, threshold)
+        best = [self.strategies[self._best[REGIME_LABELS[c]]] for c in batch.codes[k, :, -1]]
+        return dict(zip(batch.symbols, best))
+
+    def get_state(self) -> Dict:
+        """
+        JSON-serializable snapshot of the learned statistics and settings.
+        """
+        return {
+            "halflife": self.halflife,
+            "scoring": self.scoring,
+            "min_trades": self.min_trades,
+            "stats": [[name, regime, *stats] for (name, regime), stats in self._stats.items()],
+        }
+
+    def set_state(self, state: Dict) -> None:
+        """
+        Restore statistics from `get_state`; entries for unknown strategies are dropped.
+        """
+        self.halflife = state["halflife"]
+        self.decay = 0.5 ** (1.0 / self.halflife)
+        self.scoring = state["scoring"]
+        self.min_trades = state["min_trades"]
+        self._stats = {}
+        self.performance_data = {
+            name: {r: self.priors.get(name, {}).get(r, 0.0) for r in self.regimes} for name in self.strategies
+        }
+        for name, regime, *stats in state["stats"]:
+            if name not in self.strategies:
+                continue
+            self._stats[(name, regime)] = [float(v) for v in stats[:4]] + [int(stats[4])]
+            if regime not in self.regimes:
+                self.regimes.append(regime)
+            if stats[4] >= self.min_trades:
+                self.performance_data[name][regime] = self._score(self._stats[(name, regime)])
+        self._best = {}
+        for regime in self.regimes:
+            for name in self.strategies:
+                self.performance_data[name].setdefault(regime, self.priors.get(name, {}).get(regime, 0.0))
+            self._refresh(regime)
+
+    def save(self, path: str) -> None:
+        """
+        Atomically write the state to a JSON file.
+        """
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as fh:
+            json.dump(self.get_state(), fh)
+        os.replace(tmp, path)
+
+    def load(self, path: str) -> bool:
+        """
+        Restore state from `save`; returns False if the file does not exist.
+        """
+        if not os.path.exists(path):
+            return False
+        with open(path) as fh:
+            self.set_state(json.load(fh))
+        return True
@@ -1,4 +1,5 @@
-from typing import List, Dict
+from typing import Any, List, Dict, Optional, Tuple
+import numpy as np
 import pandas as pd
 from src.strategy.base_strategy import BaseStrategy
 
@@ -80,3 +81,81 @@ class ExampleMomentumStrategy(BaseStrategy):
             prev = data.loc[ts]
 
         return signals
+
+    def required_features(self) -> List[str]:
+        return [f"ema_{self.span_short}", f"ema_{self.span_long}"]
+
+    def generate_signals_from_features(self, df: pd.DataFrame, features: Dict[str, np.ndarray]) -> List[Dict]:
+        """
+        Crossover on shared EMA arrays; same signals as `generate_signals`.
+        """
+        short = features[f"ema_{self.span_short}"]
+        long_ = features[f"ema_{self.span_long}"]
+        ts = pd.DatetimeIndex(df["timestamp"] if "timestamp" in df.columns else df.index)
+        buys = (short[:-1] < long_[:-1]) & (short[1:] > long_[1:])
+        sells = (short[:-1] > long_[:-1]) & (short[1:] < long_[1:])
+        return [
+            {"timestamp": ts[i + 1], "side": "buy" if buys[i] else "sell", "size": self.size}
+            for i in np.flatnonzero(buys | sells)
+        ]
+
+    def generate_signal_matrix(
+        self,
+        panel: Dict[str, np.ndarray],
+        index: pd.DatetimeIndex,
+        observed: np.ndarray
+    ) -> np.ndarray:
+        """
+        Vectorized crossover over a symbols x time close matrix.
+
+        EMAs run over each symbol's own bars only (forward-filled gaps are skipped),
+        so every row matches `generate_signals` on that symbol alone.
+        """
+        close = np.where(observed, panel["close"], np.nan).T
+        frame = pd.DataFrame(close)
+        short = frame.ewm(span=self.span_short, adjust=False, ignore_na=True).mean().to_numpy()
+        long_ = frame.ewm(span=self.span_long, adjust=False, ignore_na=True).mean().to_numpy()
+        diff = np.where(observed.T, short - long_, np.nan)
+        # Compare each bar with the symbol's previous printed bar.
+        prev = pd.DataFrame(diff).ffill().shift(1).to_numpy()
+        buys = (prev < 0) & (diff > 0)
+        sells = (prev > 0) & (diff < 0)
+        return (self.size * (buys.astype(float) - sells.astype(float))).T
+
+    def generate_signals_stream(
+        self,
+        df: pd.DataFrame,
+        state: Optional[Any] = None
+    ) -> Tuple[List[Dict], Any]:
+        """
+        Batch-at-a-time crossover; state is the last (ema_short, ema_long).
+
+        Each EMA is seeded by prepending the previous batch's final EMA, which
+        continues the adjust=False recursion exactly.
+        """
+        if df.empty:
+            return [], state
+        ts = pd.DatetimeIndex(df["timestamp"] if "timestamp" in df.columns else df.index)
+        close = df["close"].to_numpy(dtype=float)
+
+        def ema(span: int, seed: Optional[float]) -> np.ndarray:
+            values = close if seed is None else np.r_[seed, close]
+            out = pd.Series(values).ewm(span=span, adjust=False).mean().to_numpy()
+            return out if seed is None else out[1:]
+
+        short = ema(self.span_short, None if state is None else state[0])
+        long_ = ema(self.span_long, None if state is None else state[1])
+        if state is None:
+            prev_short, prev_long = short[:-1], long_[:-1]
+            cur_short, cur_long, stamps = short[1:], long_[1:], ts[1:]
+        else:
+            prev_short, prev_long = np.r_[state[0], short[:-1]], np.r_[state[1], long_[:-1]]
+            cur_short, cur_long, stamps = short, long_, ts
+
+        buys = (prev_short < prev_long) & (cur_short > cur_long)
+        sells = (prev_short > prev_long) & (cur_short < cur_long)
+        signals = [
+            {"timestamp": stamps[i], "side": "buy" if buys[i] else "sell", "size": self.size}
+            for i in np.flatnonzero(buys | sells)
+        ]
+        return signals, (float(short[-1]), float(long_[-1]))
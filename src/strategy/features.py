@@ -0,0 +1,45 @@
+"""
+Shared indicator features computed once per bar batch and reused by many strategies.
+
+Feature names:
+  - "close":          close prices
+  - "ret":            simple returns (0.0 on the first bar)
+  - "ema_{span}":     EMA of close (adjust=False), e.g. "ema_20"
+  - "vol_{window}":   rolling std of close (NaN during warm-up), e.g. "vol_30"
+"""
+
+from typing import Dict, Iterable
+
+import numpy as np
+import pandas as pd
+
+
+def compute_feature(close: pd.Series, name: str) -> np.ndarray:
+    """
+    Compute one named feature from a close series.
+    """
+    if name == "close":
+        return close.to_numpy(dtype=float)
+    if name == "ret":
+        return close.pct_change().fillna(0.0).to_numpy()
+    kind, _, arg = name.partition("_")
+    if kind == "ema" and arg.isdigit():
+        return close.ewm(span=int(arg), adjust=False).mean().to_numpy()
+    if kind == "vol" and arg.isdigit():
+        return close.rolling(int(arg)).std().to_numpy()
+    raise ValueError(f"Unknown feature {name!r}")
+
+
+def compute_features(df: pd.DataFrame, names: Iterable[str]) -> Dict[str, np.ndarray]:
+    """
+    Compute each distinct feature once.
+
+    Args:
+        df: OHLCV DataFrame with a 'close' column.
+        names: Feature names (duplicates are computed once).
+
+    Returns:
+        Mapping of feature name to a float array aligned with `df` rows.
+    """
+    close = df["close"].astype(float).reset_index(drop=True)
+    return {name: compute_feature(close, name) for name in dict.fromkeys(names)}
@@ -1,13 +1,49 @@
 """
 Detect market regimes based on rolling volatility.
+
+Regimes are encoded as int8 codes (LOW=0, HIGH=1) and exposed as categorical
+Series with REGIME_LABELS as categories. `detect_volatility_regimes` evaluates
+several (window, threshold) pairs at once, and `StreamingRegimeDetector` updates
+them bar by bar in O(1) per pair.
 """
 
 import logging
-from typing import List
+import math
+from collections import deque
+from typing import Dict, Sequence, Tuple
+
+import numpy as np
 import pandas as pd
 
 logger = logging.getLogger(__name__)
 
+LOW, HIGH = 0, 1
+REGIME_LABELS = ("low", "high")
+
+
+def _check_pairs(windows: Sequence[int], thresholds: Sequence[float]) -> Tuple[np.ndarray, np.ndarray]:
+    windows = np.asarray(windows, dtype=int)
+    thresholds = np.asarray(thresholds, dtype=float)
+    if windows.shape != thresholds.shape or windows.ndim != 1 or windows.size == 0:
+        raise ValueError("windows and thresholds must be non-empty sequences of equal length")
+    if (windows < 2).any():
+        raise ValueError("window must be at least 2")
+    return windows, thresholds
+
+
+def regime_codes(vols: np.ndarray, threshold: float) -> np.ndarray:
+    """
+    int8 regime codes from volatilities; NaN (warm-up) counts as zero volatility.
+    """
+    return (np.nan_to_num(vols, nan=0.0) >= threshold).astype(np.int8)
+
+
+def to_labels(codes: np.ndarray, index: pd.Index) -> pd.Series:
+    """
+    Categorical 'low'/'high' Series from int8 regime codes.
+    """
+    return pd.Series(pd.Categorical.from_codes(codes, categories=list(REGIME_LABELS)), index=index)
+
 
 def detect_volatility_regime(
     df: pd.DataFrame,
@@ -23,17 +59,254 @@ def detect_volatility_regime(
         threshold: Volatility threshold; std >= threshold → 'high', else 'low'.
 
     Returns:
-        pd.Series of regime labels ('high' or 'low'), indexed same as df.
+        Categorical pd.Series of regime labels ('high' or 'low'), indexed same as df.
     """
     if "close" not in df.columns:
         raise ValueError("DataFrame must contain a 'close' column")
 
-    logger.info(f"Computing rolling std over window={window}")
-    vols = df["close"].rolling(window=window).std().fillna(0.0)
-    regimes: List[str] = []
-    for v in vols:
-        regimes.append("high" if v >= threshold else "low")
+    logger.debug("Computing rolling std over window=%s", window)
+    vols = df["close"].rolling(window=window).std().to_numpy()
+    return to_labels(regime_codes(vols, threshold), df.index)
+
+
+def detect_volatility_regimes(
+    df: pd.DataFrame,
+    windows: Sequence[int],
+    thresholds: Sequence[float]
+) -> pd.DataFrame:
+    """
+    Regime codes for several (window, threshold) pairs in one pass.
+
+    The rolling std is computed once per distinct window and compared against all
+    of that window's thresholds at once.
+
+    Args:
+        df: DataFrame containing at least a 'close' column.
+        windows: Rolling window per pair.
+        thresholds: Volatility threshold per pair.
+
+    Returns:
+        int8 DataFrame of codes (LOW=0, HIGH=1) with (window, threshold) MultiIndex columns.
+    """
+    if "close" not in df.columns:
+        raise ValueError("DataFrame must contain a 'close' column")
+    windows, thresholds = _check_pairs(windows, thresholds)
+
+    close = df["close"]
+    out = np.empty((len(df), windows.size), dtype=np.int8)
+    for w in np.unique(windows):
+        cols = np.flatnonzero(windows == w)
+        vols = np.nan_to_num(close.rolling(window=int(w)).std().to_numpy(), nan=0.0)
+        out[:, cols] = vols[:, None] >= thresholds[cols]
+    columns = pd.MultiIndex.from_arrays([windows, thresholds], names=["window", "threshold"])
+    return pd.DataFrame(out, index=df.index, columns=columns)
+
+
+class StreamingRegimeDetector:
+    """
+    Bar-by-bar regime detection with rolling Welford variance per window.
+
+    Each window keeps its last `w` closes plus a running mean and sum of squared
+    deviations, updated in O(1) per bar when one value enters and one leaves.
+    Results match `detect_volatility_regimes` up to floating-point rounding.
+    """
+
+    def __init__(
+        self,
+        windows: Sequence[int],
+        thresholds: Sequence[float],
+        resync_every: int = 100_000
+    ):
+        """
+        Args:
+            windows: Rolling window per (window, threshold) pair.
+            thresholds: Volatility threshold per pair.
+            resync_every: Bars between exact recomputations, which bound rounding drift.
+        """
+        self.windows, self.thresholds = _check_pairs(windows, thresholds)
+        self.resync_every = resync_every
+        self._distinct = [int(w) for w in np.unique(self.windows)]
+        self._cols = {w: np.flatnonzero(self.windows == w) for w in self._distinct}
+        self._buffers: Dict[int, deque] = {w: deque(maxlen=w) for w in self._distinct}
+        self._mean = {w: 0.0 for w in self._distinct}
+        self._m2 = {w: 0.0 for w in self._distinct}
+        self._vols = np.zeros(self.windows.size)
+        self.codes = (self._vols >= self.thresholds).astype(np.int8)
+        self.count = 0
+
+    def _resync(self, w: int) -> None:
+        values = np.fromiter(self._buffers[w], dtype=float)
+        self._mean[w] = float(values.mean())
+        self._m2[w] = float(((values - values.mean()) ** 2).sum())
+
+    def update(self, close: float) -> np.ndarray:
+        """
+        Add one close.
+
+        Returns:
+            int8 codes per (window, threshold) pair after this bar.
+        """
+        self.count += 1
+        for w in self._distinct:
+            buf = self._buffers[w]
+            mean, m2 = self._mean[w], self._m2[w]
+            if len(buf) < w:
+                buf.append(close)
+                n = len(buf)
+                delta = close - mean
+                mean += delta / n
+                m2 += delta * (close - mean)
+            else:
+                old = buf[0]
+                buf.append(close)
+                new_mean = mean + (close - old) / w
+                m2 += (close - old) * (close - new_mean + old - mean)
+                mean = new_mean
+            self._mean[w], self._m2[w] = mean, max(m2, 0.0)
+            if self.count % self.resync_every == 0:
+                self._resync(w)
+            vol = math.sqrt(self._m2[w] / (w - 1)) if len(buf) == w else 0.0
+            self._vols[self._cols[w]] = vol
+        self.codes = (self._vols >= self.thresholds).astype(np.int8)
+        return self.codes
+
+    def labels(self) -> Dict[Tuple[int, float], str]:
+        """
+        Current regime label per (window, threshold) pair.
+        """
+        return {
+            (int(w), float(t)): REGIME_LABELS[c]
+            for w, t, c in zip(self.windows, self.thresholds, self.codes)
+        }
+
+
+def rolling_std_matrix(close: np.ndarray, windows: Sequence[int]) -> np.ndarray:
+    """
+    Rolling sample std (ddof=1) of every row for several windows via cumulative sums.
+
+    Each row is centered on its own mean before accumulating, which keeps the
+    sum-of-squares cancellation small for price-level data. Windows that contain
+    NaNs (e.g. before a symbol lists) are NaN.
+
+    Args:
+        close: symbols x time float array.
+        windows: Window sizes.
+
+    Returns:
+        windows x symbols x time float array.
+    """
+    close = np.asarray(close, dtype=float)
+    if close.ndim != 2:
+        raise ValueError("close must be a 2D symbols x time array")
+    n_sym, n_t = close.shape
+    valid = np.isfinite(close)
+    with np.errstate(invalid="ignore"):
+        center = np.nanmean(np.where(valid, close, np.nan), axis=1, keepdims=True)
+    x = np.where(valid, close - np.nan_to_num(center), 0.0)
+
+    zeros = np.zeros((n_sym, 1))
+    s1 = np.concatenate([zeros, np.cumsum(x, axis=1)], axis=1)
+    s2 = np.concatenate([zeros, np.cumsum(x * x, axis=1)], axis=1)
+    cnt = np.concatenate([zeros, np.cumsum(valid, axis=1)], axis=1)
+
+    out = np.full((len(windows), n_sym, n_t), np.nan)
+    for k, w in enumerate(windows):
+        if w > n_t:
+            continue
+        sum1 = s1[:, w:] - s1[:, :-w]
+        sum2 = s2[:, w:] - s2[:, :-w]
+        full = (cnt[:, w:] - cnt[:, :-w]) == w
+        var = (sum2 - sum1 * sum1 / w) / (w - 1)
+        # Cancellation noise on flat windows must not turn into positive volatility.
+        var[var <= 1e-12 * sum2 / w] = 0.0
+        out[k, :, w - 1:] = np.where(full, np.sqrt(np.maximum(var, 0.0)), np.nan)
+    return out
+
+
+class RegimeBatch:
+    """
+    Regime codes for a symbol universe: an int8 (pair x symbol x time) array with labels.
+    """
+
+    def __init__(
+        self,
+        codes: np.ndarray,
+        vols: np.ndarray,
+        symbols: Sequence[str],
+        index: pd.Index,
+        windows: np.ndarray,
+        thresholds: np.ndarray
+    ):
+        self.codes = codes
+        self.vols = vols
+        self.symbols = list(symbols)
+        self.index = index
+        self.windows = windows
+        self.thresholds = thresholds
+        self._sym_pos = {s: i for i, s in enumerate(self.symbols)}
+        self._pair_pos = {(int(w), float(t)): k for k, (w, t) in enumerate(zip(windows, thresholds))}
+
+    def _pair(self, window: int, threshold: float = None) -> int:
+        if threshold is None:
+            matches = np.flatnonzero(self.windows == window)
+            if matches.size != 1:
+                raise KeyError(f"window {window} needs a threshold to disambiguate")
+            return int(matches[0])
+        return self._pair_pos[(int(window), float(threshold))]
+
+    def codes_for(self, symbol: str, window: int, threshold: float = None) -> np.ndarray:
+        """
+        int8 codes over time for one symbol and (window, threshold) pair.
+        """
+        return self.codes[self._pair(window, threshold), self._sym_pos[symbol]]
+
+    def series(self, symbol: str, window: int, threshold: float = None) -> pd.Series:
+        """
+        Categorical 'low'/'high' Series, as returned by `detect_volatility_regime`.
+        """
+        return to_labels(self.codes_for(symbol, window, threshold), self.index)
+
+    def current(self) -> pd.DataFrame:
+        """
+        Latest label per symbol (rows) and (window, threshold) pair (columns).
+        """
+        labels = np.asarray(REGIME_LABELS)[self.codes[:, :, -1].T]
+        columns = pd.MultiIndex.from_arrays([self.windows, self.thresholds], names=["window", "threshold"])
+        return pd.DataFrame(labels, index=self.symbols, columns=columns)
+
+
+def detect_volatility_regimes_batch(
+    close,
+    windows: Sequence[int],
+    thresholds: Sequence[float],
+    symbols: Sequence[str] = None,
+    index: pd.Index = None
+) -> RegimeBatch:
+    """
+    Volatility regimes for all symbols and (window, threshold) pairs in one 2D pass.
+
+    Args:
+        close: time x symbols DataFrame (symbols as columns), or a symbols x time
+            array such as `align_frames(...)[2]["close"]`.
+        windows: Rolling window per pair.
+        thresholds: Volatility threshold per pair.
+        symbols: Symbol names for an array input (default: "0", "1", ...).
+        index: Time index for an array input (default: RangeIndex).
+
+    Returns:
+        RegimeBatch; warm-up and missing bars count as zero volatility, as in
+        `detect_volatility_regime`.
+    """
+    windows, thresholds = _check_pairs(windows, thresholds)
+    if isinstance(close, pd.DataFrame):
+        symbols, index = [str(c) for c in close.columns], close.index
+        matrix = close.to_numpy(dtype=float).T
+    else:
+        matrix = np.asarray(close, dtype=float)
+        symbols = list(symbols) if symbols is not None else [str(i) for i in range(matrix.shape[0])]
+        index = index if index is not None else pd.RangeIndex(matrix.shape[1])
 
-    series = pd.Series(regimes, index=df.index)
-    logger.info("Regime detection complete")
-    return series
+    distinct, inverse = np.unique(windows, return_inverse=True)
+    vols = rolling_std_matrix(matrix, distinct)[inverse]
+    codes = (np.nan_to_num(vols, nan=0.0) >= thresholds[:, None, None]).astype(np.int8)
+    return RegimeBatch(codes, vols, symbols, index, windows, thresholds)
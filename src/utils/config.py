@@ -3,8 +3,20 @@ import os
 class Config:
     EXCHANGE_ID    = os.getenv("EXCHANGE_ID", "binance")
     SYMBOL         = os.getenv("SYMBOL", "BTC/USDT")
+    SYMBOLS        = [s.strip() for s in os.getenv("SYMBOLS", SYMBOL).split(",") if s.strip()]
     TIMEFRAME      = os.getenv("TIMEFRAME", "1m")
     BOT_MODE       = os.getenv("BOT_MODE", "paper")
     MAX_RISK       = float(os.getenv("MAX_RISK_PER_TRADE", "0.01"))
+    LEVERAGE       = float(os.getenv("LEVERAGE", "10"))
+    MARGIN_MODE    = os.getenv("MARGIN_MODE", "isolated")
+    DEFAULT_MARKET_TYPE = os.getenv("DEFAULT_MARKET_TYPE", "spot")
+    CHECKPOINT_PATH = os.getenv("CHECKPOINT_PATH")
+    LIVE_CHECKPOINT_PATH = os.getenv("LIVE_CHECKPOINT_PATH")  # kept apart so paper state never restores into live
+    MAX_ORDER_NOTIONAL  = float(os.environ["MAX_ORDER_NOTIONAL"]) if os.getenv("MAX_ORDER_NOTIONAL") else None
+    MAX_SYMBOL_NOTIONAL = float(os.environ["MAX_SYMBOL_NOTIONAL"]) if os.getenv("MAX_SYMBOL_NOTIONAL") else None
+    MAX_GROSS_NOTIONAL  = float(os.environ["MAX_GROSS_NOTIONAL"]) if os.getenv("MAX_GROSS_NOTIONAL") else None
+    MAX_ORDERS_PER_SEC  = float(os.environ["MAX_ORDERS_PER_SEC"]) if os.getenv("MAX_ORDERS_PER_SEC") else None
+    MAX_DRAWDOWN        = float(os.environ["MAX_DRAWDOWN"]) if os.getenv("MAX_DRAWDOWN") else None
+    CAPITAL             = float(os.getenv("CAPITAL", "10000"))
     API_KEY        = os.getenv("API_KEY")
     API_SECRET     = os.getenv("API_SECRET")
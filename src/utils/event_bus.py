@@ -0,0 +1,71 @@
+"""
+In-process asyncio event bus: topic-based fan-out to subscriber queues.
+"""
+
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Any, Dict, List
+
+logger = logging.getLogger(__name__)
+
+
+class EventBus:
+    """
+    Publishes events to every queue subscribed to a topic.
+
+    Overflow policy for bounded queues: `publish` never blocks and, when a subscriber
+    queue is full, drops its oldest event (counted in `dropped` and logged), so it
+    suits lossy streams such as quotes. `publish_wait` applies backpressure instead:
+    it waits for room, so the producer slows to the consumer's pace and nothing is
+    lost. Streams whose consumers must see every event (e.g. bars) use `publish_wait`.
+    """
+
+    def __init__(self, maxsize: int = 0):
+        """
+        Args:
+            maxsize: Per-subscriber queue bound (0 = unbounded).
+        """
+        self.maxsize = maxsize
+        self._subscribers: Dict[str, List[asyncio.Queue]] = defaultdict(list)
+        self.dropped: int = 0
+
+    def subscribe(self, topic: str) -> asyncio.Queue:
+        """
+        Register a new subscriber queue for `topic`.
+
+        Returns:
+            The queue that will receive events published on `topic`.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.maxsize)
+        self._subscribers[topic].append(queue)
+        return queue
+
+    def publish(self, topic: str, event: Any) -> int:
+        """
+        Deliver `event` to every subscriber of `topic`.
+
+        Returns:
+            Number of subscribers the event was delivered to.
+        """
+        queues = self._subscribers.get(topic, ())
+        for queue in queues:
+            if queue.full():
+                queue.get_nowait()
+                queue.task_done()
+                self.dropped += 1
+                logger.warning("Event bus dropped oldest event on topic %s", topic)
+            queue.put_nowait(event)
+        return len(queues)
+
+    async def publish_wait(self, topic: str, event: Any) -> int:
+        """
+        Deliver `event` to every subscriber of `topic`, waiting while a queue is full.
+
+        Returns:
+            Number of subscribers the event was delivered to.
+        """
+        queues = list(self._subscribers.get(topic, ()))
+        for queue in queues:
+            await queue.put(event)
+        return len(queues)
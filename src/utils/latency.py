@@ -0,0 +1,100 @@
+"""
+Latency tracking: bounded sample windows with percentile summaries.
+"""
+
+import time
+from collections import deque
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+
+def latency_summary(values: Iterable[float]) -> Dict[str, Optional[float]]:
+    """
+    Summarize latency samples (milliseconds).
+
+    Returns:
+        Dict with keys: count, mean, p50, p99, p999, max (None when empty).
+    """
+    arr = np.fromiter(values, dtype=float)
+    if arr.size == 0:
+        return {"count": 0, "mean": None, "p50": None, "p99": None, "p999": None, "max": None}
+    p50, p99, p999 = np.percentile(arr, [50, 99, 99.9])
+    return {
+        "count": int(arr.size),
+        "mean": float(arr.mean()),
+        "p50": float(p50),
+        "p99": float(p99),
+        "p999": float(p999),
+        "max": float(arr.max()),
+    }
+
+
+class LatencyTracker:
+    """
+    Keeps the most recent latency samples (in milliseconds) and summarizes them.
+    """
+
+    def __init__(self, max_samples: int = 10_000):
+        """
+        Args:
+            max_samples: Number of most recent samples retained for percentiles.
+        """
+        if max_samples <= 0:
+            raise ValueError("max_samples must be positive")
+        self._samples: deque = deque(maxlen=max_samples)
+        self.count: int = 0
+        self.max_ms: float = 0.0
+
+    def record(self, value_ms: float) -> None:
+        """
+        Record one latency sample.
+
+        Args:
+            value_ms: Observed latency in milliseconds.
+        """
+        self._samples.append(value_ms)
+        self.count += 1
+        if value_ms > self.max_ms:
+            self.max_ms = value_ms
+
+    def record_since(self, start: float) -> float:
+        """
+        Record the time elapsed since a `time.perf_counter()` reading.
+
+        Args:
+            start: Earlier `time.perf_counter()` value.
+
+        Returns:
+            The recorded latency in milliseconds.
+        """
+        elapsed_ms = (time.perf_counter() - start) * 1000.0
+        self.record(elapsed_ms)
+        return elapsed_ms
+
+    def percentile(self, q: float) -> Optional[float]:
+        """
+        Percentile of the retained samples.
+
+        Args:
+            q: Percentile in [0, 100], e.g. 99.9.
+
+        Returns:
+            The percentile in milliseconds, or None if no samples were recorded.
+        """
+        if not self._samples:
+            return None
+        return float(np.percentile(np.fromiter(self._samples, dtype=float), q))
+
+    def summary(self) -> Dict[str, Optional[float]]:
+        """
+        Summarize retained samples.
+
+        Returns:
+            Dict with keys: count, mean, p50, p99, p999, max (milliseconds).
+        """
+        summary = latency_summary(self._samples)
+        if summary["count"]:
+            summary["count"] = self.count
+            summary["max"] = self.max_ms
+        return summary
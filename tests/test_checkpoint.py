@@ -0,0 +1,45 @@
+import numpy as np
+
+from src.data.ring_buffer import OHLCVRingBuffer
+from src.paper_trading.checkpoint import Checkpointer, load_checkpoint, save_checkpoint
+from src.strategy.ensemble import OnlineEnsembleManager
+
+
+class Named:
+    def __init__(self, name):
+        self.name = name
+
+
+def test_round_trip_arrays_and_json(tmp_path):
+    path = str(tmp_path / "ckpt.npz")
+    save_checkpoint(path, {"a": {"x": np.arange(5.0), "n": 3, "tags": ["p", "q"]}, "b": {"flag": None}})
+    states = load_checkpoint(path)
+    np.testing.assert_array_equal(states["a"]["x"], np.arange(5.0))
+    assert states["a"]["n"] == 3 and states["a"]["tags"] == ["p", "q"]
+    assert states["b"] == {"flag": None}
+    assert load_checkpoint(str(tmp_path / "missing.npz")) is None
+
+
+def test_corrupt_checkpoint_is_ignored(tmp_path):
+    path = tmp_path / "ckpt.npz"
+    path.write_bytes(b"not a zip")
+    assert load_checkpoint(str(path)) is None
+
+
+def test_checkpointer_restores_components(tmp_path):
+    buf = OHLCVRingBuffer(4)
+    buf.extend([[i * 60_000, 1, 2, 0, 1.5, 3] for i in range(6)])
+    ensemble = OnlineEnsembleManager({"A": Named("A"), "B": Named("B")}, min_trades=1)
+    ensemble.record_trade("B", "high", 2.0)
+    ensemble.record_trade("B", "high", 1.0)
+    ckpt = Checkpointer(str(tmp_path / "c.npz"), {"bars": buf, "ensemble": ensemble}, every_s=3600)
+    assert not ckpt.maybe_save()
+    ckpt.save()
+
+    buf2 = OHLCVRingBuffer(4)
+    ensemble2 = OnlineEnsembleManager({"A": Named("A"), "B": Named("B")}, min_trades=1)
+    Checkpointer(ckpt.path, {"bars": buf2, "ensemble": ensemble2}).restore()
+    np.testing.assert_array_equal(buf2.view(), buf.view())
+    assert buf2.last_ts == buf.last_ts
+    assert ensemble2.performance_data == ensemble.performance_data
+    assert ensemble2.select("high").name == "B"
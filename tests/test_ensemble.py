@@ -1,7 +1,11 @@
+import numpy as np
 import pandas as pd
 
 import pytest
-from src.strategy.ensemble import EnsembleManager
+from src.strategy.base_strategy import BaseStrategy
+from src.strategy.ensemble import EnsembleManager, OnlineEnsembleManager, evaluate_members
+from src.strategy.example_momentum import ExampleMomentumStrategy
+from src.strategy.regime_detector import detect_volatility_regimes_batch
 
 
 class DummyStrategy:
@@ -9,6 +13,13 @@ class DummyStrategy:
         self.name = name
 
 
+class PlainStrategy(BaseStrategy):
+    """Member without feature support: falls back to generate_signals."""
+
+    def generate_signals(self, df):
+        return [{"timestamp": df.index[-1], "side": "buy", "size": 1.0}]
+
+
 @pytest.fixture
 def strategies():
     return {
@@ -38,3 +49,100 @@ def test_select_strategy_low_regime(strategies, performance_data):
     regimes = pd.Series(["high", "low", "low"])
     selected = manager.select_strategy(regimes)
     assert selected.name == "B"
+
+
+def test_online_scores_drive_selection(strategies):
+    manager = OnlineEnsembleManager(strategies, halflife=20, min_trades=3)
+    rng = np.random.default_rng(0)
+    for _ in range(50):
+        manager.record_trade("A", "high", rng.normal(1.0, 1.0))
+        manager.record_trade("B", "high", rng.normal(-0.5, 1.0))
+        manager.record_trade("A", "low", rng.normal(-0.5, 1.0))
+        manager.record_trade("B", "low", rng.normal(0.5, 1.0))
+    assert manager.select("high").name == "A"
+    assert manager.select("low").name == "B"
+    assert manager.select_strategy(pd.Series(["low", "high"])).name == "A"
+
+
+def test_online_decay_tracks_recent_results(strategies):
+    manager = OnlineEnsembleManager(strategies, scoring="hit_rate", halflife=5, min_trades=1)
+    for _ in range(30):
+        manager.record_trade("A", "low", 1.0)
+        manager.record_trade("B", "low", -1.0)
+    assert manager.select("low").name == "A"
+    for _ in range(30):
+        manager.record_trade("A", "low", -1.0)
+        manager.record_trade("B", "low", 1.0)
+    assert manager.select("low").name == "B"
+    assert manager.performance_data["B"]["low"] > 0.9
+
+
+def test_online_priors_until_min_trades(strategies, performance_data):
+    manager = OnlineEnsembleManager(strategies, performance_data, min_trades=5)
+    assert manager.select("low").name == "B"
+    for _ in range(4):
+        manager.record_trade("B", "low", -1.0)
+    assert manager.select("low").name == "B"
+
+
+def test_online_state_round_trip(tmp_path, strategies):
+    manager = OnlineEnsembleManager(strategies, scoring="hit_rate", min_trades=2)
+    for pnl in (1.0, 2.0, -1.0):
+        manager.record_trade("A", "high", pnl)
+        manager.record_trade("B", "high", -pnl)
+    manager.record_trade("B", "sideways", 1.0)
+    path = str(tmp_path / "ensemble.json")
+    manager.save(path)
+
+    restored = OnlineEnsembleManager(strategies, scoring="hit_rate", min_trades=2)
+    assert restored.load(path)
+    assert restored.performance_data == manager.performance_data
+    assert restored.select("high").name == manager.select("high").name
+    restored.record_trade("A", "high", 1.0)
+    manager.record_trade("A", "high", 1.0)
+    assert restored.performance_data["A"]["high"] == pytest.approx(manager.performance_data["A"]["high"])
+    assert not OnlineEnsembleManager(strategies).load(str(tmp_path / "missing.json"))
+
+
+def test_select_for_batch(strategies, performance_data):
+    close = pd.DataFrame({"X": [1.0, 1.0, 1.0, 1.0], "Y": [1.0, 5.0, 1.0, 5.0]})
+    batch = detect_volatility_regimes_batch(close, [3], [1.0])
+    manager = OnlineEnsembleManager(strategies, performance_data)
+    chosen = manager.select_for_batch(batch, 3)
+    assert chosen["X"].name == "B"  # low volatility
+    assert chosen["Y"].name == "A"  # high volatility
+
+
+@pytest.fixture
+def bars():
+    idx = pd.date_range("2021-01-01", periods=3000, freq="min", name="timestamp")
+    close = 100 * np.exp(np.cumsum(np.random.default_rng(3).normal(0, 0.002, len(idx))))
+    return pd.DataFrame({"timestamp": idx, "close": close}, index=idx)
+
+
+@pytest.mark.parametrize("mode", ["serial", "thread", "process"])
+def test_evaluate_members_matches_individual_runs(bars, mode):
+    members = {
+        f"mom_{s}_{l}": ExampleMomentumStrategy(span_short=s, span_long=l)
+        for s, l in [(5, 20), (5, 50), (10, 20), (10, 50)]
+    }
+    members["plain"] = PlainStrategy()
+    result = EnsembleManager(members).evaluate_all(bars, mode=mode, max_workers=2)
+    assert set(result["members"]) == set(members)
+    for name, strat in members.items():
+        out = result["members"][name]
+        assert out["signals"] == strat.generate_signals(bars)
+        assert out["elapsed_ms"] >= 0
+    assert result["features_ms"] >= 0 and result["wall_ms"] >= result["features_ms"]
+
+
+def test_evaluate_members_reuses_executor(bars):
+    from concurrent.futures import ThreadPoolExecutor
+
+    members = {"a": ExampleMomentumStrategy(span_short=3, span_long=8)}
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        first = evaluate_members(members, bars, executor=pool)
+        second = evaluate_members(members, bars.iloc[:1000], executor=pool)
+    assert first["members"]["a"]["signals"][:1] == second["members"]["a"]["signals"][:1]
+    with pytest.raises(ValueError):
+        evaluate_members(members, bars, mode="gpu")
@@ -1,6 +1,14 @@
+import json
+import threading
+import time
+
 import pytest
 from src.paper_trading.simulator import PaperExchangeSimulator
-from src.paper_trading.failure_drills import drill_exchange_down, drill_partial_fill_analysis
+from src.paper_trading.failure_drills import (
+    drill_exchange_down,
+    drill_partial_fill_analysis,
+    drill_order_throughput,
+)
 
 class StubSimulator:
     def __init__(self, responses):
@@ -45,3 +53,56 @@ def test_drill_partial_fill_analysis():
     assert pytest.approx(results[0]["filled_ratio"]) == 0.5
     assert pytest.approx(results[1]["filled_ratio"]) == 1.0
     assert "error" in results[2]
+
+
+class FlakyClient:
+    """Fails every `every`-th call."""
+    def __init__(self, every=4, delay=0.0):
+        self.every = every
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def create_order(self, **order):
+        with self._lock:
+            self.calls += 1
+            n = self.calls
+        if self.delay:
+            time.sleep(self.delay)
+        if n % self.every == 0:
+            raise Exception("flaky")
+        return {"filled": order["amount"], "status": "closed"}
+
+
+ORDER = {"symbol": "BTC/USDT", "type": "MARKET", "side": "buy", "amount": 1.0, "price": 100.0}
+
+
+@pytest.mark.parametrize("mode", ["thread", "asyncio"])
+def test_drill_order_throughput_report(mode, tmp_path):
+    client = FlakyClient(every=4)
+    out = tmp_path / "report.json"
+    report = drill_order_throughput(client, ORDER, n_orders=200, concurrency=4, mode=mode,
+                                    max_retries=2, report_path=str(out))
+
+    assert report["succeeded"] + report["failed"] == 200
+    assert report["succeeded"] > 0
+    assert report["attempts"] == client.calls
+    assert report["retry_amplification"] > 1.0
+    assert report["submit_latency_ms"]["p999"] >= report["submit_latency_ms"]["p50"]
+    assert json.loads(out.read_text())["attempts"] == report["attempts"]
+
+
+def test_drill_order_throughput_backpressure_sheds():
+    client = FlakyClient(every=10**9, delay=0.05)
+    report = drill_order_throughput(client, ORDER, n_orders=8, concurrency=8,
+                                    max_in_flight=1, queue_timeout_s=0.01)
+    assert report["backpressure"]["peak_in_flight"] == 1
+    assert report["backpressure"]["shed"] > 0
+    assert report["succeeded"] + report["backpressure"]["shed"] == 8
+
+
+def test_drill_order_throughput_simulator():
+    sim = PaperExchangeSimulator(error_rate=0.0)
+    report = drill_order_throughput(sim, ORDER, n_orders=50, concurrency=2)
+    assert report["failed"] == 0
+    assert report["retry_amplification"] == 1.0
@@ -0,0 +1,139 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.backtesting.backtester import Backtester
+from src.backtesting.futures import liquidation_price, round_trip_pnls, simulate_futures
+
+
+def _bars(close, low=None, high=None):
+    idx = pd.date_range("2021-01-01", periods=len(close), freq="h")
+    close = np.asarray(close, dtype=float)
+    return pd.DataFrame({
+        "close": close,
+        "low": close if low is None else low,
+        "high": close if high is None else high,
+    }, index=idx)
+
+
+def test_liquidation_price_formula():
+    assert liquidation_price(100.0, 1, 10, 0.005) == pytest.approx(100 * 0.9 / 0.995)
+    assert liquidation_price(100.0, -1, 10, 0.005) == pytest.approx(100 * 1.1 / 1.005)
+    assert np.isnan(liquidation_price(100.0, 0, 10, 0.005))
+
+
+def test_mark_to_market_without_liquidation():
+    bars = _bars([100, 101, 103, 102])
+    out = simulate_futures(bars, [1, 1, -1, -1], fee_rate=0.001, initial_capital=1000.0)
+    assert out["pnl"].tolist() == pytest.approx([0, 1, 2, 1])
+    assert out["fees"].tolist() == pytest.approx([0.1, 0, 0.206, 0])
+    assert out["equity"].iloc[-1] == pytest.approx(1000 + 4 - 0.306)
+    assert not out["liquidated"].any()
+
+
+def test_isolated_long_liquidated_on_wick_loses_margin():
+    bars = _bars([100, 100, 100, 100], low=[100, 100, 80, 100])
+    out = simulate_futures(bars, [1, 1, 1, 1], leverage=10, fee_rate=0.0)
+    assert out["liquidated"].tolist() == [False, False, True, False]
+    assert out["position"].tolist() == [1, 1, 0, 0]
+    assert out["pnl"].iloc[2] == pytest.approx(-10.0)  # the isolated margin
+    assert out["equity"].iloc[-1] == pytest.approx(10_000 - 10.0)
+    # A fresh position after the liquidated segment is margined again.
+    out = simulate_futures(bars, [1, 1, 1, 2], leverage=10, fee_rate=0.0)
+    assert out["position"].tolist() == [1, 1, 0, 2]
+
+
+def test_isolated_short_liquidated_on_high():
+    bars = _bars([100, 100, 100], high=[100, 120, 100])
+    out = simulate_futures(bars, [-2, -2, -2], leverage=5, fee_rate=0.0)
+    assert out["liquidated"].iloc[1]
+    assert out["pnl"].iloc[1] == pytest.approx(-2 * 100 / 5)
+
+
+def test_isolated_averaging_down_margins_at_average_entry():
+    bars = _bars([100, 95, 96, 96], low=[100, 95, 96, 87])
+    out = simulate_futures(bars, [1, 2, 1, 1], leverage=10, fee_rate=0.0)
+    # Adding 1 @ 95 to 1 @ 100 averages to 97.5; the reduction keeps that entry.
+    liq = 97.5 * 0.9 / 0.995
+    assert out["liquidation_price"].iloc[:3].tolist() == pytest.approx([100 * 0.9 / 0.995, liq, liq])
+    assert out["margin_used"].iloc[:3].tolist() == pytest.approx([10.0, 19.5, 9.75])
+    # Re-margining at 96 would put the liquidation below the 87 wick.
+    assert out["liquidated"].tolist() == [False, False, False, True]
+    # Sold 1 @ 96 against the 97.5 average, then lost the remaining margin.
+    assert out["equity"].iloc[-1] == pytest.approx(10_000 - 1.5 - 9.75)
+    flipped = simulate_futures(bars.iloc[:3], [1, 2, -1], leverage=10, fee_rate=0.0)
+    assert flipped["liquidation_price"].iloc[2] == pytest.approx(96 * 1.1 / 1.005)
+
+
+def test_funding_accrues_at_funding_timestamps():
+    bars = _bars([100] * 5)
+    funding = pd.Series(
+        [0.001, -0.002],
+        index=[bars.index[2], bars.index[3] + pd.Timedelta(minutes=30)],
+    )
+    out = simulate_futures(bars, [1] * 5, fee_rate=0.0, funding_rates=funding)
+    assert out["funding"].tolist() == pytest.approx([0, 0, 0.1, 0, -0.2])
+    assert out["equity"].iloc[-1] == pytest.approx(10_000 + 0.1)
+
+
+def test_cross_margin_breach_wipes_account():
+    bars = _bars([100, 100, 100], low=[100, 80, 100])
+    out = simulate_futures(bars, [5, 5, 5], margin_mode="cross", initial_capital=100.0)
+    assert out["liquidated"].tolist() == [False, True, False]
+    assert out["equity"].iloc[1:].tolist() == pytest.approx([0.0, 0.0])
+    assert out["position"].iloc[1:].tolist() == [0, 0]
+    # Same wick with more collateral survives.
+    safe = simulate_futures(bars, [5, 5, 5], margin_mode="cross", initial_capital=1000.0)
+    assert not safe["liquidated"].any()
+
+
+def test_invalid_inputs():
+    bars = _bars([100, 100])
+    with pytest.raises(ValueError):
+        simulate_futures(bars, [1, 1], margin_mode="portfolio")
+    with pytest.raises(ValueError):
+        simulate_futures(bars, [1])
+
+
+def test_round_trip_pnls_split_flips_and_skip_open_trade():
+    bars = _bars([100, 110, 105, 95, 100])
+    account = simulate_futures(bars, [1, 1, -1, 0, 2], leverage=5.0, fee_rate=0.001)
+    pnls = round_trip_pnls(account)
+    # Long 100 -> 105 (entry fee 0.1, half the flip fee 0.105), short 105 -> 95
+    # (other half of the flip fee, exit fee 0.095); the final long is still open.
+    assert pnls == pytest.approx([5 - 0.1 - 0.105, 10 - 0.105 - 0.095])
+    realized = account["equity"].iloc[3] - 10_000.0
+    assert pnls.sum() == pytest.approx(realized)
+
+
+def test_backtester_run_futures():
+    bars = _bars([100, 110, 120, 120])
+
+    class Strategy:
+        def generate_signals(self, df):
+            return [
+                {"timestamp": df.index[0], "side": "buy", "size": 1},
+                {"timestamp": df.index[2], "side": "sell", "size": 1},
+            ]
+
+    class Cfg:
+        LEVERAGE = 5.0
+        MARGIN_MODE = "isolated"
+
+    result = Backtester(Strategy(), bars, Cfg()).run_futures(fee_rate=0.0)
+    assert result["pnl"] == pytest.approx(20.0)
+    assert result["trades"] == 2
+    assert result["liquidations"] == 0
+    assert result["metrics"]["n_trades"] == 1
+    assert result["metrics"]["win_rate"] == pytest.approx(1.0)
+
+
+def test_backtester_run_futures_rejects_unknown_signal_timestamp():
+    bars = _bars([100, 110, 120, 120])
+
+    class Strategy:
+        def generate_signals(self, df):
+            return [{"timestamp": pd.Timestamp("2030-01-01"), "side": "buy", "size": 1}]
+
+    with pytest.raises(KeyError):
+        Backtester(Strategy(), bars, object()).run_futures()
@@ -0,0 +1,97 @@
+import ccxt
+import pytest
+
+from src.paper_trading.matching_engine import MatchingEngine
+from src.paper_trading.simulator import PaperExchangeSimulator
+
+SYM = "BTC/USDT"
+
+
+@pytest.fixture
+def engine():
+    return MatchingEngine(clock=lambda: 1_600_000_000_000)
+
+
+def test_price_time_priority(engine):
+    first = engine.create_order(SYM, "limit", "sell", 1.0, 101.0)
+    second = engine.create_order(SYM, "limit", "sell", 1.0, 101.0)
+    better = engine.create_order(SYM, "limit", "sell", 1.0, 100.5)
+
+    taker = engine.create_order(SYM, "limit", "buy", 1.5, 101.0)
+    assert taker["status"] == "closed"
+    assert [t["price"] for t in taker["trades"]] == [100.5, 101.0]
+    assert taker["average"] == pytest.approx((100.5 + 101.0 * 0.5) / 1.5)
+
+    # Best price filled first, then the earlier order at 101
+    assert better["id"] not in engine.open_orders
+    assert engine.fetch_order(first["id"])["remaining"] == pytest.approx(0.5)
+    assert engine.fetch_order(second["id"])["filled"] == 0.0
+    assert engine.fetch_order_book(SYM)["asks"] == [[101.0, 1.5]]
+
+
+def test_market_order_sweeps_and_cancels_remainder(engine):
+    engine.create_order(SYM, "limit", "buy", 1.0, 99.0)
+    order = engine.create_order(SYM, "MARKET", "sell", 3.0)
+    assert order["filled"] == pytest.approx(1.0)
+    assert order["status"] == "canceled"
+    assert order["trades"][0]["takerOrMaker"] == "taker"
+    assert engine.fetch_order_book(SYM)["bids"] == []
+
+
+def test_ioc_and_post_only(engine):
+    engine.create_order(SYM, "limit", "sell", 1.0, 100.0)
+    ioc = engine.create_order(SYM, "limit", "buy", 2.0, 100.0, {"timeInForce": "IOC"})
+    assert ioc["filled"] == pytest.approx(1.0)
+    assert ioc["status"] == "canceled"
+    assert engine.open_orders == {}
+
+    engine.create_order(SYM, "limit", "sell", 1.0, 100.0)
+    with pytest.raises(ccxt.OrderImmediatelyFillable):
+        engine.create_order(SYM, "limit", "buy", 1.0, 100.0, {"postOnly": True})
+    maker = engine.create_order(SYM, "limit", "buy", 1.0, 99.0, {"timeInForce": "PO"})
+    assert maker["status"] == "open"
+
+
+def test_cancel_order(engine):
+    order = engine.create_order(SYM, "limit", "buy", 1.0, 99.0, {"clientOrderId": "abc"})
+    assert order["clientOrderId"] == "abc"
+    canceled = engine.cancel_order(order["id"], SYM)
+    assert canceled["status"] == "canceled"
+    assert engine.fetch_order_book(SYM)["bids"] == []
+    with pytest.raises(ccxt.OrderNotFound):
+        engine.cancel_order(order["id"])
+    # A market order finds no liquidity left behind by the canceled order
+    assert engine.create_order(SYM, "market", "sell", 1.0)["filled"] == 0.0
+
+
+def test_fetch_order_finds_finished_orders_within_history():
+    engine = MatchingEngine(max_closed_orders=2)
+    resting = engine.create_order(SYM, "limit", "sell", 1.0, 100.0)
+    taker = engine.create_order(SYM, "market", "buy", 1.0)
+    assert engine.fetch_order(resting["id"])["status"] == "closed"
+    assert engine.fetch_order(taker["id"])["filled"] == pytest.approx(1.0)
+
+    engine.create_order(SYM, "market", "buy", 1.0)  # evicts the oldest finished order
+    with pytest.raises(ccxt.OrderNotFound):
+        engine.fetch_order(resting["id"])
+
+
+def test_invalid_orders(engine):
+    with pytest.raises(ccxt.InvalidOrder):
+        engine.create_order(SYM, "limit", "buy", 1.0)
+    with pytest.raises(ccxt.InvalidOrder):
+        engine.create_order(SYM, "stop", "buy", 1.0, 100.0)
+
+
+def test_simulator_matching_mode():
+    sim = PaperExchangeSimulator(error_rate=0.0, mode="matching")
+    sim.create_order(SYM, "LIMIT", "sell", 2.0, 100.0)
+    fill = sim.create_order(SYM, "MARKET", "buy", 1.0)
+    assert fill["price"] is None
+    assert fill["average"] == pytest.approx(100.0)
+    assert sim.fetch_order_book(SYM)["asks"] == [[100.0, 1.0]]
+    resting = sim.fetch_open_orders(SYM)[0]
+    assert sim.cancel_order(resting["id"])["status"] == "canceled"
+
+    with pytest.raises(RuntimeError):
+        PaperExchangeSimulator().cancel_order("1")
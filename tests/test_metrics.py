@@ -0,0 +1,71 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.backtesting.backtester import Backtester
+from src.backtesting.metrics import METRIC_KEYS, OnlineMetrics, compute_metrics, periods_per_year
+
+
+def test_periods_per_year():
+    assert periods_per_year("1m") == 525_600
+    assert periods_per_year("1d") == 365
+
+
+def test_known_values():
+    equity = [100.0, 110.0, 99.0, 108.9]
+    m = compute_metrics(equity, positions=[0, 1, 1, 0], trade_pnls=[10, -11, 9.9],
+                        traded_notional=[0, 100, 0, 100], periods_per_year=1)
+    rets = np.array([0.1, -0.1, 0.1])
+    assert m["total_return"] == pytest.approx(0.089)
+    assert m["sharpe"] == pytest.approx(rets.mean() / rets.std(ddof=1))
+    assert m["sortino"] == pytest.approx(rets.mean() / math.sqrt(0.01 / 3))
+    assert m["max_drawdown"] == pytest.approx(0.1)
+    assert m["win_rate"] == pytest.approx(2 / 3)
+    assert m["exposure"] == 0.5
+    assert m["turnover"] == pytest.approx(200 / np.mean(equity))
+    assert (m["n_periods"], m["n_trades"]) == (3, 3)
+
+
+def test_online_matches_batch():
+    rng = np.random.default_rng(0)
+    equity = 1000 * np.cumprod(1 + rng.normal(0, 0.01, 5000))
+    positions = rng.integers(-1, 2, 5000)
+    notional = rng.random(5000) * 10
+    pnls = rng.normal(0, 1, 300)
+
+    online = OnlineMetrics(periods_per_year=365)
+    for eq, pos, tn in zip(equity, positions, notional):
+        online.update(eq, pos, tn)
+    for p in pnls:
+        online.record_trade(p)
+    live = online.metrics()
+    batch = compute_metrics(equity, positions, pnls, notional, periods_per_year=365)
+    assert set(live) == set(batch) == set(METRIC_KEYS)
+    for key in METRIC_KEYS:
+        assert live[key] == pytest.approx(batch[key], rel=1e-9)
+
+
+def test_degenerate_inputs():
+    m = compute_metrics([100.0])
+    assert m["n_periods"] == 0 and math.isnan(m["sharpe"]) and math.isnan(m["win_rate"])
+    with pytest.raises(ValueError):
+        compute_metrics([])
+    with pytest.raises(ValueError):
+        OnlineMetrics().metrics()
+
+
+def test_run_futures_reports_metrics():
+    idx = pd.date_range("2021-01-01", periods=4, freq="min")
+    bars = pd.DataFrame({"close": [100.0, 110.0, 120.0, 120.0]}, index=idx)
+
+    class Strategy:
+        def generate_signals(self, df):
+            return [{"timestamp": df.index[0], "side": "buy", "size": 1},
+                    {"timestamp": df.index[2], "side": "sell", "size": 1}]
+
+    metrics = Backtester(Strategy(), bars, None).run_futures(fee_rate=0.0)["metrics"]
+    assert metrics["total_return"] == pytest.approx(20 / 10_000)
+    assert metrics["exposure"] == 0.5
+    assert metrics["turnover"] == pytest.approx(220 / 10_010)
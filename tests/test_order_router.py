@@ -0,0 +1,201 @@
+import asyncio
+
+import ccxt
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.execution.order_router import OrderRouter
+from src.paper_trading.paper_trader import PaperTrader
+from src.paper_trading.replay_exchange import ReplayExchange
+
+MINUTE = 60_000
+T0 = 1_600_000_000_000 - (1_600_000_000_000 % MINUTE)
+
+
+def replay(**kwargs):
+    close = 100.0 + np.arange(100, dtype=float)
+    df = pd.DataFrame({
+        "timestamp": pd.to_datetime(T0 + np.arange(100) * MINUTE, unit="ms", utc=True),
+        "open": close, "high": close, "low": close, "close": close, "volume": 1_000.0,
+    })
+    kwargs.setdefault("speed", 0)
+    kwargs.setdefault("start_ms", T0 + 10 * MINUTE)
+    return ReplayExchange({"BTC/USDT": df, "ETH/USDT": df}, **kwargs)
+
+
+class Counting:
+    """Wraps an exchange, counting calls and optionally failing create_order or lookups."""
+
+    def __init__(self, inner, fail_after_landing=0, fail_before=0, fail_lookups=0, batch=True, fetch_orders=True):
+        self.inner = inner
+        self.rateLimit = 0
+        self.has = dict(inner.has, createOrders=batch, fetchOrders=fetch_orders)
+        self.counts = {}
+        self.fail_after_landing = fail_after_landing
+        self.fail_before = fail_before
+        self.fail_lookups = fail_lookups
+
+    def _count(self, name):
+        self.counts[name] = self.counts.get(name, 0) + 1
+
+    def create_order(self, *args, **kwargs):
+        self._count("create_order")
+        if self.fail_before:
+            self.fail_before -= 1
+            raise ccxt.ExchangeNotAvailable("down")
+        order = self.inner.create_order(*args, **kwargs)
+        if self.fail_after_landing:
+            self.fail_after_landing -= 1
+            raise ccxt.RequestTimeout("response lost")
+        return order
+
+    def __getattr__(self, name):
+        attr = getattr(self.inner, name)
+        if callable(attr):
+            def wrapped(*args, **kwargs):
+                self._count(name)
+                if name.startswith("fetch_") and name.endswith(("order", "orders")) and self.fail_lookups:
+                    self.fail_lookups -= 1
+                    raise ccxt.RequestTimeout("lookup lost")
+                return attr(*args, **kwargs)
+            return wrapped
+        return attr
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_create_order_is_non_blocking_and_batched_per_symbol():
+    ex = Counting(replay())
+
+    async def main():
+        async with OrderRouter(ex, max_batch=10, batch_window_ms=20) as router:
+            pending = [router.create_order(s, "MARKET", "buy", 0.1, 110.0)
+                       for s in ["BTC/USDT"] * 6 + ["ETH/USDT"] * 4]
+            assert all(o["status"] == "pending" for o in pending)
+            await router.drain()
+            return router, pending
+
+    router, pending = run(main())
+    assert ex.counts["create_orders"] == 2
+    assert "create_order" not in ex.counts
+    assert [o["status"] for o in pending] == ["closed"] * 10
+    assert len({o["clientOrderId"] for o in pending}) == 10
+    assert router.in_flight == {}
+    assert router.metrics()["submit_ms"]["count"] == 10
+
+
+def test_ambiguous_timeout_is_resolved_by_client_id_without_duplicate():
+    inner = replay()
+    ex = Counting(inner, fail_after_landing=1, batch=False)
+
+    async def main():
+        async with OrderRouter(ex, base_backoff_ms=1, seed=0) as router:
+            return await router.submit("BTC/USDT", "limit", "buy", 1.0, 50.0), router
+
+    order, router = run(main())
+    assert order["status"] == "open"
+    assert ex.counts["create_order"] == 1  # found on lookup, never resent
+    assert len(inner.fetch_open_orders("BTC/USDT")) == 1
+    assert router.deduplicated == 1
+
+
+@pytest.mark.parametrize("fetch_orders", [True, False])
+def test_failed_lookup_is_retried_instead_of_resending(fetch_orders):
+    inner = replay()
+    ex = Counting(inner, fail_after_landing=1, fail_lookups=1, batch=False, fetch_orders=fetch_orders)
+
+    async def main():
+        async with OrderRouter(ex, base_backoff_ms=1, seed=0) as router:
+            return await router.submit("BTC/USDT", "market", "buy", 1.0), router
+
+    order, router = run(main())
+    assert order["status"] == "closed"  # filled, so only a closed-order lookup finds it
+    assert ex.counts["create_order"] == 1
+    assert len(inner.fetch_orders("BTC/USDT")) == 1
+    assert router.deduplicated == 1
+    assert ex.counts.get("fetch_order", 0) == (0 if fetch_orders else 1)
+
+
+def test_transient_errors_back_off_and_retry_then_give_up():
+    ex = Counting(replay(), fail_before=2, batch=False)
+
+    async def main():
+        async with OrderRouter(ex, base_backoff_ms=1, seed=0) as router:
+            ok = await router.submit("BTC/USDT", "market", "sell", 0.5)
+            ex.fail_before = 6  # one first attempt + max_retries
+            with pytest.raises(ccxt.ExchangeNotAvailable):
+                await router.submit("BTC/USDT", "market", "sell", 0.5)
+            with pytest.raises(ccxt.InvalidOrder):
+                await router.submit("BTC/USDT", "limit", "buy", 1.0)  # no price: not retried
+            return ok, router
+
+    ok, router = run(main())
+    assert ok["status"] == "closed"
+    assert router.failures == 2
+    assert router.retries == 2 + 5
+
+
+def test_backoff_respects_rate_limit_and_cap():
+    router = OrderRouter(replay(rate_limit_ms=50), base_backoff_ms=10, max_backoff_ms=200, seed=1)
+    delays = [router._backoff(a) for a in range(8)]
+    assert all(0.05 <= d <= 0.2 for d in delays)
+    assert delays[-1] >= 0.1
+
+
+def test_reconcile_reports_fills_of_resting_orders():
+    inner = replay()
+    updates = []
+
+    async def main():
+        async with OrderRouter(inner, reconcile_every_s=3600, on_update=lambda o: updates.append(o["status"])) as router:
+            resting = await router.submit("BTC/USDT", "limit", "sell", 0.2, 115.0)
+            assert resting["status"] == "open"
+            inner.clock.advance(10 * MINUTE)  # price walks through 115
+            inner.create_order("BTC/USDT", "market", "buy", 0.2)
+            await router.reconcile()
+            return resting, router
+
+    resting, router = run(main())
+    assert resting["status"] == "closed"
+    assert resting["filled"] == pytest.approx(0.2)
+    assert updates == ["open", "closed"]
+    assert router.in_flight == {}
+
+
+def test_duplicate_client_id_while_in_flight_is_not_resent():
+    ex = Counting(replay(), batch=False)
+
+    async def main():
+        async with OrderRouter(ex) as router:
+            a = router.create_order("BTC/USDT", "market", "buy", 0.1, params={"clientOrderId": "x1"})
+            b = router.create_order("BTC/USDT", "market", "buy", 0.1, params={"clientOrderId": "x1"})
+            await router.drain()
+            return a, b
+
+    a, b = run(main())
+    assert a is b
+    assert ex.counts["create_order"] == 1
+
+
+class Cfg:
+    EXCHANGE_ID = "replay"
+    SYMBOL = "BTC/USDT"
+    TIMEFRAME = "1m"
+
+
+class EveryBarStrategy:
+    def generate_signals(self, df):
+        return [{"timestamp": ts, "side": "buy", "size": 0.01} for ts in df["timestamp"]]
+
+
+def test_paper_trader_routes_live_orders_through_router():
+    ex = replay(speed=60_000, start_ms=T0 + 50 * MINUTE + 30_000)
+    router = OrderRouter(ex)
+    pt = PaperTrader(EveryBarStrategy(), Cfg(), exchange=ex, simulator=router, history_bars=20, close_delay_ms=0)
+    pt.run(max_iterations=3)
+    assert len(pt.orders) >= 3
+    assert all(o["status"] == "closed" for o in pt.orders)
+    assert pt.metrics()["router"]["failures"] == 0
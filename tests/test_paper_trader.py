@@ -0,0 +1,260 @@
+import os
+import time
+
+import ccxt
+import pandas as pd
+import pytest
+
+from src.backtesting.portfolio import PortfolioLedger
+from src.governance.risk_gate import RiskGate
+from src.paper_trading.checkpoint import save_checkpoint
+from src.paper_trading.paper_trader import ExchangeClock, PaperTrader, closed_new_candles
+from src.paper_trading.simulator import PaperExchangeSimulator
+from src.strategy.base_strategy import BaseStrategy
+from src.strategy.example_momentum import ExampleMomentumStrategy
+
+MINUTE = 60_000
+T0 = 1_600_000_020_000 - (1_600_000_020_000 % MINUTE)
+
+
+class Cfg:
+    EXCHANGE_ID = "stub"
+    SYMBOL = "BTC/USDT"
+    TIMEFRAME = "1m"
+
+
+class StubExchange:
+    def __init__(self, batches):
+        self._batches = list(batches)
+        self.calls = []
+
+    @staticmethod
+    def parse_timeframe(tf):
+        return 60
+
+    def load_markets(self, reload=False):
+        return {}
+
+    def fetch_ohlcv(self, symbol, timeframe, since=None, limit=None):
+        self.calls.append({"since": since, "limit": limit})
+        return self._batches.pop(0) if self._batches else []
+
+
+class EveryBarStrategy:
+    """Emits a buy on every bar it sees."""
+    def generate_signals(self, df):
+        return [{"timestamp": ts, "side": "buy", "size": 1.0} for ts in df["timestamp"]]
+
+
+class StreamingEveryBarStrategy(BaseStrategy):
+    """Buys every bar; its state records the size of each batch it was fed."""
+    def generate_signals_stream(self, df, state=None):
+        signals = [{"timestamp": ts, "side": "buy", "size": 1.0} for ts in df["timestamp"]]
+        return signals, (state or ()) + (len(df),)
+
+
+def bar(i, close=100.0):
+    return [T0 + i * MINUTE, close, close, close, close, 1.0]
+
+
+@pytest.fixture
+def trader(monkeypatch):
+    exchange = StubExchange([
+        [bar(0), bar(1), bar(2)],
+        [bar(2), bar(3)],
+        [bar(3), bar(4, close=110.0)],
+    ])
+    sim = PaperExchangeSimulator(slippage_pct=0.0, error_rate=0.0, partial_fill_min=1.0)
+    pt = PaperTrader(EveryBarStrategy(), Cfg(), exchange=exchange, simulator=sim)
+    monkeypatch.setattr(pt, "_next_wakeup_delay", lambda now_ms: 0.0)
+    return pt
+
+
+def test_closed_new_candles_skips_seen_and_forming():
+    rows = [bar(0), bar(1), bar(2)]
+    now = T0 + 2 * MINUTE + 10  # bar(2) still forming
+    assert closed_new_candles(rows, None, MINUTE, now) == [bar(0), bar(1)]
+    assert closed_new_candles(rows, T0, MINUTE, now) == [bar(1)]
+
+
+def test_run_fetches_incrementally_and_routes_new_bars(trader):
+    trader.run(max_iterations=3)
+
+    calls = trader.exchange.calls
+    assert calls[0]["since"] is None
+    assert calls[1]["since"] == T0 + 2 * MINUTE + 1
+    assert calls[2]["since"] == T0 + 3 * MINUTE + 1
+    assert trader.last_ts == T0 + 4 * MINUTE
+
+    # Warm-up acts only on its last bar, then one order per new bar
+    assert len(trader.orders) == 3
+    assert trader.orders[-1]["price"] == pytest.approx(110.0)
+
+
+def test_metrics_exposed(trader):
+    trader.run(max_iterations=3)
+    metrics = trader.metrics()
+    assert metrics["tick_to_order_ms"]["count"] == 3
+    assert metrics["tick_to_order_ms"]["p99"] >= 0.0
+    assert metrics["loop_jitter_ms"]["count"] == 2
+
+
+def test_checkpoint_warm_restart(tmp_path, monkeypatch):
+    path = str(tmp_path / "trader.npz")
+    ledger = PortfolioLedger(capital=1000.0, max_drawdown=0.5)
+    ledger.record_fill("BTC/USDT", 1.0, 100.0, timestamp=1)
+    ledger.update(-25.0)
+    now = T0 + 10 * MINUTE
+
+    first = PaperTrader(
+        EveryBarStrategy(), Cfg(), exchange=StubExchange([[bar(0), bar(1), bar(2)], [bar(3)]]),
+        simulator=PaperExchangeSimulator(slippage_pct=0.0, error_rate=0.0, partial_fill_min=1.0),
+        checkpoint_path=path, checkpoint_components={"ledger": ledger},
+    )
+    monkeypatch.setattr(first, "_next_wakeup_delay", lambda now_ms: 0.0)
+    monkeypatch.setattr(first, "_now_ms", lambda: now)
+    first.run(max_iterations=2)
+    assert os.path.exists(path)
+    assert [p.name for p in tmp_path.iterdir()] == ["trader.npz"]
+
+    restored_ledger = PortfolioLedger(capital=1.0, max_drawdown=0.1)
+    exchange = StubExchange([[bar(4), bar(5)], [bar(6)]])
+    second = PaperTrader(
+        EveryBarStrategy(), Cfg(), exchange=exchange,
+        simulator=PaperExchangeSimulator(slippage_pct=0.0, error_rate=0.0, partial_fill_min=1.0),
+        checkpoint_path=path, checkpoint_components={"ledger": restored_ledger},
+    )
+    monkeypatch.setattr(second, "_next_wakeup_delay", lambda now_ms: 0.0)
+    monkeypatch.setattr(second, "_now_ms", lambda: now)
+    second.run(max_iterations=2)
+
+    # Only bars after the checkpoint are fetched; no full-history warm-up call.
+    assert exchange.calls[0] == {"since": T0 + 3 * MINUTE + 1, "limit": None}
+    assert second._bars.view()[:, 0].tolist() == [T0 + i * MINUTE for i in range(7)]
+    # Catch-up batch acts on its latest bar only, then one order per new bar.
+    assert len(second.orders) == 2
+    assert restored_ledger.capital == pytest.approx(975.0)
+    assert restored_ledger.positions() == {"BTC/USDT": 1.0}
+
+
+def test_stale_or_foreign_checkpoint_starts_cold(tmp_path, monkeypatch):
+    path = str(tmp_path / "trader.npz")
+    save_checkpoint(path, {"trader": {"symbol": "ETH/USDT", "timeframe": "1m", "last_ts": T0}})
+    pt = PaperTrader(EveryBarStrategy(), Cfg(), exchange=StubExchange([]), checkpoint_path=path)
+    monkeypatch.setattr(pt, "_now_ms", lambda: T0 + MINUTE)
+    assert not pt.restore()
+    save_checkpoint(path, {"trader": {"symbol": "BTC/USDT", "timeframe": "1m", "last_ts": T0}})
+    monkeypatch.setattr(pt, "_now_ms", lambda: T0 + 1000 * MINUTE)
+    assert not pt.restore()
+    assert pt.last_ts is None
+
+
+def test_risk_gate_sits_in_front_of_simulator(monkeypatch):
+    exchange = StubExchange([[bar(0), bar(1), bar(2)], [bar(2), bar(3)], [bar(3), bar(4)]])
+    sim = PaperExchangeSimulator(slippage_pct=0.0, error_rate=0.0, partial_fill_min=1.0)
+    gate = RiskGate(max_symbol_notional=150.0)
+    pt = PaperTrader(EveryBarStrategy(), Cfg(), exchange=exchange, simulator=sim, risk_gate=gate)
+    monkeypatch.setattr(pt, "_next_wakeup_delay", lambda now_ms: 0.0)
+    pt.run(max_iterations=3)
+
+    # 1.0 @ 100, then clipped to 0.5, then rejected at the 150 cap
+    assert [o["amount"] for o in pt.orders] == [1.0, 0.5]
+    assert pt.metrics()["risk"]["rejections"]["symbol_notional"] == 1
+
+
+def test_drawdown_halt_blocks_new_exposure(monkeypatch):
+    exchange = StubExchange([[bar(0), bar(1), bar(2)], [bar(2), bar(3, close=50.0)], [bar(3), bar(4, close=50.0)]])
+    sim = PaperExchangeSimulator(slippage_pct=0.0, error_rate=0.0, partial_fill_min=1.0)
+    gate = RiskGate(max_drawdown=0.1, capital=300.0)
+    pt = PaperTrader(EveryBarStrategy(), Cfg(), exchange=exchange, simulator=sim, risk_gate=gate)
+    monkeypatch.setattr(pt, "_next_wakeup_delay", lambda now_ms: 0.0)
+    pt.run(max_iterations=3)
+
+    # Bought 1 @ 100; the 50 close marks equity 300 -> 250, a 16.7% drawdown.
+    assert [o["amount"] for o in pt.orders] == [1.0]
+    risk = pt.metrics()["risk"]
+    assert risk["halted"]
+    assert risk["equity"] == pytest.approx(250.0)
+    assert risk["rejections"]["halted"] == 2
+
+
+def test_exchange_clock_is_synced_once_per_poll_and_survives_failures(monkeypatch):
+    class ClockedExchange(StubExchange):
+        clock_calls = 0
+
+        def milliseconds(self):
+            self.clock_calls += 1
+            if self.clock_calls == 2:
+                raise ccxt.RequestTimeout("clock lost")
+            return T0 + 10 * MINUTE
+
+    exchange = ClockedExchange([[bar(0), bar(1), bar(2)], [bar(2), bar(3)], [bar(3), bar(4)]])
+    sim = PaperExchangeSimulator(slippage_pct=0.0, error_rate=0.0, partial_fill_min=1.0)
+    pt = PaperTrader(EveryBarStrategy(), Cfg(), exchange=exchange, simulator=sim)
+    monkeypatch.setattr(pt, "_next_wakeup_delay", lambda now_ms: 0.0)
+    pt.run(max_iterations=3)
+
+    assert exchange.clock_calls == 1 + 3  # startup sync plus one per poll
+    assert len(pt.orders) == 3
+
+
+def test_exchange_clock_extrapolates_at_replay_speed(monkeypatch):
+    class Replay:
+        replay_speed = 60.0
+
+        def milliseconds(self):
+            return 1_000_000
+
+    now = [100.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    clock = ExchangeClock(Replay())
+    clock.sync()
+    now[0] = 101.5
+    assert clock.now_ms() == pytest.approx(1_000_000 + 1_500 * 60)
+
+
+def test_streaming_strategy_gets_only_new_bars(monkeypatch):
+    exchange = StubExchange([[bar(0), bar(1), bar(2)], [bar(2), bar(3)], [bar(3), bar(4)]])
+    sim = PaperExchangeSimulator(slippage_pct=0.0, error_rate=0.0, partial_fill_min=1.0)
+    pt = PaperTrader(StreamingEveryBarStrategy(), Cfg(), exchange=exchange, simulator=sim)
+    monkeypatch.setattr(pt, "_next_wakeup_delay", lambda now_ms: 0.0)
+    framed = []
+    to_frame = pt._bars.to_frame
+    monkeypatch.setattr(pt._bars, "to_frame", lambda: framed.append(1) or to_frame())
+    pt.run(max_iterations=3)
+    assert framed == [1]  # only the warm-up primes on the buffer
+    assert pt._stream_state == (3, 1, 1)
+    assert len(pt.orders) == 3
+
+
+def test_checkpoint_restores_streaming_emas(tmp_path, monkeypatch):
+    closes = [100.0, 102.0, 101.0, 105.0, 103.0, 99.0, 98.0, 104.0, 107.0, 106.0]
+    rows = [bar(i, close=c) for i, c in enumerate(closes)]
+    now = T0 + 20 * MINUTE
+
+    def make(batches, path=None, **kwargs):
+        pt = PaperTrader(
+            ExampleMomentumStrategy(span_short=2, span_long=4), Cfg(), exchange=StubExchange(batches),
+            simulator=PaperExchangeSimulator(slippage_pct=0.0, error_rate=0.0, partial_fill_min=1.0),
+            checkpoint_path=path, **kwargs,
+        )
+        monkeypatch.setattr(pt, "_next_wakeup_delay", lambda now_ms: 0.0)
+        monkeypatch.setattr(pt, "_now_ms", lambda: now)
+        return pt
+
+    uninterrupted = make([rows[:4], rows[4:6], rows[6:]])
+    uninterrupted.run(max_iterations=3)
+
+    path = str(tmp_path / "trader.npz")
+    ledger = PortfolioLedger(capital=1000.0, max_drawdown=0.5)
+    make([rows[:4], rows[4:6]], path, ledger=ledger).run(max_iterations=2)
+    resumed = make([rows[6:]], path, ledger=PortfolioLedger(capital=1.0, max_drawdown=0.1))
+    framed = []
+    to_frame = resumed._bars.to_frame
+    monkeypatch.setattr(resumed._bars, "to_frame", lambda: framed.append(1) or to_frame())
+    resumed.run(max_iterations=1)
+
+    assert framed == []  # resumed from the checkpointed EMAs, not re-primed
+    assert list(resumed._stream_state) == pytest.approx(list(uninterrupted._stream_state))
+    assert resumed.ledger.capital == pytest.approx(1000.0)
+    assert resumed.ledger.positions() == ledger.positions() == {"BTC/USDT": -1.0}
@@ -1,5 +1,6 @@
+import numpy as np
 import pytest
-from src.backtesting.portfolio import Portfolio
+from src.backtesting.portfolio import Portfolio, PortfolioLedger
 
 
 def test_position_size_calculation():
@@ -32,3 +33,43 @@ def test_invalid_inputs():
         p.position_size(price=0, risk_pct=0.01)
     with pytest.raises(ValueError):
         p.position_size(price=50, risk_pct=0)
+
+
+def test_ledger_batch_matches_scalar_updates():
+    pnls = np.random.default_rng(0).normal(0, 10, size=3000)
+    scalar = PortfolioLedger(capital=1000.0, max_drawdown=0.2, initial_size=4)
+    for x in pnls:
+        scalar.update(x)
+    batched = PortfolioLedger(capital=1000.0, max_drawdown=0.2, initial_size=4)
+    batched.update_batch(pnls[:1234])
+    batched.update_batch(pnls[1234:])
+    np.testing.assert_allclose(batched.equity_curve(), scalar.equity_curve())
+    np.testing.assert_allclose(batched.drawdown_curve(), scalar.drawdown_curve())
+    assert batched.peak == pytest.approx(scalar.peak)
+    assert batched.breached == scalar.breached
+    assert batched.breach_index == scalar.breach_index
+
+
+def test_ledger_flags_breach_without_raising():
+    ledger = PortfolioLedger(capital=1000.0, max_drawdown=0.1)
+    assert not ledger.update(+100.0)
+    assert not ledger.update(-100.0)  # 1000 / 1100 peak: ~9.1% drawdown
+    assert ledger.update(-50.0)
+    assert ledger.breach_index == 2
+    assert ledger.capital == pytest.approx(950.0)
+    assert ledger.drawdown == pytest.approx(1 - 950 / 1100)
+
+
+def test_ledger_fills_and_positions():
+    ledger = PortfolioLedger(capital=1000.0, max_drawdown=0.1, initial_size=2)
+    ledger.record_fill("BTC/USDT", 0.5, 100.0, fee=0.1, timestamp=1)
+    ledger.record_fills(["ETH/USDT", "BTC/USDT", "ETH/USDT"], [2.0, -0.2, 1.0], [10.0, 110.0, 11.0],
+                        timestamps=[2, 3, 4])
+    assert ledger.position("BTC/USDT") == pytest.approx(0.3)
+    assert ledger.positions() == pytest.approx({"BTC/USDT": 0.3, "ETH/USDT": 3.0})
+    assert ledger.position("SOL/USDT") == 0.0
+    fills = ledger.fills()
+    assert list(fills["symbol"]) == ["BTC/USDT", "ETH/USDT", "BTC/USDT", "ETH/USDT"]
+    assert list(fills["timestamp"]) == [1, 2, 3, 4]
+    assert fills["notional"].tolist() == pytest.approx([50.0, 20.0, 22.0, 11.0])
+    assert fills["fee"].tolist() == pytest.approx([0.1, 0, 0, 0])
@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.backtesting.portfolio_backtester import PortfolioBacktester, align_frames
+from src.strategy.base_strategy import BaseStrategy
+from src.strategy.example_momentum import ExampleMomentumStrategy
+
+
+def _frame(seed, n=200, start="2021-01-01", drop=()):
+    idx = pd.date_range(start, periods=n, freq="min")
+    close = 100 * np.exp(np.cumsum(np.random.default_rng(seed).normal(0, 0.01, n)))
+    df = pd.DataFrame({"timestamp": idx, "open": close, "high": close, "low": close,
+                       "close": close, "volume": 1.0})
+    return df.drop(index=list(drop)).reset_index(drop=True)
+
+
+@pytest.fixture
+def frames():
+    return {
+        "BTC/USDT": _frame(0),
+        "ETH/USDT": _frame(1, drop=range(50, 60)),          # gap
+        "SOL/USDT": _frame(2, n=150, start="2021-01-01 00:30"),  # lists later
+    }
+
+
+def test_align_frames_union_and_ffill(frames):
+    symbols, index, panel, observed = align_frames(frames)
+    assert symbols == ["BTC/USDT", "ETH/USDT", "SOL/USDT"]
+    assert len(index) == 200
+    eth = symbols.index("ETH/USDT")
+    assert not observed[eth, 50:60].any()
+    assert (panel["close"][eth, 50:60] == panel["close"][eth, 49]).all()
+    sol = symbols.index("SOL/USDT")
+    assert np.isnan(panel["close"][sol, :30]).all()
+    assert observed[sol, 30:180].all()
+
+
+class _LoopOnlyMomentum(BaseStrategy):
+    def __init__(self, inner):
+        self.inner = inner
+
+    def generate_signals(self, df):
+        return self.inner.generate_signals(df)
+
+
+def test_vectorized_momentum_matches_per_symbol(frames):
+    strat = ExampleMomentumStrategy(size=2.0, span_short=5, span_long=12)
+    _, index, panel, observed = align_frames(frames)
+    fast = strat.generate_signal_matrix(panel, index, observed)
+    slow = _LoopOnlyMomentum(strat).generate_signal_matrix(panel, index, observed)
+    assert np.count_nonzero(fast) > 0
+    np.testing.assert_array_equal(fast, slow)
+
+
+def test_portfolio_pnl_sums_symbol_mark_to_market(frames):
+    strat = ExampleMomentumStrategy(size=1.0, span_short=5, span_long=12)
+    result = PortfolioBacktester(strat, frames, initial_capital=1000.0, fee_rate=0.001).run()
+
+    total = 0.0
+    for symbol, df in frames.items():
+        close = df.set_index("timestamp")["close"]
+        signals = strat.generate_signals(df)
+        cash = sum((-1 if s["side"] == "buy" else 1) * s["size"] * close[s["timestamp"]] for s in signals)
+        fees = sum(s["size"] * close[s["timestamp"]] * 0.001 for s in signals)
+        held = sum((1 if s["side"] == "buy" else -1) * s["size"] for s in signals)
+        sym_pnl = cash + held * close.iloc[-1] - fees
+        assert result["symbol_pnl"][symbol] == pytest.approx(sym_pnl)
+        assert result["positions"][symbol].iloc[-1] == pytest.approx(held)
+        total += sym_pnl
+    assert result["pnl"] == pytest.approx(total)
+    assert result["equity"].iloc[-1] == pytest.approx(1000.0 + total)
+    assert (result["exposure"]["gross"] >= result["exposure"]["net"].abs() - 1e-9).all()
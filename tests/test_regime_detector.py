@@ -1,7 +1,13 @@
+import numpy as np
 import pandas as pd
 import pytest
 
-from src.strategy.regime_detector import detect_volatility_regime
+from src.strategy.regime_detector import (
+    StreamingRegimeDetector,
+    detect_volatility_regime,
+    detect_volatility_regimes,
+    detect_volatility_regimes_batch,
+)
 
 
 def test_detect_volatility_regime_low_high():
@@ -20,3 +26,75 @@ def test_missing_close_column():
     df = pd.DataFrame({"open": [1, 2, 3]})
     with pytest.raises(ValueError):
         detect_volatility_regime(df, window=2, threshold=0.5)
+
+
+def test_labels_are_compact_categorical():
+    df = pd.DataFrame({"close": [1, 1, 1, 5, 5, 5]})
+    regimes = detect_volatility_regime(df, window=3, threshold=1.0)
+    assert isinstance(regimes.dtype, pd.CategoricalDtype)
+    assert regimes.cat.codes.dtype == np.int8
+    assert regimes.iloc[-1] == "low"
+
+
+def test_multi_window_matches_single_window():
+    close = 100 + np.cumsum(np.random.default_rng(0).normal(0, 1, 2000))
+    df = pd.DataFrame({"close": close})
+    windows, thresholds = [10, 10, 50], [0.8, 1.2, 1.0]
+    codes = detect_volatility_regimes(df, windows, thresholds)
+    assert codes.dtypes.eq(np.int8).all()
+    for w, t in zip(windows, thresholds):
+        single = detect_volatility_regime(df, window=w, threshold=t)
+        assert (codes[(w, t)].to_numpy() == single.cat.codes.to_numpy()).all()
+
+
+def test_streaming_matches_batch():
+    close = 30_000 + np.cumsum(np.random.default_rng(1).normal(0, 5, 3000))
+    df = pd.DataFrame({"close": close})
+    windows, thresholds = [5, 20, 20], [4.0, 8.0, 12.0]
+    batch = detect_volatility_regimes(df, windows, thresholds).to_numpy()
+    vols = {w: df["close"].rolling(w).std().fillna(0.0).to_numpy() for w in set(windows)}
+    detector = StreamingRegimeDetector(windows, thresholds, resync_every=997)
+    for i, c in enumerate(close):
+        codes = detector.update(c)
+        for j, (w, t) in enumerate(zip(windows, thresholds)):
+            if abs(vols[w][i] - t) > 1e-6:  # skip rounding ties at the threshold
+                assert codes[j] == batch[i, j]
+    assert set(detector.labels().values()) <= {"low", "high"}
+
+
+def test_invalid_pairs():
+    df = pd.DataFrame({"close": [1.0, 2.0, 3.0]})
+    with pytest.raises(ValueError):
+        detect_volatility_regimes(df, [2, 3], [1.0])
+    with pytest.raises(ValueError):
+        StreamingRegimeDetector([1], [1.0])
+
+
+def test_batch_matches_per_symbol_detection():
+    rng = np.random.default_rng(2)
+    idx = pd.date_range("2021-01-01", periods=1500, freq="min")
+    close = pd.DataFrame(
+        30_000 + np.cumsum(rng.normal(0, 5, (1500, 4)), axis=0),
+        index=idx, columns=["BTC/USDT", "ETH/USDT", "SOL/USDT", "XRP/USDT"],
+    )
+    close.iloc[:300, 2] = np.nan  # lists later
+    close.iloc[500:520, 3] = 42.0  # flat stretch
+    windows, thresholds = [10, 10, 60], [4.0, 6.0, 5.0]
+    batch = detect_volatility_regimes_batch(close, windows, thresholds)
+    assert batch.codes.dtype == np.int8
+    assert batch.codes.shape == (3, 4, 1500)
+    for sym in close.columns:
+        for w, t in zip(windows, thresholds):
+            ref_vol = close[sym].rolling(w).std().fillna(0.0).to_numpy()
+            ref = detect_volatility_regime(close[[sym]].rename(columns={sym: "close"}), w, t)
+            got = batch.series(sym, w, t)
+            clear = np.abs(ref_vol - t) > 1e-6
+            assert (got.cat.codes.to_numpy()[clear] == ref.cat.codes.to_numpy()[clear]).all()
+    np.testing.assert_allclose(
+        np.nan_to_num(batch.vols[2, 0]), close["BTC/USDT"].rolling(60).std().fillna(0).to_numpy(), atol=1e-7
+    )
+    assert (batch.vols[0, 3, 519] == 0.0)
+    assert batch.current().loc["BTC/USDT", (60, 5.0)] in {"low", "high"}
+    assert batch.codes_for("ETH/USDT", 60).shape == (1500,)
+    with pytest.raises(KeyError):
+        batch.codes_for("ETH/USDT", 10)
@@ -0,0 +1,175 @@
+import threading
+
+import ccxt
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.paper_trading.paper_trader import PaperTrader
+from src.paper_trading.replay_exchange import (
+    ReplayClock,
+    ReplayExchange,
+    ReplayHTTPClient,
+    start_replay_server,
+)
+from src.paper_trading.simulator import PaperExchangeSimulator
+
+MINUTE = 60_000
+T0 = 1_600_000_000_000 - (1_600_000_000_000 % MINUTE)
+
+
+def frame(n=100, start=T0, base=100.0):
+    close = base + np.arange(n, dtype=float)
+    return pd.DataFrame({
+        "timestamp": pd.to_datetime(start + np.arange(n) * MINUTE, unit="ms", utc=True),
+        "open": close, "high": close + 1, "low": close - 1, "close": close, "volume": 10.0,
+    })
+
+
+def manual(**kwargs):
+    kwargs.setdefault("start_ms", T0 + 10 * MINUTE + 5_000)
+    return ReplayExchange({"BTC/USDT": frame()}, speed=0, **kwargs)
+
+
+def test_clock_scales_wall_time_and_advances():
+    wall = [0.0]
+    clock = ReplayClock(1_000, speed=60, wall=lambda: wall[0])
+    wall[0] = 2.0
+    assert clock.now_ms() == 1_000 + 120_000
+    clock.advance(500)
+    assert clock.now_ms() == 121_500
+
+
+def test_fetch_ohlcv_only_exposes_bars_opened_by_replay_time():
+    ex = manual()
+    rows = ex.fetch_ohlcv("BTC/USDT", "1m")
+    assert len(rows) == 11
+    assert rows[-1][0] == T0 + 10 * MINUTE  # forming bar
+    assert ex.fetch_ohlcv("BTC/USDT", "1m", limit=3)[0][0] == T0 + 8 * MINUTE
+    since = ex.fetch_ohlcv("BTC/USDT", "1m", since=T0 + 9 * MINUTE)
+    assert [r[0] for r in since] == [T0 + 9 * MINUTE, T0 + 10 * MINUTE]
+
+    ex.clock.advance(MINUTE)
+    assert ex.fetch_ohlcv("BTC/USDT", "1m")[-1][0] == T0 + 11 * MINUTE
+    with pytest.raises(ccxt.BadSymbol):
+        ex.fetch_ohlcv("ETH/USDT", "1m")
+
+
+def test_orders_match_synthetic_liquidity_around_bar_close():
+    ex = manual(spread_bps=10.0, depth_levels=5)
+    ticker = ex.fetch_ticker("BTC/USDT")
+    assert ticker["last"] == 110.0
+    assert ticker["bid"] < 110.0 < ticker["ask"]
+
+    order = ex.create_order("BTC/USDT", "market", "buy", 1.0)
+    assert order["status"] == "closed"
+    assert order["average"] == pytest.approx(ticker["ask"])
+
+    resting = ex.create_order("BTC/USDT", "limit", "buy", 1.0, 100.0)
+    assert [o["id"] for o in ex.fetch_open_orders("BTC/USDT")] == [resting["id"]]
+    assert ex.cancel_order(resting["id"], "BTC/USDT")["status"] == "canceled"
+
+    ex.clock.advance(MINUTE)
+    assert ex.fetch_order_book("BTC/USDT")["bids"][0][0] > 110.0  # re-quoted around 111
+
+
+def test_forming_bar_hides_its_future_from_data_and_fills():
+    df = frame()
+    df.loc[5, ["open", "high", "low", "close"]] = [105.0, 160.0, 100.0, 150.0]
+    ex = ReplayExchange({"BTC/USDT": df}, speed=0, start_ms=T0 + 5 * MINUTE + 1, spread_bps=10.0)
+
+    row = ex.fetch_ohlcv("BTC/USDT", "1m")[-1]
+    assert row[0] == T0 + 5 * MINUTE
+    assert row[1:5] == [105.0] * 4
+    assert row[5] == pytest.approx(10.0 / MINUTE)
+    assert ex.fetch_ticker("BTC/USDT")["last"] == 105.0
+    order = ex.create_order("BTC/USDT", "market", "buy", 0.5)  # first ladder level
+    assert order["average"] == pytest.approx(105.0 * (1 + 5e-4))
+
+    ex.clock.advance(MINUTE - 1)  # bar 5 closed; bar 6 opens
+    assert ex.fetch_ohlcv("BTC/USDT", "1m")[-2][1:5] == [105.0, 160.0, 100.0, 150.0]
+
+
+def test_filled_resting_order_stays_queryable_after_engine_history_churns():
+    ex = manual(spread_bps=10.0, depth_levels=5)
+    ex.engine.max_closed_orders = 5
+    resting = ex.create_order("BTC/USDT", "limit", "sell", 1.0, 110.5, {"clientOrderId": "r1"})
+    assert resting["status"] == "open"
+    for _ in range(5):  # price walks through 110.5; each re-quote cancels 10 makers
+        ex.clock.advance(MINUTE)
+        ex.fetch_ticker("BTC/USDT")
+    assert resting["id"] not in ex.engine.closed_orders
+    assert ex.fetch_order(resting["id"])["status"] == "closed"
+    assert ex.fetch_order(None, params={"clientOrderId": "r1"})["filled"] == pytest.approx(1.0)
+
+
+def test_injected_errors_and_latency_are_reproducible():
+    def outcomes(seed):
+        ex = manual(error_rate=0.3, seed=seed)
+        out = []
+        for _ in range(50):
+            try:
+                ex.fetch_ticker("BTC/USDT")
+                out.append(None)
+            except ccxt.NetworkError as e:
+                out.append(type(e))
+        return out, ex
+
+    first, ex = outcomes(7)
+    assert outcomes(7)[0] == first
+    assert 0 < ex.injected_errors < 50
+    assert ex.injected_errors == sum(o is not None for o in first)
+
+
+def test_http_server_serves_concurrent_clients():
+    ex = manual()
+    server, _ = start_replay_server(ex)
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        results, errors = [], []
+
+        def client():
+            try:
+                c = ReplayHTTPClient(url)
+                rows = c.fetch_ohlcv("BTC/USDT", "1m", limit=5)
+                order = c.create_order("BTC/USDT", "market", "buy", 0.1)
+                results.append((rows[-1][0], order["status"]))
+            except Exception as e:  # pragma: no cover - surfaced by the assert below
+                errors.append(e)
+
+        threads = [threading.Thread(target=client) for _ in range(16)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert not errors
+        assert results == [(T0 + 10 * MINUTE, "closed")] * 16
+
+        c = ReplayHTTPClient(url)
+        with pytest.raises(ccxt.BadSymbol):
+            c.fetch_ticker("ETH/USDT")
+        with pytest.raises(ccxt.InvalidOrder):
+            c.create_order("BTC/USDT", "limit", "buy", 1.0)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+class Cfg:
+    EXCHANGE_ID = "replay"
+    SYMBOL = "BTC/USDT"
+    TIMEFRAME = "1m"
+
+
+class EveryBarStrategy:
+    def generate_signals(self, df):
+        return [{"timestamp": ts, "side": "buy", "size": 1.0} for ts in df["timestamp"]]
+
+
+def test_paper_trader_runs_against_replay():
+    ex = ReplayExchange({"BTC/USDT": frame(200)}, speed=60_000, start_ms=T0 + 50 * MINUTE + 30_000)
+    sim = PaperExchangeSimulator(slippage_pct=0.0, error_rate=0.0, partial_fill_min=1.0)
+    pt = PaperTrader(EveryBarStrategy(), Cfg(), exchange=ex, simulator=sim, history_bars=20, close_delay_ms=0)
+    pt.run(max_iterations=3)
+    assert pt.last_ts >= T0 + 50 * MINUTE
+    assert len(pt.orders) >= 3
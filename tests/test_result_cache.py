@@ -0,0 +1,134 @@
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.backtesting.backtester import Backtester
+from src.backtesting import backtester, futures, result_cache
+from src.backtesting.result_cache import ResultCache, file_digest
+from src.strategy.example_momentum import ExampleMomentumStrategy
+
+
+@pytest.fixture
+def df():
+    idx = pd.date_range("2021-01-01", periods=2000, freq="min", name="timestamp")
+    close = 100 * np.exp(np.cumsum(np.random.default_rng(0).normal(0, 0.002, len(idx))))
+    return pd.DataFrame({"timestamp": idx, "open": close, "high": close, "low": close,
+                         "close": close, "volume": 1.0}, index=idx)
+
+
+class CountingMomentum(ExampleMomentumStrategy):
+    calls = 0
+
+    def generate_signals(self, df):
+        CountingMomentum.calls += 1
+        return super().generate_signals(df)
+
+
+def test_cache_hit_skips_recompute(tmp_path, df):
+    cache = ResultCache(str(tmp_path))
+    CountingMomentum.calls = 0
+    first = Backtester(CountingMomentum(span_short=5, span_long=20), df, None, cache=cache).run()
+    t0 = time.perf_counter()
+    second = Backtester(CountingMomentum(span_short=5, span_long=20), df, None, cache=cache).run()
+    assert time.perf_counter() - t0 < 0.5
+    assert CountingMomentum.calls == 1
+    assert second == pytest.approx(first)
+    assert cache.hits == 1
+
+
+def test_data_params_and_config_changes_invalidate(tmp_path, df):
+    cache = ResultCache(str(tmp_path))
+    strat = ExampleMomentumStrategy(span_short=5, span_long=20)
+    base = cache.fingerprint(df, strat, "Backtester.run")
+    changed = df.copy()
+    changed.iloc[-1, changed.columns.get_loc("close")] += 1e-9
+    assert cache.fingerprint(changed, strat, "Backtester.run") != base
+    assert cache.fingerprint(df, ExampleMomentumStrategy(span_short=6, span_long=20), "Backtester.run") != base
+    assert cache.fingerprint(df, strat, "Backtester.run", cfg={"LEVERAGE": 5}) != base
+    assert cache.fingerprint(df, strat, "Backtester.run_futures") != base
+    assert cache.fingerprint(df, ExampleMomentumStrategy(span_short=5, span_long=20), "Backtester.run") == base
+
+
+def test_engine_dependency_and_base_class_edits_invalidate(tmp_path, df, monkeypatch):
+    cache = ResultCache(str(tmp_path))
+    strat = CountingMomentum(span_short=5, span_long=20)
+    assert futures in backtester._ENGINE_MODULES
+    before = cache.fingerprint(df, strat, "Backtester.run_futures", code=backtester._ENGINE_MODULES)
+
+    real = result_cache._source_digest
+    edited = set()
+    monkeypatch.setattr(result_cache, "_source_digest", lambda obj: "edited" if obj in edited else real(obj))
+    key = lambda: cache.fingerprint(df, strat, "Backtester.run_futures", code=backtester._ENGINE_MODULES)
+    assert key() == before
+    edited.add(futures)  # an edit to simulate_futures
+    assert key() != before
+    edited.clear()
+    edited.add(ExampleMomentumStrategy)  # an edit to the strategy's base class
+    assert key() != before
+
+
+def test_futures_equity_round_trips(tmp_path, df):
+    cache = ResultCache(str(tmp_path))
+    first = Backtester(ExampleMomentumStrategy(span_short=5, span_long=20), df, None, cache=cache).run_futures()
+    second = Backtester(ExampleMomentumStrategy(span_short=5, span_long=20), df, None, cache=cache).run_futures()
+    assert cache.hits == 1
+    pd.testing.assert_series_equal(second["equity"], first["equity"], check_freq=False)
+    assert second["liquidations"] == first["liquidations"]
+
+
+def test_size_based_eviction(tmp_path):
+    curve = pd.Series(np.random.default_rng(0).normal(size=1000), name="equity")
+    probe = ResultCache(str(tmp_path / "probe"))
+    probe.put("k", {"pnl": 0.0, "equity": curve})
+    cache = ResultCache(str(tmp_path / "cache"), max_bytes=int(3.5 * probe.size_bytes()))
+    for i in range(3):
+        cache.put(f"k{i}", {"pnl": float(i), "equity": curve})
+        time.sleep(0.01)
+    cache.get("k0")  # touch: k0 becomes most recently used
+    cache.put("k3", {"pnl": 3.0, "equity": curve})
+    assert cache.size_bytes() <= cache.max_bytes
+    assert cache.get("k0")["pnl"] == 0.0
+    assert cache.get("k1") is None
+    assert cache.get("k3") is not None
+
+
+def test_file_digest_tracks_content(tmp_path):
+    a, b = tmp_path / "a.parquet", tmp_path / "b.parquet"
+    a.write_bytes(b"one")
+    b.write_bytes(b"two")
+    digest = file_digest([str(a), str(b)])
+    assert file_digest([str(b), str(a)]) == digest
+    b.write_bytes(b"three")
+    assert file_digest([str(a), str(b)]) != digest
+
+
+def test_put_keeps_existing_entry_and_never_raises(tmp_path, df, monkeypatch):
+    cache = ResultCache(str(tmp_path))
+    cache.put("k", {"pnl": 1.0})
+    cache.put("k", {"pnl": 2.0})  # a concurrent writer of the same key
+    assert cache.get("k")["pnl"] == 1.0
+
+    def fail(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(result_cache.tempfile, "mkdtemp", fail)
+    cache.put("other", {"pnl": 3.0})
+    assert cache.get("other") is None
+    result = Backtester(ExampleMomentumStrategy(span_short=5, span_long=20), df, None, cache=cache).run()
+    assert "pnl" in result
+    assert [p.name for p in tmp_path.iterdir()] == ["k"]
+
+
+def test_params_without_stable_content_are_not_cached(tmp_path, df):
+    cache = ResultCache(str(tmp_path))
+    strat = CountingMomentum(span_short=5, span_long=20)
+    strat.model = object()
+    with pytest.raises(TypeError):
+        cache.fingerprint(df, strat, "Backtester.run")
+    CountingMomentum.calls = 0
+    for _ in range(2):
+        Backtester(strat, df, None, cache=cache).run()
+    assert CountingMomentum.calls == 2
+    assert cache.hits == cache.misses == 0
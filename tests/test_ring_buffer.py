@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.ring_buffer import OHLCVRingBuffer
+from src.paper_trading.paper_trader import candles_to_frame
+
+
+def _rows(start, n, step=60_000):
+    return [[start + i * step, 1.0 + i, 2.0 + i, 0.5 + i, 1.5 + i, 10.0 * i] for i in range(n)]
+
+
+def test_views_are_contiguous_after_wraparound():
+    buf = OHLCVRingBuffer(capacity=5)
+    rows = _rows(0, 13)
+    for row in rows:
+        buf.append(row)
+    view = buf.view()
+    assert len(buf) == 5
+    assert view.flags.c_contiguous and not view.flags.writeable
+    np.testing.assert_array_equal(view, np.array(rows[-5:]))
+    np.testing.assert_array_equal(buf.column("close", 3), [r[4] for r in rows[-3:]])
+    assert np.shares_memory(buf.view(), buf.view(2))
+
+
+def test_forming_candle_replaced_and_stale_ignored():
+    buf = OHLCVRingBuffer(capacity=3)
+    buf.extend(_rows(0, 3))
+    assert buf.append([120_000, 9, 9, 9, 9, 9])  # update of the forming bar
+    assert not buf.append([60_000, 0, 0, 0, 0, 0])  # stale
+    assert len(buf) == 3 and buf.last_ts == 120_000
+    assert buf.view()[-1].tolist() == [120_000, 9, 9, 9, 9, 9]
+    buf.append([180_000, 1, 1, 1, 1, 1])
+    assert buf.view()[:, 0].tolist() == [60_000, 120_000, 180_000]
+    assert buf.view()[1].tolist() == [120_000, 9, 9, 9, 9, 9]
+
+
+def test_extend_keeps_last_capacity_and_frame_matches():
+    buf = OHLCVRingBuffer(capacity=100)
+    rows = _rows(1_700_000_000_000, 1000)
+    buf.extend(rows)
+    assert len(buf) == 100
+    pd.testing.assert_frame_equal(buf.to_frame(), candles_to_frame(rows[-100:]))
+    assert len(buf.to_frame(10)) == 10
+
+
+def test_invalid_capacity():
+    with pytest.raises(ValueError):
+        OHLCVRingBuffer(0)
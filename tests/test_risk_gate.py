@@ -0,0 +1,131 @@
+import asyncio
+import time
+
+import pytest
+
+from src.execution.order_router import OrderRouter
+from src.governance.risk_gate import GatedSink, RiskGate, RiskRejected
+from src.paper_trading.simulator import PaperExchangeSimulator
+
+
+def test_clips_to_symbol_and_gross_limits():
+    gate = RiskGate(max_symbol_notional=1_000, max_gross_notional=1_500)
+    assert gate.check("BTC", "buy", 8.0, 100.0) == pytest.approx(8.0)
+    assert gate.check("BTC", "buy", 5.0, 100.0) == pytest.approx(2.0)   # symbol cap 10
+    assert gate.last_reason == "symbol_notional"
+    assert gate.check("ETH", "buy", 10.0, 100.0) == pytest.approx(5.0)  # gross cap 1500
+    assert gate.last_reason == "gross_notional"
+    assert gate.gross == pytest.approx(1_500)
+    assert gate.check("ETH", "buy", 1.0, 100.0) == 0.0
+    assert gate.rejections["gross_notional"] == 1
+    assert gate.clipped == 2
+
+
+def test_reducing_and_flipping_orders():
+    gate = RiskGate(max_symbol_notional=1_000)
+    gate.check("BTC", "buy", 10.0, 100.0)
+    # A flip may close the long and open at most the cap on the other side.
+    assert gate.check("BTC", "sell", 25.0, 100.0) == pytest.approx(20.0)
+    assert gate.positions["BTC"] == pytest.approx(-10.0)
+
+
+def test_reject_mode_and_order_notional():
+    gate = RiskGate(max_order_notional=500, clip=False)
+    assert gate.check("BTC", "buy", 10.0, 100.0) == 0.0
+    assert gate.last_reason == "order_notional"
+    assert gate.check("BTC", "buy", 5.0, 100.0) == 5.0
+    assert gate.check("BTC", "hold", 1.0, 100.0) == 0.0
+    assert gate.metrics()["rejections"]["invalid"] == 1
+
+
+def test_token_bucket_rate_limit():
+    now = [0.0]
+    gate = RiskGate(max_orders_per_s=2, burst=2, clock=lambda: now[0])
+    results = [gate.check("BTC", "buy", 0.1, 100.0) > 0 for _ in range(3)]
+    assert results == [True, True, False]
+    now[0] = 0.5
+    assert gate.check("BTC", "buy", 0.1, 100.0) > 0
+    assert gate.rejections["rate"] == 1
+
+
+def test_drawdown_halts_new_exposure_but_allows_reduction():
+    gate = RiskGate(max_drawdown=0.1)
+    gate.check("BTC", "buy", 1.0, 100.0)
+    gate.update_equity(10_000)
+    gate.update_equity(8_900)
+    assert gate.halted
+    assert gate.check("BTC", "buy", 1.0, 100.0) == 0.0
+    assert gate.check("BTC", "sell", 1.0, 90.0) == 1.0
+    gate.resume()
+    assert gate.check("BTC", "buy", 1.0, 90.0) == 1.0
+
+
+def test_fills_are_marked_into_equity():
+    gate = RiskGate(max_drawdown=0.2, capital=1_000.0)
+    gate.check("BTC", "buy", 2.0, 100.0)
+    gate.on_order_update({"symbol": "BTC", "side": "buy", "amount": 2.0, "filled": 2.0,
+                          "average": 100.0, "status": "closed"})
+    gate.mark("BTC", 110.0)
+    assert gate.equity == pytest.approx(1_020.0)
+    gate.mark("BTC", 0.0)
+    assert gate.halted
+
+    restored = RiskGate(capital=1_000.0)
+    restored.set_state(gate.get_state())
+    assert restored.equity == pytest.approx(800.0)
+
+
+def test_gated_sink_releases_unfilled_and_raises_on_reject():
+    sim = PaperExchangeSimulator(slippage_pct=0.0, error_rate=0.0, partial_fill_min=0.5)
+    gate = RiskGate(max_symbol_notional=1_000)
+    sink = GatedSink(sim, gate)
+    order = sink.create_order("BTC", "MARKET", "buy", 20.0, 100.0)
+    assert order["amount"] == pytest.approx(10.0)
+    assert gate.positions["BTC"] == pytest.approx(order["filled"])
+
+    gate.positions["BTC"] = 10.0
+    with pytest.raises(RiskRejected) as excinfo:
+        sink.create_order("BTC", "MARKET", "buy", 1.0, 100.0)
+    assert excinfo.value.reason == "symbol_notional"
+
+
+def test_router_failures_release_reservations():
+    class Down:
+        has = {}
+        rateLimit = 0
+
+        def create_order(self, *args, **kwargs):
+            raise ValueError("rejected by venue")
+
+    gate = RiskGate(max_symbol_notional=1_000)
+
+    async def main():
+        async with OrderRouter(Down()) as router:
+            sink = GatedSink(router, gate)
+            sink.create_order("BTC", "market", "buy", 5.0, 100.0)
+            assert gate.positions["BTC"] == pytest.approx(5.0)
+            await router.drain()
+
+    asyncio.run(main())
+    assert gate.positions["BTC"] == 0.0
+
+
+def test_state_round_trip():
+    gate = RiskGate(max_gross_notional=10_000)
+    gate.check("BTC", "buy", 2.0, 100.0)
+    gate.check("ETH", "sell", 3.0, 50.0)
+    restored = RiskGate(max_gross_notional=10_000)
+    restored.set_state(gate.get_state())
+    assert restored.gross == pytest.approx(gate.gross) == pytest.approx(350.0)
+
+
+def test_check_is_microsecond_scale():
+    gate = RiskGate(max_order_notional=1e6, max_symbol_notional=1e6, max_gross_notional=1e7,
+                    max_orders_per_s=1e9, burst=10**9, max_drawdown=0.5)
+    symbols = [f"S{i}" for i in range(500)]
+    n = 50_000
+    start = time.perf_counter()
+    for i in range(n):
+        gate.check(symbols[i % 500], "buy" if i & 1 else "sell", 0.01, 100.0)
+    per_check_us = (time.perf_counter() - start) / n * 1e6
+    assert per_check_us < 50
@@ -0,0 +1,123 @@
+import asyncio
+
+import pytest
+
+from src.paper_trading.runner import MultiSymbolRunner
+from src.paper_trading.simulator import PaperExchangeSimulator
+from src.strategy.base_strategy import BaseStrategy
+from src.utils.event_bus import EventBus
+
+MINUTE = 60_000
+T0 = 1_600_000_000_000 - (1_600_000_000_000 % MINUTE)
+
+
+class Cfg:
+    EXCHANGE_ID = "stub"
+    SYMBOLS = ["BTC/USDT", "ETH/USDT"]
+    TIMEFRAME = "1m"
+
+
+class StubExchange:
+    """Serves per-symbol batches of candles, one batch per call."""
+    def __init__(self, batches):
+        self._batches = {s: list(b) for s, b in batches.items()}
+        self.calls = []
+
+    @staticmethod
+    def parse_timeframe(tf):
+        return 60
+
+    def load_markets(self, reload=False):
+        return {}
+
+    def fetch_ohlcv(self, symbol, timeframe, since=None, limit=None):
+        self.calls.append((symbol, since))
+        batches = self._batches[symbol]
+        return batches.pop(0) if batches else []
+
+
+class EveryBarStrategy:
+    def generate_signals(self, df):
+        return [{"timestamp": ts, "side": "buy", "size": 1.0} for ts in df["timestamp"]]
+
+
+class StreamingEveryBarStrategy(BaseStrategy):
+    """Buys every bar; its state records the size of each batch it was fed."""
+    def generate_signals_stream(self, df, state=None):
+        signals = [{"timestamp": ts, "side": "buy", "size": 1.0} for ts in df["timestamp"]]
+        return signals, (state or ()) + (len(df),)
+
+
+def bar(i, close=100.0):
+    return [T0 + i * MINUTE, close, close, close, close, 1.0]
+
+
+def make_runner(monkeypatch, strategy_cls=EveryBarStrategy, **kwargs):
+    exchange = StubExchange({
+        "BTC/USDT": [[bar(0), bar(1)], [bar(2)]],
+        "ETH/USDT": [[bar(0)], [bar(1), bar(2)]],
+    })
+    sim = PaperExchangeSimulator(slippage_pct=0.0, error_rate=0.0, partial_fill_min=1.0)
+    runner = MultiSymbolRunner(lambda s: strategy_cls(), Cfg(), exchange=exchange, simulator=sim, **kwargs)
+    monkeypatch.setattr(runner, "_next_wakeup_delay", lambda now_ms: 0.0)
+    return runner
+
+
+def test_event_bus_fan_out_and_drop_oldest():
+    async def scenario():
+        bus = EventBus(maxsize=1)
+        q1, q2 = bus.subscribe("t"), bus.subscribe("t")
+        assert bus.publish("t", 1) == 2
+        bus.publish("t", 2)
+        return q1.get_nowait(), q2.get_nowait(), bus.dropped
+
+    assert asyncio.run(scenario()) == (2, 2, 2)
+
+
+def test_event_bus_publish_wait_applies_backpressure():
+    async def scenario():
+        bus = EventBus(maxsize=1)
+        queue = bus.subscribe("t")
+        await bus.publish_wait("t", 1)
+        blocked = asyncio.create_task(bus.publish_wait("t", 2))
+        await asyncio.sleep(0)
+        waiting = not blocked.done()
+        first = await queue.get()
+        await blocked
+        return waiting, first, queue.get_nowait(), bus.dropped
+
+    assert asyncio.run(scenario()) == (True, 1, 2, 0)
+
+
+def test_bounded_runner_never_drops_bars(monkeypatch):
+    runner = make_runner(monkeypatch, StreamingEveryBarStrategy, max_pending_batches=1)
+    runner.run(max_iterations=2)
+    assert runner.workers["BTC/USDT"].stream_state == (2, 1)
+    assert runner.workers["ETH/USDT"].stream_state == (1, 2)
+    assert runner.metrics()["dropped_events"] == 0
+
+
+def test_runner_dispatches_per_symbol(monkeypatch):
+    runner = make_runner(monkeypatch)
+    runner.run(max_iterations=2)
+
+    assert runner.workers["BTC/USDT"].last_ts == T0 + 2 * MINUTE
+    assert runner.workers["ETH/USDT"].last_ts == T0 + 2 * MINUTE
+    # warm-up acts on its last bar only, then every new bar
+    assert runner.metrics()["orders"] == {"BTC/USDT": 2, "ETH/USDT": 3}
+    assert ("BTC/USDT", T0 + MINUTE + 1) in runner.exchange.calls
+
+
+def test_runner_process_pool(monkeypatch):
+    runner = make_runner(monkeypatch, process_workers=2)
+    runner.run(max_iterations=2)
+    assert sum(runner.metrics()["orders"].values()) == 5
+
+
+@pytest.mark.parametrize("process_workers", [0, 2])
+def test_runner_streams_only_new_bars(monkeypatch, process_workers):
+    runner = make_runner(monkeypatch, StreamingEveryBarStrategy, process_workers=process_workers)
+    runner.run(max_iterations=2)
+    assert runner.workers["BTC/USDT"].stream_state == (2, 1)
+    assert runner.workers["ETH/USDT"].stream_state == (1, 2)
+    assert runner.metrics()["orders"] == {"BTC/USDT": 2, "ETH/USDT": 3}
@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.backtesting.scenarios import (
+    canned_scenario_grid,
+    evaluate_scenarios,
+    exchange_outage,
+    flash_crash,
+    scenario_grid,
+)
+from src.backtesting.stress_test import inject_black_swan
+
+
+@pytest.fixture
+def returns():
+    idx = pd.date_range("2021-01-01", periods=100, freq="min")
+    return pd.Series(np.random.default_rng(0).normal(0, 0.001, size=100), index=idx)
+
+
+def test_grid_matches_inject_black_swan(returns):
+    dates = returns.index[[10, 50, 90]]
+    grid = scenario_grid(dates, [-0.1, -0.3])
+    result = evaluate_scenarios(returns, grid, initial_capital=100.0, chunk_size=4)
+    assert len(result) == 6
+    for row in result.itertuples():
+        shocked = inject_black_swan(returns, row.shock_pct, row.timestamp)
+        assert row.final_capital == pytest.approx(100.0 * (1 + shocked).prod())
+    same = evaluate_scenarios(returns, grid, initial_capital=100.0, chunk_size=1000)
+    pd.testing.assert_frame_equal(result, same)
+
+
+def test_flash_crash_recovers_fraction(returns):
+    flat = pd.Series(0.0, index=returns.index)
+    spec = flash_crash(flat.index[10], depth=-0.5, recovery_fraction=0.5, recovery_bars=20)
+    row = evaluate_scenarios(flat, [spec]).iloc[0]
+    assert row["min_capital"] == pytest.approx(0.5)
+    assert row["final_capital"] == pytest.approx(0.75)
+    assert row["max_drawdown"] == pytest.approx(0.5)
+
+
+def test_exchange_outage_freezes_then_gaps(returns):
+    trending = pd.Series(0.01, index=returns.index)
+    spec = exchange_outage(trending.index[10], duration_bars=5, gap_pct=-0.2)
+    row = evaluate_scenarios(trending, [spec]).iloc[0]
+    # 5 frozen bars earn nothing; the gap lands on bar 15 on top of its +1%.
+    expected = 1.01 ** (100 - 6) * (1 + 0.01 - 0.2)
+    assert row["final_capital"] == pytest.approx(expected)
+
+
+def test_canned_grid_and_missing_timestamp(returns):
+    grid = canned_scenario_grid(returns.index[[20, 40]])
+    result = evaluate_scenarios(returns, grid)
+    assert len(result) == 10
+    assert (result["max_drawdown"] > 0.09).all()
+    with pytest.raises(KeyError):
+        evaluate_scenarios(returns, scenario_grid([pd.Timestamp("2030-01-01")], [-0.1]))
+    with pytest.raises(ValueError):
+        canned_scenario_grid(returns.index[:1], ["meteor"])
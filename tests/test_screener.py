@@ -0,0 +1,110 @@
+import time
+
+import ccxt
+import numpy as np
+import pytest
+
+from src.data.screener import Screener, tickers_to_frame
+
+
+def ticker(symbol, last, spread=0.01, volume=1_000.0, high=None, low=None, funding=None, quote_volume=None):
+    info = {"fundingRate": funding} if funding is not None else {}
+    return {
+        "symbol": symbol, "last": last, "bid": last - spread / 2, "ask": last + spread / 2,
+        "open": last, "high": high if high is not None else last * 1.05,
+        "low": low if low is not None else last * 0.95, "baseVolume": volume,
+        "quoteVolume": quote_volume, "percentage": 0.0, "timestamp": 1_700_000_000_000, "info": info,
+    }
+
+
+class BulkExchange:
+    def __init__(self, tickers, funding=None):
+        self.tickers = tickers
+        self.funding = funding
+        self.calls = []
+
+    def fetch_tickers(self, symbols=None):
+        self.calls.append("fetch_tickers")
+        return {s: t for s, t in self.tickers.items() if symbols is None or s in symbols}
+
+    def fetch_funding_rates(self, symbols=None):
+        self.calls.append("fetch_funding_rates")
+        return self.funding
+
+
+def universe():
+    return {
+        "BTC/USDT:USDT": ticker("BTC/USDT:USDT", 50_000.0, spread=1.0, volume=100.0, funding=0.0001),
+        "ETH/USDT:USDT": ticker("ETH/USDT:USDT", 3_000.0, spread=0.03, volume=1_000.0, funding=-0.0002),
+        "DOGE/USDT:USDT": ticker("DOGE/USDT:USDT", 0.1, spread=0.001, volume=1e6, funding=0.003),
+        "ETH/BTC": ticker("ETH/BTC", 0.06, spread=0.00001, volume=500.0),
+        "DEAD/USDT:USDT": {"symbol": "DEAD/USDT:USDT", "last": None, "info": {}},
+    }
+
+
+def test_tickers_to_frame_derives_columns():
+    table = tickers_to_frame(universe())
+    btc = table.loc["BTC/USDT:USDT"]
+    assert btc["quote"] == "USDT"
+    assert table.loc["ETH/BTC", "quote"] == "BTC"
+    assert btc["quote_volume"] == pytest.approx(5_000_000.0)  # base volume * last fallback
+    assert btc["spread_bps"] == pytest.approx(0.2)
+    assert btc["range_pct"] == pytest.approx(0.10)
+    assert btc["funding_rate"] == pytest.approx(0.0001)
+    assert np.isnan(table.loc["ETH/BTC", "funding_rate"])
+    assert np.isnan(table.loc["DEAD/USDT:USDT", "spread_bps"])
+
+
+def test_screen_filters_and_ranks_with_one_request():
+    ex = BulkExchange(universe())
+    screener = Screener(ex, quote="USDT", min_quote_volume=100_000, max_spread_bps=5, max_abs_funding=0.001,
+                        rank_by={"quote_volume": 1.0})
+    assert screener.universe() == ["BTC/USDT:USDT", "ETH/USDT:USDT"]
+    assert ex.calls == ["fetch_tickers"]
+
+    screener.rank_by = {"spread_bps": -1.0}  # tighter spread ranks first
+    assert screener.screen().index.tolist() == ["ETH/USDT:USDT", "BTC/USDT:USDT"]
+    screener.top_n = 1
+    assert screener.universe(refresh=False) == ["ETH/USDT:USDT"]
+    assert ex.calls == ["fetch_tickers"]
+
+
+def test_funding_from_bulk_funding_rates():
+    ex = BulkExchange(universe(), funding={"DOGE/USDT:USDT": {"fundingRate": 0.0}})
+    screener = Screener(ex, max_abs_funding=0.001, fetch_funding=True)
+    assert screener.universe() == ["DOGE/USDT:USDT"]
+    assert ex.calls == ["fetch_tickers", "fetch_funding_rates"]
+
+
+def test_shared_client_screens_swaps_through_ttl_cache(monkeypatch):
+    made = []
+
+    def factory(params):
+        ex = BulkExchange(universe())
+        ex.rateLimit = 0
+        made.append((params, ex))
+        return ex
+
+    monkeypatch.setattr(ccxt, "screenerstub", factory, raising=False)
+    screener = Screener(exchange_id="screenerstub", max_abs_funding=0.001)
+    assert screener.universe() == ["BTC/USDT:USDT", "ETH/USDT:USDT"]
+    screener.refresh()  # within the TTL: served from cache.fetch_tickers
+    swap = [ex for params, ex in made if params.get("options") == {"defaultType": "swap"}]
+    assert len(swap) == 1 and swap[0].calls == ["fetch_tickers"]
+
+
+def test_full_universe_refresh_is_milliseconds():
+    rng = np.random.default_rng(0)
+    tickers = {
+        f"C{i}/USDT:USDT": ticker(f"C{i}/USDT:USDT", float(p), spread=float(p) * 1e-4, volume=float(v),
+                                  funding=float(f))
+        for i, (p, v, f) in enumerate(zip(rng.uniform(0.01, 1_000, 1_000), rng.uniform(1, 1e6, 1_000),
+                                          rng.normal(0, 1e-3, 1_000)))
+    }
+    screener = Screener(BulkExchange(tickers), quote="USDT", min_quote_volume=1e5, max_abs_funding=1e-3,
+                        rank_by={"quote_volume": 1.0, "range_pct": 0.5, "spread_bps": -0.5}, top_n=50)
+    start = time.perf_counter()
+    picked = screener.universe()
+    elapsed_ms = (time.perf_counter() - start) * 1000.0
+    assert len(picked) == 50
+    assert elapsed_ms < 250
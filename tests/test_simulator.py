@@ -1,25 +1,14 @@
 import random
+
 import pytest
+import numpy as np
 import pandas as pd
 
 from src.paper_trading.simulator import PaperExchangeSimulator
 
 
-@pytest.fixture(autouse=True)
-def deterministic_random(monkeypatch):
-    # Sequence: [0.5, 1.0] → no error, full fill; then [0.0] → error
-    seq = [0.5, 1.0, 0.0]
-    def fake_random():
-        return seq.pop(0)
-    def fake_uniform(a, b):
-        return 1.0  # always full fill
-    monkeypatch.setattr(random, "random", fake_random)
-    monkeypatch.setattr(random, "uniform", fake_uniform)
-    yield
-
-
 def test_create_order_full_fill():
-    sim = PaperExchangeSimulator(slippage_pct=0.01, error_rate=0.1)
+    sim = PaperExchangeSimulator(slippage_pct=0.01, error_rate=0.0, partial_fill_min=1.0)
     order = sim.create_order("BTC/USDT", "LIMIT", "buy", amount=2.0, price=100.0)
     assert order["filled"] == pytest.approx(2.0)
     assert order["status"] == "closed"
@@ -28,13 +17,10 @@ def test_create_order_full_fill():
 
 
 def test_create_order_partial_fill():
-    # Next uniform would be 1.0 (we override), but if we adjust uniform:
-    sim = PaperExchangeSimulator(slippage_pct=0.02, error_rate=0.1, partial_fill_min=0.5)
-    # monkeypatch uniform to .6
+    sim = PaperExchangeSimulator(slippage_pct=0.02, error_rate=0.0, partial_fill_min=0.5, seed=3)
     order = sim.create_order("ETH/USDT", "MARKET", "sell", amount=5.0, price=50.0)
-    # since fake_uniform returns 1.0, filled==5.0 again
-    assert order["filled"] == pytest.approx(5.0)
-    assert order["status"] == "closed"
+    assert 2.5 <= order["filled"] < 5.0
+    assert order["status"] == "partial"
     # sell price = 50 * 0.98
     assert order["price"] == pytest.approx(49.0)
 
@@ -43,3 +29,56 @@ def test_create_order_error():
     sim = PaperExchangeSimulator(error_rate=1.0)  # always error
     with pytest.raises(Exception):
         sim.create_order("BTC/USDT", "MARKET", "buy", amount=1.0, price=100.0)
+
+
+def test_create_order_draws_from_own_seeded_stream():
+    def run(sim):
+        out = []
+        for _ in range(50):
+            try:
+                out.append(sim.create_order("BTC/USDT", "MARKET", "buy", 1.0, 100.0)["filled"])
+            except Exception:
+                out.append(None)
+        return out
+
+    random.seed(0)
+    first = run(PaperExchangeSimulator(error_rate=0.3, seed=11))
+    random.seed(1)
+    assert run(PaperExchangeSimulator(error_rate=0.3, seed=11)) == first
+    assert None in first and len(set(first)) > 2
+
+
+def test_create_orders_batch_columnar():
+    sim = PaperExchangeSimulator(slippage_pct=0.01, error_rate=0.0, partial_fill_min=1.0, seed=7)
+    res = sim.create_orders_batch(
+        ["BTC/USDT", "ETH/USDT"], ["LIMIT", "MARKET"], ["buy", "sell"], [2.0, 5.0], [100.0, None]
+    )
+    assert res["filled"].tolist() == pytest.approx([2.0, 5.0])
+    assert res["price"][0] == pytest.approx(101.0)
+    assert np.isnan(res["price"][1])
+    assert res["status"].tolist() == ["closed", "closed"]
+
+
+def test_create_orders_batch_reproducible_and_independent():
+    n = 1000
+    cols = (["BTC/USDT"] * n, ["LIMIT"] * n, ["buy", "sell"] * (n // 2), np.ones(n), np.full(n, 100.0))
+    a1, b1 = PaperExchangeSimulator.spawn(2, seed=42, error_rate=0.1, slippage_std=0.5)
+    a2, _ = PaperExchangeSimulator.spawn(2, seed=42, error_rate=0.1, slippage_std=0.5)
+
+    ra1, ra2, rb1 = a1.create_orders_batch(*cols), a2.create_orders_batch(*cols), b1.create_orders_batch(*cols)
+    np.testing.assert_array_equal(ra1["filled"], ra2["filled"])
+    np.testing.assert_array_equal(ra1["error"], ra2["error"])
+    assert not np.array_equal(ra1["filled"], rb1["filled"])
+
+    errors = ra1["error"]
+    assert 0 < errors.sum() < n
+    assert (ra1["status"][errors] == "rejected").all()
+    assert (ra1["filled"][errors] == 0.0).all()
+
+
+def test_create_orders_batch_rejects_bad_input():
+    sim = PaperExchangeSimulator(seed=1)
+    with pytest.raises(ValueError):
+        sim.create_orders_batch(["BTC/USDT"], ["LIMIT"], ["hold"], [1.0], [100.0])
+    with pytest.raises(ValueError):
+        sim.create_orders_batch(["BTC/USDT"], ["LIMIT"], ["buy", "sell"], [1.0], [100.0])
@@ -1,10 +1,13 @@
+import numpy as np
 import pandas as pd
 import pytest
 
 from src.backtesting.slippage import (
     apply_slippage,
     apply_latency,
-    simulate_fill_orders
+    sample_latency_ms,
+    simulate_fill_orders,
+    simulate_fills_vectorized
 )
 
 
@@ -40,3 +43,69 @@ def test_simulate_fill_orders():
     fill = fills[0]
     assert fill["price"] == 101.0
     assert fill["timestamp"] == pd.Timestamp("2021-01-01T00:00:01Z")
+
+
+def _bars():
+    idx = pd.date_range("2021-01-01", periods=5, freq="s")
+    return pd.DataFrame({"close": [100.0, 101.0, 102.0, 103.0, 104.0],
+                         "volume": [100.0, 100.0, 400.0, 0.0, 100.0]}, index=idx)
+
+
+def test_vectorized_fills_use_delayed_bar_and_sqrt_impact():
+    bars = _bars()
+    ts = [bars.index[0], bars.index[0] + pd.Timedelta(milliseconds=500), bars.index[1]]
+    fills = simulate_fills_vectorized(
+        bars, ts, ["buy", "sell", "buy"], [1.0, 4.0, 16.0],
+        slippage_pct=0.001, impact_coef=0.1, latency_ms=1000,
+    )
+    # Delayed to 1s, 1.5s and 2s: the latest closed bars are 0, 0 and 1.
+    assert list(fills["bar_index"]) == [0, 0, 1]
+    assert fills["base_price"].tolist() == [100.0, 100.0, 101.0]
+    expected = [0.001 + 0.1 * 0.1, 0.001 + 0.1 * 0.2, 0.001 + 0.1 * 0.4]
+    assert fills["impact"].tolist() == pytest.approx(expected)
+    assert fills["price"][0] == pytest.approx(100.0 * (1 + expected[0]))
+    assert fills["price"][1] == pytest.approx(100.0 * (1 - expected[1]))
+    assert fills["timestamp"][0] == np.datetime64(bars.index[1].to_datetime64())
+
+
+def test_vectorized_fills_cap_and_out_of_range():
+    bars = _bars()
+    ts = [bars.index[4], bars.index[0] - pd.Timedelta(seconds=5)]
+    fills = simulate_fills_vectorized(bars, ts, ["buy", "sell"], [1.0, 1.0], max_impact=0.05)
+    assert fills["impact"][0] == pytest.approx(0.05)  # zero-volume bar
+    assert fills["bar_index"][1] == -1
+    assert np.isnan(fills["price"][1])
+
+
+def test_vectorized_fills_match_loop_without_impact():
+    bars = _bars()
+    orders = [{"timestamp": t, "price": c, "side": s}
+              for t, c, s in zip(bars.index, bars["close"], ["buy", "sell"] * 2 + ["buy"])]
+    loop = simulate_fill_orders(orders, slippage_pct=0.01, latency_ms=0)
+    # Orders placed as each bar closes fill at that bar's close.
+    vec = simulate_fills_vectorized(bars, [o["timestamp"] + pd.Timedelta(seconds=1) for o in orders],
+                                    [o["side"] for o in orders], np.ones(5),
+                                    slippage_pct=0.01, impact_coef=0.0)
+    assert vec["price"].tolist() == pytest.approx([f["price"] for f in loop])
+
+
+def test_sub_bar_latency_moves_fill_to_the_next_close():
+    idx = pd.date_range("2021-01-01", periods=5, freq="min")
+    bars = pd.DataFrame({"close": [100.0, 101.0, 102.0, 103.0, 104.0]}, index=idx)
+    ts = [idx[1] + pd.Timedelta(milliseconds=59_800)]
+    fast = simulate_fills_vectorized(bars, ts, ["buy"], [1.0], impact_coef=0.0, latency_ms=0)
+    slow = simulate_fills_vectorized(bars, ts, ["buy"], [1.0], impact_coef=0.0, latency_ms=300)
+    assert fast["base_price"][0] == 100.0  # bar 1 is still forming
+    assert slow["base_price"][0] == 101.0  # arrives after bar 1 closed
+
+
+def test_sample_latency_distributions():
+    rng = np.random.default_rng(0)
+    assert (sample_latency_ms(10, "fixed", 5.0) == 5.0).all()
+    exp = sample_latency_ms(10_000, "exponential", 5.0, 2.0, rng)
+    assert exp.min() >= 5.0 and exp.mean() == pytest.approx(7.0, rel=0.05)
+    logn = sample_latency_ms(10_000, "lognormal", 10.0, 5.0, rng)
+    assert np.median(logn) == pytest.approx(10.0, rel=0.05)
+    assert (sample_latency_ms(100, "uniform", 1.0, 5.0, rng) >= 0).all()
+    with pytest.raises(ValueError):
+        sample_latency_ms(1, "gamma")
@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.backtesting.backtester import Backtester
+from src.backtesting.streaming import StreamingBacktester, iter_lake_batches, lake_path
+from src.data.schema import get_partition_path
+from src.strategy.example_momentum import ExampleMomentumStrategy
+
+
+@pytest.fixture
+def history():
+    n = 3 * 1440
+    idx = pd.date_range("2021-01-01", periods=n, freq="min")
+    close = 100 * np.exp(np.cumsum(np.random.default_rng(0).normal(0, 0.002, n)))
+    return pd.DataFrame({"timestamp": idx, "open": close, "high": close, "low": close,
+                         "close": close, "volume": 1.0})
+
+
+@pytest.fixture
+def lake(tmp_path, history):
+    for day, part in history.groupby(history["timestamp"].dt.date):
+        rel = get_partition_path("binance", "BTC/USDT", "1m", pd.Timestamp(day))
+        out = tmp_path / rel.replace("data/", "", 1)
+        out.mkdir(parents=True)
+        part.to_parquet(out / "ohlcv.parquet", index=False)
+    return str(tmp_path / "ohlcv")
+
+
+@pytest.mark.parametrize("batch_size", [1, 97, 5000])
+def test_streaming_matches_in_memory(lake, history, batch_size):
+    strat = ExampleMomentumStrategy(size=1.0, span_short=5, span_long=20)
+    expected = Backtester(strat, history.set_index("timestamp", drop=False), cfg=None).run()
+    result = StreamingBacktester.from_lake(strat, "binance", "BTC/USDT", "1m",
+                                           root=lake, batch_size=batch_size).run()
+    assert result["trades"] == expected["trades"] > 0
+    assert result["pnl"] == expected["pnl"]
+    assert result["rows"] == len(history)
+
+
+def test_stream_signals_match_generate_signals(history):
+    strat = ExampleMomentumStrategy(size=2.0, span_short=3, span_long=8)
+    state, streamed = None, []
+    for lo in range(0, len(history), 333):
+        signals, state = strat.generate_signals_stream(history.iloc[lo:lo + 333], state)
+        streamed.extend(signals)
+    assert streamed == strat.generate_signals(history)
+
+
+def test_iter_lake_batches_bounds(lake, history):
+    path = lake_path("binance", "BTC/USDT", "1m", root=lake)
+    start, end = history["timestamp"].iloc[100], history["timestamp"].iloc[2000]
+    batches = list(iter_lake_batches(path, batch_size=500, start=start, end=end))
+    assert max(len(b) for b in batches) <= 500
+    got = pd.concat(batches)["timestamp"]
+    assert got.iloc[0] == start and len(got) == 1900
+    assert got.is_monotonic_increasing
@@ -1,10 +1,15 @@
+import numpy as np
 import pandas as pd
 import pytest
 
 from src.backtesting.stress_test import (
     monte_carlo_returns,
     simulate_pnl,
-    inject_black_swan
+    inject_black_swan,
+    streaming_monte_carlo,
+    bootstrap_indices,
+    path_statistics,
+    run_stress_suite
 )
 
 
@@ -40,3 +45,81 @@ def test_inject_black_swan_keyerror():
     returns = pd.Series([0.0], index=[pd.Timestamp("2021-01-01")])
     with pytest.raises(KeyError):
         inject_black_swan(returns, shock_pct=-0.5, on_index=pd.Timestamp("2021-01-02"))
+
+
+def test_streaming_monte_carlo_constant_returns():
+    returns = pd.Series([0.1] * 5)
+    stats = streaming_monte_carlo(returns, n_sims=10, initial_capital=100.0, seed=1)
+    assert list(stats.columns) == ["final_capital", "max_drawdown", "time_to_ruin"]
+    assert stats["final_capital"].to_numpy() == pytest.approx([100.0 * 1.1 ** 5] * 10)
+    assert stats["max_drawdown"].to_numpy() == pytest.approx([0.0] * 10)
+    assert stats["time_to_ruin"].isna().all()
+
+
+def test_streaming_monte_carlo_drawdown_and_ruin():
+    # Two periods drawn from {+100%, -80%}: drawdowns are 0 (up, up), 80% (up, down
+    # or down, up) or 96% (down, down). Any down move ends at or below 40% -> ruin.
+    returns = pd.Series([1.0, -0.8])
+    stats = streaming_monte_carlo(returns, n_sims=200, initial_capital=100.0, seed=3,
+                                  stats=["max_drawdown", "time_to_ruin"])
+    dd = np.round(stats["max_drawdown"].to_numpy(), 9)
+    assert set(dd) == {0.0, 0.8, 0.96}
+    assert stats.loc[dd == 0.0, "time_to_ruin"].isna().all()
+    assert set(stats.loc[dd == 0.96, "time_to_ruin"]) == {1.0}
+    assert set(stats.loc[dd == 0.8, "time_to_ruin"]) == {1.0, 2.0}
+
+
+def test_streaming_monte_carlo_reproducible_across_memory_limits():
+    rng = np.random.default_rng(0)
+    returns = pd.Series(rng.normal(0, 0.02, size=500))
+    big = streaming_monte_carlo(returns, n_sims=300, initial_capital=1.0, seed=9, block_sims=32)
+    tiny = streaming_monte_carlo(returns, n_sims=300, initial_capital=1.0, seed=9, block_sims=32,
+                                 memory_limit_mb=0.1)
+    pd.testing.assert_frame_equal(big, tiny)
+    other = streaming_monte_carlo(returns, n_sims=300, initial_capital=1.0, seed=10, block_sims=32)
+    assert not np.allclose(big["final_capital"], other["final_capital"])
+
+
+def test_streaming_monte_carlo_rejects_unknown_stat():
+    with pytest.raises(ValueError):
+        streaming_monte_carlo(pd.Series([0.0]), n_sims=1, initial_capital=1.0, stats=["sharpe"])
+
+
+@pytest.mark.parametrize("method", ["iid", "moving_block", "stationary"])
+def test_bootstrap_indices_shape_and_range(method):
+    idx = bootstrap_indices(50, 7, np.random.default_rng(0), method=method, block_size=5)
+    assert idx.shape == (50, 7)
+    assert idx.min() >= 0 and idx.max() < 50
+
+
+def test_moving_block_keeps_contiguous_runs():
+    idx = bootstrap_indices(40, 3, np.random.default_rng(1), method="moving_block", block_size=10)
+    blocks = idx.reshape(4, 10, 3)
+    assert (np.diff(blocks, axis=1) == 1).all()
+
+
+def test_monte_carlo_returns_block_method():
+    returns = pd.Series(np.arange(30) / 100.0)
+    sims = monte_carlo_returns(returns, n_sims=4, seed=2, method="stationary", block_size=5)
+    assert sims.shape == (30, 4)
+    assert set(np.round(sims.to_numpy().ravel(), 6)) <= set(np.round(returns, 6))
+
+
+def test_path_statistics():
+    sims = np.array([[0.1, -0.5], [-0.5, 0.0], [0.0, 1.0]])
+    stats = path_statistics(sims, worst_n=2)
+    assert stats["final_return"] == pytest.approx([1.1 * 0.5 - 1, 0.5 * 2 - 1])
+    assert stats["max_drawdown"] == pytest.approx([0.5, 0.5])
+    assert stats["min_capital"] == pytest.approx([0.55, 0.5])
+    assert stats["worst_n_loss"] == pytest.approx([0.5, 0.5])
+
+
+def test_run_stress_suite_is_worker_independent():
+    returns = pd.Series(np.random.default_rng(3).normal(0, 0.01, size=300))
+    kwargs = dict(n_sims=200, method="stationary", block_size=10, worst_n=20,
+                  max_drawdown=0.1, seed=5, sims_per_task=64)
+    inline = run_stress_suite(returns, n_workers=0, **kwargs)
+    pooled = run_stress_suite(returns, n_workers=2, **kwargs)
+    pd.testing.assert_frame_equal(inline, pooled)
+    assert {"var_95", "cvar_99", "prob_breach_max_drawdown", "worst_20_bar_loss_p95"} <= set(inline.index)
+    assert inline.loc["cvar_95", "value"] >= inline.loc["var_95", "value"]